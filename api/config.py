@@ -27,6 +27,18 @@ class Settings(BaseSettings):
     admin_api_key: str = "fk-admin-dev-key-change-me"
     api_key_prefix: str = "fk-pos-"
 
+    # Forecasting
+    forecast_cache_max_models: int = 256
+    forecast_cache_ttl_seconds: int = 3600
+    forecast_history_days: int = 365
+    forecast_min_history_days: int = 28
+    forecast_batch_workers: int = 0  # 0 = one worker per CPU
+    forecast_horizon_days: int = 30  # Days kept precomputed in the forecasts table
+    forecast_model_dir: str = ""  # "" = don't persist models; set a data directory to enable
+    forecast_model_max_age_hours: int = 36  # Older saved models are retrained instead of loaded
+    forecast_anomaly_z_threshold: float = 3.0  # Daily covers this many EWMA std devs off forecast raise an alert
+    forecast_anomaly_alpha: float = 0.1  # EWMA weight of the newest day's residual
+
     # CORS
     cors_origins: list = ["http://localhost:8517", "http://localhost:8518"]
 
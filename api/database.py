@@ -2,7 +2,7 @@
 Forkast Database Setup
 SQLAlchemy + SQLite for persistent storage
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from api.config import settings
 
@@ -31,3 +31,22 @@ def get_db():
 def create_tables():
     """Create all tables. Called during FastAPI lifespan startup."""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+
+
+def add_missing_columns():
+    """
+    Add model columns missing from existing tables (create_all only creates
+    whole tables). New columns are added nullable with no default, so rows
+    stored before them read back as NULL.
+    """
+    existing = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not existing.has_table(table.name):
+                continue
+            present = {column["name"] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in present:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
@@ -0,0 +1,69 @@
+"""
+Forkast Forecast Backtest Job
+Rolling-origin accuracy report for every restaurant (or a given list)
+
+Usage:
+    python -m api.jobs.backtest_forecasts [--restaurants R1 R2] [--horizon 14] [--step 7] [--json]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.database import SessionLocal, create_tables
+from api.models.db_models import RestaurantDB
+from api.services.forecast_service import ForecastService
+from forecasting.backtesting import run_backtests
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Backtest demand forecasts on POS history")
+    parser.add_argument("--restaurants", nargs="*", help="Restaurant UIDs (default: all)")
+    parser.add_argument("--horizon", type=int, default=14, help="Days ahead scored per cutoff")
+    parser.add_argument("--step", type=int, default=7, help="Days between cutoffs")
+    parser.add_argument("--min-train-days", type=int, default=28)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        uids = args.restaurants or [uid for (uid,) in db.query(RestaurantDB.uid).all()]
+        jobs = (
+            (uid, ForecastService.get_daily_history(db, uid), ForecastService.get_country(db, uid))
+            for uid in uids
+        )
+        reports = sorted(
+            run_backtests(
+                jobs, horizon=args.horizon, step=args.step,
+                min_train_days=args.min_train_days, max_workers=args.workers,
+            ),
+            key=lambda r: r["restaurant_uid"],
+        )
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for r in reports:
+            if r["status"] != "ok":
+                print(f"  {r['restaurant_uid']}: FAILED - {r['error']}")
+                continue
+            o = r["overall"]
+            print(f"  {r['restaurant_uid']}: {r['folds']} folds, MAPE {o['mape']}%, "
+                  f"bias {o['bias']}%, coverage {o['coverage']}%")
+            scores = ", ".join(f"{name} {wape}%" for name, wape in r["model_scores"].items())
+            print(f"      WAPE by model: {scores} -> {r['best_model']}")
+            for h in r["by_horizon"]:
+                print(f"      h={h['horizon']:>2}  n={h['samples']:<4} MAPE {h['mape']}%  "
+                      f"bias {h['bias']}%  coverage {h['coverage']}%")
+    return 1 if any(r["status"] != "ok" for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
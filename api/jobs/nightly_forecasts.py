@@ -0,0 +1,69 @@
+"""
+Forkast Nightly Forecast Job
+Batch-forecasts every restaurant (or a given list) and stores the results
+
+Usage:
+    python -m api.jobs.nightly_forecasts [--restaurants R1 R2] [--days-ahead 30] [--workers 8]
+    python -m api.jobs.nightly_forecasts --incremental
+"""
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.config import settings
+from api.database import SessionLocal, create_tables
+from api.models.db_models import RestaurantDB
+from api.services.forecast_service import ForecastService
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run batch demand forecasts")
+    parser.add_argument("--restaurants", nargs="*", help="Restaurant UIDs (default: all)")
+    parser.add_argument("--days-ahead", type=int, default=settings.forecast_horizon_days)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only recompute restaurants/dates whose inputs changed")
+    args = parser.parse_args(argv)
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        uids = args.restaurants or [uid for (uid,) in db.query(RestaurantDB.uid).all()]
+        if args.incremental:
+            return refresh(db, uids, args.days_ahead)
+        report = ForecastService.run_batch(
+            db, uids, days_ahead=args.days_ahead, max_workers=args.workers
+        )
+    finally:
+        db.close()
+
+    for r in sorted(report["restaurants"], key=lambda r: r["restaurant_uid"]):
+        if r["status"] == "ok":
+            print(f"  {r['restaurant_uid']}: {r['rows']} rows, train {r['train_ms']}ms, "
+                  f"forecast {r['forecast_ms']}ms, wall {r['wall_ms']}ms")
+        else:
+            print(f"  {r['restaurant_uid']}: FAILED - {r['error']}")
+    print(f"Batch forecast: {report['succeeded']} ok, {report['failed']} failed, "
+          f"{report['rows_written']} rows in {report['elapsed_seconds']}s")
+    return 1 if report["failed"] else 0
+
+
+def refresh(db, uids, days_ahead: int) -> int:
+    failed = 0
+    for uid in uids:
+        try:
+            result = ForecastService.refresh_forecasts(db, uid, days_ahead)
+            print(f"  {uid}: {result['status']}, {result['rows']} rows written")
+        except Exception as e:
+            db.rollback()
+            failed += 1
+            print(f"  {uid}: FAILED - {type(e).__name__}: {e}")
+    print(f"Forecast refresh: {len(uids) - failed} ok, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -95,11 +95,34 @@ def seed_database():
         db.close()
 
 
+def load_event_calendars():
+    """Build the forecaster's event calendar for every restaurant country once, up front."""
+    from api.models.db_models import RestaurantDB
+    from forecasting.events import load_event_calendar
+    db = SessionLocal()
+    try:
+        load_event_calendar()
+        for (country,) in db.query(RestaurantDB.country).distinct():
+            load_event_calendar(country)
+    finally:
+        db.close()
+
+
+def warm_start_forecast_models():
+    """Load the models saved by the last batch run so first requests don't retrain."""
+    from api.services.forecast_service import model_registry
+    loaded = model_registry.warm_start()
+    if loaded:
+        print(f"Loaded {loaded} saved forecast models from {model_registry.model_dir}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     create_tables()
     seed_database()
+    load_event_calendars()
+    warm_start_forecast_models()
     print(f"Forkast API v{settings.app_version} started on port {settings.api_port}")
     print(f"Swagger docs: http://localhost:{settings.api_port}/docs")
     yield
@@ -5,8 +5,8 @@ Maps core.py dataclasses to persistent SQLite tables
 import uuid
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Integer, Float, Boolean, DateTime,
-    Text, ForeignKey, JSON, UniqueConstraint,
+    Column, String, Integer, Float, Boolean, DateTime, Date,
+    Text, ForeignKey, JSON, UniqueConstraint, Index,
 )
 from sqlalchemy.orm import relationship
 from api.database import Base
@@ -79,6 +79,21 @@ class InventoryItemDB(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
+class InventoryLotDB(Base):
+    __tablename__ = "inventory_lots"
+    __table_args__ = (
+        Index("ix_inventory_lots_restaurant_item", "restaurant_uid", "item_uid"),
+    )
+
+    uid = Column(String(8), primary_key=True, default=generate_uid)
+    restaurant_uid = Column(String(8), ForeignKey("restaurants.uid"), nullable=False)
+    item_uid = Column(String(8), ForeignKey("inventory_items.uid"), nullable=False)
+    quantity = Column(Float, default=0.0)  # Remaining; depleted lots are deleted
+    received_date = Column(Date, nullable=False)
+    expiry_date = Column(Date, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+
+
 class SupplierDB(Base):
     __tablename__ = "suppliers"
 
@@ -97,10 +112,14 @@ class SupplierDB(Base):
     is_active = Column(Boolean, default=True)
     total_orders = Column(Integer, default=0)
     total_value = Column(Float, default=0.0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
 class OrderDB(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_restaurant_date", "restaurant_uid", "order_date"),
+    )
 
     uid = Column(String(8), primary_key=True, default=generate_uid)
     restaurant_uid = Column(String(8), ForeignKey("restaurants.uid"), nullable=False)
@@ -120,7 +139,7 @@ class OrderItemDB(Base):
     __tablename__ = "order_items"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    order_uid = Column(String(8), ForeignKey("orders.uid"), nullable=False)
+    order_uid = Column(String(8), ForeignKey("orders.uid"), nullable=False, index=True)
     menu_item_uid = Column(String(8), nullable=True)
     item_name = Column(String(255), nullable=False)
     quantity = Column(Integer, default=1)
@@ -130,6 +149,50 @@ class OrderItemDB(Base):
     order = relationship("OrderDB", back_populates="items")
 
 
+class ForecastDB(Base):
+    __tablename__ = "forecasts"
+    __table_args__ = (
+        UniqueConstraint("restaurant_uid", "forecast_date", name="uq_forecast_rest_date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    restaurant_uid = Column(String(8), ForeignKey("restaurants.uid"), nullable=False)
+    forecast_date = Column(Date, nullable=False)
+    predicted_covers = Column(Integer, default=0)
+    predicted_revenue = Column(Float, default=0.0)
+    confidence_lower = Column(Float, default=0.0)
+    confidence_upper = Column(Float, default=0.0)
+    p10 = Column(Float, default=0.0)
+    p50 = Column(Float, default=0.0)
+    p90 = Column(Float, default=0.0)
+    day_of_week = Column(String(10), default="")
+    is_holiday = Column(Boolean, default=False)
+    channel_breakdown = Column(JSON, default=dict)
+    components = Column(JSON, default=dict)  # Trend/DOW/month/event covers, for /forecasts/explain
+    data_version = Column(String(64), default="")  # Order count + latest order time at compute
+    generated_at = Column(DateTime, default=datetime.now)
+
+
+class AlertDB(Base):
+    __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_restaurant_created", "restaurant_uid", "created_at"),
+    )
+
+    uid = Column(String(8), primary_key=True, default=generate_uid)
+    restaurant_uid = Column(String(8), ForeignKey("restaurants.uid"), nullable=False)
+    severity = Column(String(10), default="medium")
+    category = Column(String(20), default="")  # inventory, demand, labor, waste, supplier
+    title = Column(String(255), default="")
+    message = Column(Text, default="")
+    recommended_action = Column(Text, default="")
+    alert_date = Column(Date, nullable=True)  # Business day the alert is about
+    details = Column(JSON, default=dict)
+    is_read = Column(Boolean, default=False)
+    action_taken = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+
 class PaymentDB(Base):
     __tablename__ = "payments"
 
@@ -2,9 +2,9 @@
 Forkast API Pydantic Schemas
 Request and response models for all endpoints
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -135,6 +135,29 @@ class InventoryItemResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class LotCreate(BaseModel):
+    restaurant_uid: str
+    item_uid: str
+    quantity: float = Field(gt=0)
+    received_date: Optional[date] = None
+    expiry_date: Optional[date] = None
+
+
+class LotResponse(BaseModel):
+    uid: str
+    item_uid: str
+    quantity: float
+    received_date: date
+    expiry_date: Optional[date] = None
+    model_config = {"from_attributes": True}
+
+
+class UsageCreate(BaseModel):
+    restaurant_uid: str
+    item_uid: str
+    quantity: float = Field(gt=0)
+
+
 # --- Staff Schemas ---
 class StaffClockEvent(BaseModel):
     restaurant_uid: str
@@ -154,6 +177,23 @@ class StaffClockResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# --- Alert Schemas ---
+class AlertResponse(BaseModel):
+    uid: str
+    restaurant_uid: str
+    severity: str
+    category: str
+    title: str
+    message: str
+    recommended_action: str
+    alert_date: Optional[date] = None
+    details: dict = {}
+    is_read: bool
+    action_taken: bool
+    created_at: datetime
+    model_config = {"from_attributes": True}
+
+
 # --- Payment Schemas ---
 class PaymentCreate(BaseModel):
     restaurant_uid: str
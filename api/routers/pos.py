@@ -2,8 +2,6 @@
 Forkast POS Integration Endpoints
 REST API for any POS system to sync data with Forkast
 """
-import sys
-from pathlib import Path
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -14,10 +12,14 @@ from api.models.db_models import APIKeyDB, StaffClockEventDB
 from api.models.schemas import (
     OrderCreate, OrderResponse,
     MenuSyncRequest, MenuItemResponse, MenuItemUpdate,
-    InventoryBatchUpdate, InventoryItemResponse,
+    InventoryBatchUpdate, InventoryItemResponse, LotCreate, LotResponse, UsageCreate,
     StaffClockEvent, StaffClockResponse,
+    AlertResponse,
 )
+from api.services.anomaly_service import AnomalyService
 from api.services.data_service import DataService
+from api.services.forecast_service import ForecastService
+from api.services.lot_service import LotService
 
 router = APIRouter(prefix="/api/v1/pos", tags=["POS Integration"])
 
@@ -122,6 +124,83 @@ def get_inventory(
     return DataService.get_inventory(db, restaurant_uid)
 
 
+@router.get("/inventory/reorder")
+def get_reorder_recommendations(
+    restaurant_uid: str = Query(...),
+    days_ahead: int = Query(7, ge=1, le=30),
+    use_forecast: bool = Query(True),
+    service_level: float = Query(0.95, gt=0.5, lt=1.0),
+    perishable: bool = Query(True),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """Reorder quantities and stockout dates, from forecast ingredient usage unless use_forecast is false."""
+    return ForecastService.get_reorder_recommendations(
+        db, restaurant_uid, days_ahead, use_forecast, service_level, perishable
+    )
+
+
+@router.get("/inventory/policies")
+def get_inventory_policies(
+    restaurant_uid: str = Query(...),
+    review_days: int = Query(7, ge=1, le=30),
+    service_level: float = Query(0.95, gt=0.5, lt=1.0),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """Reorder point (s) and order-up-to level (S) per item from lead time, fill rate and demand uncertainty."""
+    return ForecastService.get_inventory_policies(db, restaurant_uid, review_days, service_level)
+
+
+@router.post("/inventory/lots", response_model=LotResponse, status_code=201)
+def receive_lot(
+    lot: LotCreate,
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:write")),
+):
+    """Record a delivered lot; expiry defaults to the item's shelf life."""
+    result = LotService.receive_lot(
+        db, lot.restaurant_uid, lot.item_uid, lot.quantity, lot.received_date, lot.expiry_date
+    )
+    if not result:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    return result
+
+
+@router.post("/inventory/usage")
+def record_usage(
+    usage: UsageCreate,
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:write")),
+):
+    """Deplete an item's lots oldest first, then its untracked stock."""
+    result = LotService.record_usage(db, usage.restaurant_uid, usage.item_uid, usage.quantity)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    return result
+
+
+@router.get("/inventory/expiring")
+def get_expiring_lots(
+    restaurant_uid: str = Query(...),
+    days: int = Query(3, ge=0, le=90),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """Lots expiring within the next days, soonest first."""
+    return LotService.get_expiring(db, restaurant_uid, days)
+
+
+@router.post("/inventory/lots/expire")
+def expire_lots(
+    restaurant_uid: str = Query(...),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:write")),
+):
+    """Write off expired lots and return the quantity wasted per item."""
+    return LotService.expire_lots(db, restaurant_uid)
+
+
 # --- Staff ---
 @router.post("/staff/clock-in", response_model=StaffClockResponse, status_code=201)
 def staff_clock_in(
@@ -162,17 +241,54 @@ def get_staff_schedule(
 def get_forecasts(
     restaurant_uid: str = Query(...),
     days_ahead: int = Query(14, ge=1, le=30),
+    db: Session = Depends(get_db),
     api_key: APIKeyDB = Depends(require_permission("pos:read")),
 ):
     """Get demand forecasts using the Forkast AI engine."""
-    project_root = Path(__file__).parent.parent.parent
-    sys.path.insert(0, str(project_root))
-    from data.demo_generator import DemoDataGenerator
-    from forecasting.demand_engine import DemandForecastEngine
-
-    gen = DemoDataGenerator()
-    data = gen.generate_all()
-    engine = DemandForecastEngine()
-    engine.train(data["historical_orders"])
-    forecasts = engine.forecast(days_ahead=days_ahead)
-    return [f.to_dict() for f in forecasts]
+    return ForecastService.get_forecasts(db, restaurant_uid, days_ahead)
+
+
+@router.get("/forecasts/explain")
+def explain_forecasts(
+    restaurant_uid: str = Query(...),
+    days_ahead: int = Query(14, ge=1, le=30),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """Break each forecast into trend, day-of-week, month and event effects (in covers)."""
+    return ForecastService.get_forecast_explanations(db, restaurant_uid, days_ahead)
+
+
+@router.get("/forecasts/prep")
+def get_prep_sheet(
+    restaurant_uid: str = Query(...),
+    days_ahead: int = Query(7, ge=1, le=30),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """Daily prep portions per menu item and ingredient requirements from the item forecast."""
+    return ForecastService.get_prep_sheets(db, [restaurant_uid], days_ahead)[restaurant_uid]
+
+
+@router.get("/forecasts/hourly")
+def get_hourly_forecasts(
+    restaurant_uid: str = Query(...),
+    days_ahead: int = Query(7, ge=1, le=30),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """Get hour-by-hour covers forecasts for staffing, learned from order timestamps."""
+    return ForecastService.get_hourly_forecasts(db, restaurant_uid, days_ahead)
+
+
+# --- Alerts ---
+@router.get("/alerts", response_model=List[AlertResponse])
+def list_alerts(
+    restaurant_uid: str = Query(...),
+    unread_only: bool = Query(False),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    api_key: APIKeyDB = Depends(require_permission("pos:read")),
+):
+    """List alerts raised for a restaurant, newest first (e.g. covers far off forecast)."""
+    return AnomalyService.get_alerts(db, restaurant_uid, unread_only, limit)
@@ -0,0 +1,126 @@
+"""
+Forkast Anomaly Service
+Checks incoming POS orders against the cached forecast and raises demand alerts
+"""
+import logging
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.config import settings
+from api.models.db_models import AlertDB, ForecastDB
+from api.services.forecast_service import model_registry
+from forecasting.anomaly import CoversAnomalyDetector
+
+logger = logging.getLogger(__name__)
+
+anomaly_detector = CoversAnomalyDetector(
+    alpha=settings.forecast_anomaly_alpha,
+    z_threshold=settings.forecast_anomaly_z_threshold,
+)
+
+_ALERT_TEXT = {
+    "drop": (
+        "Covers far below forecast",
+        "Check the POS feed for a sync outage and whether the restaurant closed unexpectedly.",
+    ),
+    "surge": (
+        "Covers far above forecast",
+        "Check stock and staffing; if demand stays this high, procurement needs to catch up.",
+    ),
+    "spike": (
+        "Covers running past the forecast band",
+        "Check the POS integration for duplicated orders before relying on today's numbers.",
+    ),
+}
+
+
+class AnomalyService:
+    """Streaming demand anomaly checks and the alerts they raise."""
+
+    @staticmethod
+    def expected_covers(db: Session, restaurant_uid: str, day: date) -> Optional[Tuple[float, float]]:
+        """
+        Forecast covers and upper band for a day.
+
+        Reads the stored forecast row, falling back to the cached engine;
+        never trains a model, so it stays cheap on the ingestion path.
+        """
+        row = db.query(ForecastDB.predicted_covers, ForecastDB.confidence_upper).filter(
+            ForecastDB.restaurant_uid == restaurant_uid,
+            ForecastDB.forecast_date == day,
+        ).first()
+        if row is not None:
+            return float(row.predicted_covers), float(row.confidence_upper)
+
+        engine = model_registry.get(restaurant_uid, count=False)
+        if engine is None:
+            return None
+        forecast = engine.forecast_dates([day])[0]
+        return float(forecast.predicted_covers), float(forecast.confidence_upper)
+
+    @staticmethod
+    def observe_order(db: Session, restaurant_uid: str, order_date: datetime, covers: int) -> List[AlertDB]:
+        """
+        Feed one order to the detector and store an alert for each anomaly it reports.
+
+        Failures are logged rather than raised so a broken check never rejects an order.
+        """
+        try:
+            anomalies = anomaly_detector.observe(
+                restaurant_uid, order_date.date(), covers,
+                lambda day: AnomalyService.expected_covers(db, restaurant_uid, day),
+            )
+            if not anomalies:
+                return []
+            alerts = [AnomalyService._to_alert(restaurant_uid, a) for a in anomalies]
+            db.add_all(alerts)
+            db.commit()
+            return alerts
+        except Exception:
+            db.rollback()
+            logger.exception("Anomaly check failed for restaurant %s", restaurant_uid)
+            return []
+
+    @staticmethod
+    def get_alerts(
+        db: Session,
+        restaurant_uid: str,
+        unread_only: bool = False,
+        limit: int = 50,
+    ) -> List[AlertDB]:
+        query = db.query(AlertDB).filter(AlertDB.restaurant_uid == restaurant_uid)
+        if unread_only:
+            query = query.filter(AlertDB.is_read == False)  # noqa: E712
+        return query.order_by(AlertDB.created_at.desc()).limit(limit).all()
+
+    @staticmethod
+    def _to_alert(restaurant_uid: str, anomaly: Dict[str, Any]) -> AlertDB:
+        title, action = _ALERT_TEXT[anomaly["kind"]]
+        day = anomaly["date"]
+        expected = anomaly["expected"]
+        message = f"{day.strftime('%A %d %b')}: {anomaly['actual']} covers"
+        if expected is not None:
+            message += f" against {expected:.0f} forecast"
+        if anomaly["z"] is not None:
+            message += f" ({anomaly['z']:+.1f} std devs from the usual forecast error)"
+        return AlertDB(
+            restaurant_uid=restaurant_uid,
+            severity=anomaly["severity"],
+            category="demand",
+            title=title,
+            message=message + ".",
+            recommended_action=action,
+            alert_date=day,
+            details={
+                "kind": anomaly["kind"],
+                "actual": anomaly["actual"],
+                "expected": expected,
+                "z": anomaly["z"],
+            },
+        )
@@ -12,6 +12,8 @@ from api.models.db_models import (
 )
 from api.auth import hash_api_key
 from api.config import settings
+from api.services.anomaly_service import AnomalyService
+from api.services.forecast_service import ForecastService
 
 
 class DataService:
@@ -47,6 +49,8 @@ class DataService:
 
         db.commit()
         db.refresh(order)
+        ForecastService.notify_new_order(order.restaurant_uid, order.order_date)
+        AnomalyService.observe_order(db, order.restaurant_uid, order.order_date, order.covers)
         return order
 
     @staticmethod
@@ -107,6 +111,7 @@ class DataService:
                 results.append(new_item)
 
         db.commit()
+        ForecastService.invalidate_bom(restaurant_uid)
         for r in results:
             db.refresh(r)
         return results
@@ -129,6 +134,7 @@ class DataService:
             item.food_cost_pct = (item.cost / item.price) * 100
         item.updated_at = datetime.now()
         db.commit()
+        ForecastService.invalidate_bom(item.restaurant_uid)
         db.refresh(item)
         return item
 
@@ -0,0 +1,616 @@
+"""
+Forkast Forecast Service
+Serves demand forecasts from a per-restaurant cache of trained engines
+"""
+import sys
+import threading
+import zlib
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, func, insert
+from sqlalchemy.orm import Session
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.config import settings
+from api.models.db_models import (
+    OrderDB, OrderItemDB, ForecastDB, InventoryItemDB, MenuItemDB, RestaurantDB, SupplierDB,
+)
+from api.services.lot_service import LotService
+from forecasting.batch import run_batch
+from forecasting.demand_engine import DemandForecastEngine
+from forecasting.intraday import IntradayProfile
+from forecasting.model_registry import ForecastModelRegistry
+from inventory.bom import BillOfMaterials
+from inventory.optimizer import InventoryOptimizer
+from inventory.policy import SERVICE_LEVEL
+from models.core import DemandForecast, IngredientCategory, InventoryItem, Supplier, SupplierTier
+from suppliers.index import SupplierIndex
+
+model_registry = ForecastModelRegistry(
+    max_models=settings.forecast_cache_max_models,
+    ttl_seconds=settings.forecast_cache_ttl_seconds,
+    model_dir=settings.forecast_model_dir or None,
+    model_max_age_seconds=settings.forecast_model_max_age_hours * 3600,
+)
+
+# Demo-trained engines for restaurants with too few POS days: uid -> (date ordinal built, engine)
+_demo_engines: Dict[str, Tuple[int, DemandForecastEngine]] = {}
+_demo_lock = threading.Lock()
+
+# Compiled bill of materials per restaurant: uid -> ((menu row count, max updated_at), BOM)
+_boms: Dict[str, Tuple[tuple, BillOfMaterials]] = {}
+_bom_lock = threading.Lock()
+
+# Category -> supplier index over the suppliers table, and the (row count, max updated_at) it reflects
+supplier_index = SupplierIndex()
+_supplier_lock = threading.Lock()
+_supplier_version: Optional[tuple] = None
+
+
+def _day_key(value) -> str:
+    """Normalize a SQL date() result (str on SQLite, date elsewhere) to ISO format."""
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _forecast_row_to_dict(row: ForecastDB) -> dict:
+    """Same shape as DemandForecast.to_dict()."""
+    return {
+        "date": row.forecast_date.isoformat(),
+        "predicted_covers": row.predicted_covers,
+        "predicted_revenue": row.predicted_revenue,
+        "confidence_lower": row.confidence_lower,
+        "confidence_upper": row.confidence_upper,
+        "p10": row.p10,
+        "p50": row.p50,
+        "p90": row.p90,
+        "day_of_week": row.day_of_week,
+        "is_holiday": row.is_holiday,
+        "channels": row.channel_breakdown,
+    }
+
+
+def _inventory_item(row: InventoryItemDB) -> InventoryItem:
+    return InventoryItem(
+        uid=row.uid,
+        name=row.name,
+        category=IngredientCategory(row.category),
+        unit=row.unit,
+        current_stock=row.current_stock,
+        min_stock=row.min_stock,
+        max_stock=row.max_stock,
+        reorder_point=row.reorder_point,
+        unit_cost=row.unit_cost,
+        shelf_life_days=row.shelf_life_days,
+        supplier_uid=row.supplier_uid,
+        last_restock=row.last_restock,
+        daily_usage_avg=row.daily_usage_avg,
+        wastage_pct=row.wastage_pct,
+    )
+
+
+def _supplier(row: SupplierDB) -> Supplier:
+    return Supplier(
+        uid=row.uid,
+        name=row.name,
+        tier=SupplierTier(row.tier),
+        categories=[IngredientCategory(c) for c in row.categories or []],
+        city=row.city,
+        country=row.country,
+        lead_time_days=row.lead_time_days,
+        min_order_value=row.min_order_value,
+        reliability_score=row.reliability_score,
+        avg_fill_rate=row.avg_fill_rate,
+        is_active=row.is_active,
+    )
+
+
+class ForecastService:
+    """Forecast lookups backed by the model registry."""
+
+    @staticmethod
+    def get_daily_history(
+        db: Session,
+        restaurant_uid: str,
+        days: Optional[int] = None,
+        since: Optional[date] = None,
+    ) -> List[dict]:
+        """
+        Build daily order summaries for DemandForecastEngine.train from POS orders.
+
+        Only closed days (before today) are included, starting at `since` or
+        `days` days ago. All aggregation is done by GROUP BY in the database;
+        only one row per day (and one per day/item) is returned to Python.
+        """
+        if since is None:
+            since = date.today() - timedelta(days=days or settings.forecast_history_days)
+        start = datetime.combine(since, datetime.min.time())
+        end = datetime.combine(date.today(), datetime.min.time())
+        in_window = (
+            OrderDB.restaurant_uid == restaurant_uid,
+            OrderDB.order_date >= start,
+            OrderDB.order_date < end,
+        )
+        day = func.date(OrderDB.order_date)
+
+        def channel_covers(channel: str):
+            return func.sum(case((OrderDB.channel == channel, OrderDB.covers), else_=0))
+
+        daily_rows = db.query(
+            day.label("day"),
+            func.sum(OrderDB.covers).label("covers"),
+            func.sum(OrderDB.total_amount).label("revenue"),
+            func.count(OrderDB.uid).label("orders"),
+            channel_covers("dine_in").label("dine_in"),
+            channel_covers("delivery").label("delivery"),
+            channel_covers("takeaway").label("takeaway"),
+        ).filter(*in_window).group_by(day).order_by(day).all()
+
+        if not daily_rows:
+            return []
+
+        # Busiest hour per day: covers per (day, hour), then max per day
+        hourly = db.query(
+            day.label("day"),
+            func.sum(OrderDB.covers).label("covers"),
+        ).filter(*in_window).group_by(day, func.extract("hour", OrderDB.order_date)).subquery()
+        peak_rows = db.query(
+            hourly.c.day, func.max(hourly.c.covers)
+        ).group_by(hourly.c.day).all()
+        peak_by_day = {_day_key(d): int(peak or 0) for d, peak in peak_rows}
+
+        item_rows = db.query(
+            day.label("day"),
+            OrderItemDB.item_name,
+            func.sum(OrderItemDB.quantity),
+        ).join(OrderDB, OrderItemDB.order_uid == OrderDB.uid).filter(*in_window).group_by(day, OrderItemDB.item_name).all()
+        items_by_day = {}
+        for d, item_name, qty in item_rows:
+            items_by_day.setdefault(_day_key(d), {})[item_name] = int(qty or 0)
+
+        history = []
+        for row in daily_rows:
+            key = _day_key(row.day)
+            covers = int(row.covers or 0)
+            revenue = float(row.revenue or 0.0)
+            history.append({
+                "date": key,
+                "day_of_week": date.fromisoformat(key).strftime("%A"),
+                "total_covers": covers,
+                "dine_in": int(row.dine_in or 0),
+                "delivery": int(row.delivery or 0),
+                "takeaway": int(row.takeaway or 0),
+                "total_revenue": round(revenue, 2),
+                "avg_check": round(revenue / covers, 2) if covers > 0 else 0.0,
+                "orders_count": int(row.orders or 0),
+                "peak_hour_covers": peak_by_day.get(key, 0),
+                "item_orders": items_by_day.get(key, {}),
+            })
+        return history
+
+    @staticmethod
+    def load_history(db: Session, restaurant_uid: str) -> Optional[List[dict]]:
+        """
+        Daily order summaries used to train a restaurant's engine.
+
+        None until the restaurant has enough POS days (see demo_history).
+        """
+        history = ForecastService.get_daily_history(db, restaurant_uid)
+        if len(history) >= settings.forecast_min_history_days:
+            return history
+        return None
+
+    @staticmethod
+    def demo_history(restaurant_uid: str) -> List[dict]:
+        """Demo daily summaries for a restaurant without enough POS days, the same on every call for a day."""
+        from data.demo_generator import DemoDataGenerator
+        gen = DemoDataGenerator(seed=zlib.crc32(restaurant_uid.encode()))
+        return gen.generate_historical_orders(gen.generate_menu(), days=90)
+
+    @staticmethod
+    def get_country(db: Session, restaurant_uid: str) -> Optional[str]:
+        """Restaurant country, which selects its national holidays in the event calendar."""
+        row = db.query(RestaurantDB.country).filter(RestaurantDB.uid == restaurant_uid).first()
+        return row[0] if row else None
+
+    @staticmethod
+    def get_engine(db: Session, restaurant_uid: str):
+        """
+        The restaurant's engine from the model registry, or, while it has too
+        few POS days, a demo-trained engine kept apart from the registry: it
+        is never saved as the restaurant's model or rolled forward with its
+        orders, and is rebuilt daily.
+        """
+        engine = model_registry.get_or_train(
+            restaurant_uid,
+            lambda: ForecastService.load_history(db, restaurant_uid),
+            lambda since: ForecastService.get_daily_history(db, restaurant_uid, since=since),
+            lambda: DemandForecastEngine(country=ForecastService.get_country(db, restaurant_uid)),
+        )
+        today = date.today().toordinal()
+        with _demo_lock:
+            if engine is not None:
+                _demo_engines.pop(restaurant_uid, None)
+                return engine
+            built, engine = _demo_engines.get(restaurant_uid, (None, None))
+        if built != today:
+            engine = DemandForecastEngine(country=ForecastService.get_country(db, restaurant_uid))
+            engine.train(ForecastService.demo_history(restaurant_uid))
+            with _demo_lock:
+                _demo_engines[restaurant_uid] = (today, engine)
+        return engine
+
+    @staticmethod
+    def get_data_version(db: Session, restaurant_uid: str) -> str:
+        """Fingerprint of the closed-day orders a restaurant's model is trained on."""
+        count, latest = db.query(
+            func.count(OrderDB.uid), func.max(OrderDB.created_at)
+        ).filter(
+            OrderDB.restaurant_uid == restaurant_uid,
+            OrderDB.order_date < datetime.combine(date.today(), datetime.min.time()),
+        ).one()
+        return f"{count}:{latest.isoformat() if latest else ''}"
+
+    @staticmethod
+    def save_forecasts(
+        db: Session, restaurant_uid: str, forecasts: List[DemandForecast], data_version: str = ""
+    ) -> int:
+        """Replace a restaurant's stored forecasts for the given dates with one bulk insert."""
+        if not forecasts:
+            return 0
+        generated_at = datetime.now()
+        db.execute(delete(ForecastDB).where(
+            ForecastDB.restaurant_uid == restaurant_uid,
+            ForecastDB.forecast_date.in_([f.forecast_date for f in forecasts]),
+        ))
+        db.execute(insert(ForecastDB), [{
+            "restaurant_uid": restaurant_uid,
+            "forecast_date": f.forecast_date,
+            "predicted_covers": f.predicted_covers,
+            "predicted_revenue": f.predicted_revenue,
+            "confidence_lower": f.confidence_lower,
+            "confidence_upper": f.confidence_upper,
+            "p10": f.p10,
+            "p50": f.p50,
+            "p90": f.p90,
+            "day_of_week": f.day_of_week,
+            "is_holiday": f.is_holiday,
+            "channel_breakdown": f.channel_breakdown,
+            "components": f.components,
+            "data_version": data_version,
+            "generated_at": generated_at,
+        } for f in forecasts])
+        db.commit()
+        return len(forecasts)
+
+    @staticmethod
+    def refresh_forecasts(
+        db: Session, restaurant_uid: str, horizon: Optional[int] = None
+    ) -> dict:
+        """
+        Bring a restaurant's stored forecasts up to date.
+
+        Rows computed from the current closed-day order data are kept. A day
+        closing with new orders invalidates the whole horizon (the cached
+        engine folds that day in rather than retraining); a day rolling over
+        without orders only adds the dates that entered the horizon and drops
+        the ones that left it.
+        """
+        horizon = horizon or settings.forecast_horizon_days
+        today = date.today()
+        wanted = [today + timedelta(days=i) for i in range(1, horizon + 1)]
+        version = ForecastService.get_data_version(db, restaurant_uid)
+
+        # Today's row stays until tomorrow: the anomaly check compares live covers against it
+        db.execute(delete(ForecastDB).where(
+            ForecastDB.restaurant_uid == restaurant_uid,
+            ForecastDB.forecast_date < today,
+        ))
+        stored = dict(db.query(ForecastDB.forecast_date, ForecastDB.data_version).filter(
+            ForecastDB.restaurant_uid == restaurant_uid,
+            ForecastDB.forecast_date.between(wanted[0], wanted[-1]),
+        ).all())
+
+        if any(v != version for v in stored.values()):
+            missing, status = wanted, "recomputed"
+        else:
+            missing = [d for d in wanted if d not in stored]
+            status = "fresh" if not missing else "extended" if stored else "computed"
+
+        rows = 0
+        if missing:
+            engine = ForecastService.get_engine(db, restaurant_uid)
+            rows = ForecastService.save_forecasts(
+                db, restaurant_uid, engine.forecast_dates(missing), version
+            )
+        else:
+            db.commit()
+        return {"restaurant_uid": restaurant_uid, "status": status, "rows": rows}
+
+    @staticmethod
+    def _stored_rows(
+        db: Session, restaurant_uid: str, days_ahead: int, refresh_missing: bool = True
+    ) -> List[ForecastDB]:
+        """
+        Stored forecast rows for the next days_ahead days.
+
+        Only if some of those dates have no row (a first request, or the
+        nightly job hasn't run since the day rolled over) is the horizon
+        refreshed first; rows computed from older order data are left to
+        the nightly job.
+        """
+        today = date.today()
+        query = db.query(ForecastDB).filter(
+            ForecastDB.restaurant_uid == restaurant_uid,
+            ForecastDB.forecast_date.between(
+                today + timedelta(days=1), today + timedelta(days=days_ahead)
+            ),
+        ).order_by(ForecastDB.forecast_date)
+        rows = query.all()
+        if refresh_missing and len(rows) < days_ahead:
+            ForecastService.refresh_forecasts(
+                db, restaurant_uid, max(days_ahead, settings.forecast_horizon_days)
+            )
+            rows = query.all()
+        return rows
+
+    @staticmethod
+    def get_stored_forecasts(db: Session, restaurant_uid: str, days_ahead: int = 14) -> List[dict]:
+        """Read precomputed forecasts for the next days_ahead days."""
+        rows = ForecastService._stored_rows(db, restaurant_uid, days_ahead, refresh_missing=False)
+        return [_forecast_row_to_dict(r) for r in rows]
+
+    @staticmethod
+    def get_forecasts(db: Session, restaurant_uid: str, days_ahead: int = 14) -> List[dict]:
+        """Read stored forecasts, computing them only for dates that have none."""
+        rows = ForecastService._stored_rows(db, restaurant_uid, days_ahead)
+        return [_forecast_row_to_dict(r) for r in rows]
+
+    @staticmethod
+    def get_forecast_explanations(db: Session, restaurant_uid: str, days_ahead: int = 14) -> List[dict]:
+        """
+        Each stored forecast's components, as saved when it was computed.
+
+        Rows stored without components (computed before they were recorded)
+        are recomputed once; otherwise this is a table read.
+        """
+        rows = ForecastService._stored_rows(db, restaurant_uid, days_ahead)
+
+        missing = [r.forecast_date for r in rows if not r.components]
+        if missing:
+            engine = ForecastService.get_engine(db, restaurant_uid)
+            ForecastService.save_forecasts(
+                db, restaurant_uid, engine.forecast_dates(missing), rows[0].data_version
+            )
+            rows = ForecastService._stored_rows(db, restaurant_uid, days_ahead, refresh_missing=False)
+
+        return [{
+            "date": r.forecast_date.isoformat(),
+            "day_of_week": r.day_of_week,
+            "predicted_covers": r.predicted_covers,
+            **r.components,
+        } for r in rows]
+
+    @staticmethod
+    def get_hourly_history(db: Session, restaurant_uid: str, days: Optional[int] = None) -> List[tuple]:
+        """Covers per (closed day, hour of day) from POS order timestamps, as (day, hour, covers) rows."""
+        since = date.today() - timedelta(days=days or settings.forecast_history_days)
+        day = func.date(OrderDB.order_date)
+        hour = func.extract("hour", OrderDB.order_date)
+        rows = db.query(day, hour, func.sum(OrderDB.covers)).filter(
+            OrderDB.restaurant_uid == restaurant_uid,
+            OrderDB.order_date >= datetime.combine(since, datetime.min.time()),
+            OrderDB.order_date < datetime.combine(date.today(), datetime.min.time()),
+        ).group_by(day, hour).all()
+        return [(_day_key(d), int(h), int(c or 0)) for d, h, c in rows]
+
+    @staticmethod
+    def get_hourly_forecasts(db: Session, restaurant_uid: str, days_ahead: int = 7) -> List[dict]:
+        """Daily forecasts split into 24 hourly buckets by the restaurant's weekday/hour profile."""
+        daily = ForecastService.get_forecasts(db, restaurant_uid, days_ahead)
+        profile = IntradayProfile()
+        profile.train(ForecastService.get_hourly_history(db, restaurant_uid))
+        return profile.forecast(
+            [date.fromisoformat(f["date"]) for f in daily],
+            [f["predicted_covers"] for f in daily],
+        )
+
+    @staticmethod
+    def get_prep_sheets(db: Session, restaurant_uids: List[str], days_ahead: int = 7) -> dict:
+        """
+        Daily prep portions and ingredient quantities from each restaurant's item forecast.
+
+        Each restaurant's items x days grid is expanded through its cached
+        bill of materials (see get_bom).
+        """
+        return {
+            uid: ForecastService.get_bom(db, uid).prep_sheets(
+                {uid: ForecastService.get_engine(db, uid).forecast_items(days_ahead)}
+            )[uid].to_dict()
+            for uid in restaurant_uids
+        }
+
+    @staticmethod
+    def get_bom(db: Session, restaurant_uid: str) -> BillOfMaterials:
+        """
+        The restaurant's menu compiled into a bill of materials (site = restaurant uid).
+
+        Kept until the menu's row count or latest updated_at changes, or
+        invalidate_bom is called on a menu write; otherwise one aggregate query.
+        """
+        version = tuple(db.query(func.count(MenuItemDB.uid), func.max(MenuItemDB.updated_at)).filter(
+            MenuItemDB.restaurant_uid == restaurant_uid
+        ).one())
+        with _bom_lock:
+            cached = _boms.get(restaurant_uid)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        menu = db.query(MenuItemDB).filter(MenuItemDB.restaurant_uid == restaurant_uid).all()
+        bom = BillOfMaterials.compile({restaurant_uid: menu})
+        with _bom_lock:
+            _boms[restaurant_uid] = (version, bom)
+        return bom
+
+    @staticmethod
+    def invalidate_bom(restaurant_uid: str):
+        with _bom_lock:
+            _boms.pop(restaurant_uid, None)
+
+    @staticmethod
+    def get_reorder_recommendations(
+        db: Session,
+        restaurant_uid: str,
+        days_ahead: int = 7,
+        use_forecast: bool = True,
+        service_level: float = SERVICE_LEVEL,
+        perishable: bool = True,
+    ) -> List[dict]:
+        """
+        Reorder quantities planned against forecast daily ingredient usage (or
+        the flat average), ordered up to each item's (s, S) policy level and
+        capped by shelf life of the lots on hand unless perishable is off.
+        """
+        inventory = ForecastService._inventory(db, restaurant_uid)
+        suppliers = ForecastService.get_supplier_index(db)
+        optimizer = InventoryOptimizer()
+        usage, error_quantiles = None, None
+        if use_forecast:
+            engine = ForecastService.get_engine(db, restaurant_uid)
+            usage = optimizer.forecast_usage(
+                inventory, None, engine, days_ahead,
+                bom=ForecastService.get_bom(db, restaurant_uid), site=restaurant_uid,
+            )
+            error_quantiles = optimizer.forecast_error_quantiles(engine)
+        lots = LotService.get_lots_by_item(db, restaurant_uid) if perishable else None
+        return optimizer.generate_reorder_recommendations(
+            inventory, days_ahead, usage_forecast=usage, suppliers=suppliers,
+            service_level=service_level, error_quantiles=error_quantiles, perishable=perishable, lots=lots,
+        )
+
+    @staticmethod
+    def get_inventory_policies(
+        db: Session, restaurant_uid: str, review_days: int = 7, service_level: float = SERVICE_LEVEL
+    ) -> List[dict]:
+        """Per-item reorder point and order-up-to level, with the engine's forecast errors as demand uncertainty."""
+        optimizer = InventoryOptimizer()
+        return optimizer.compute_policies(
+            ForecastService._inventory(db, restaurant_uid),
+            ForecastService.get_supplier_index(db),
+            review_days,
+            service_level,
+            optimizer.forecast_error_quantiles(ForecastService.get_engine(db, restaurant_uid)),
+        )
+
+    @staticmethod
+    def get_supplier_index(db: Session) -> SupplierIndex:
+        """
+        The shared SupplierIndex, brought up to date with the suppliers table.
+
+        A changed row count or latest updated_at means rows were added,
+        edited or deleted: added and edited suppliers are re-indexed and
+        deleted ones removed. Otherwise this is one aggregate query.
+        """
+        global _supplier_version
+        with _supplier_lock:
+            version = tuple(db.query(func.count(SupplierDB.uid), func.max(SupplierDB.updated_at)).one())
+            if version != _supplier_version:
+                since = _supplier_version[1] if _supplier_version else None
+                uids = set()
+                for row in db.query(SupplierDB).all():
+                    uids.add(row.uid)
+                    known = supplier_index.get(row.uid)
+                    if known is None or since is None or (row.updated_at is not None and row.updated_at > since):
+                        supplier_index.update(_supplier(row))
+                for supplier in supplier_index.suppliers:
+                    if supplier.uid not in uids:
+                        supplier_index.remove(supplier.uid)
+                _supplier_version = version
+        return supplier_index
+
+    @staticmethod
+    def _inventory(db: Session, restaurant_uid: str) -> List[InventoryItem]:
+        return [_inventory_item(row) for row in db.query(InventoryItemDB).filter(
+            InventoryItemDB.restaurant_uid == restaurant_uid
+        ).all()]
+
+    @staticmethod
+    def run_batch(
+        db: Session,
+        restaurant_uids: List[str],
+        days_ahead: int = 14,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """
+        Train and forecast many restaurants across worker processes.
+
+        Histories are loaded here only as the pool has room (at most two per
+        worker in flight); each restaurant's forecasts are written as soon as
+        its worker finishes, and workers save the trained models for the registry to
+        warm-start from. Returns per-restaurant timing and failures.
+        """
+        started = time.perf_counter()
+        load_failures = []
+
+        versions = {}
+        demo_uids = set()
+
+        def jobs():
+            for uid in restaurant_uids:
+                try:
+                    versions[uid] = ForecastService.get_data_version(db, uid)
+                    history = ForecastService.load_history(db, uid)
+                    if history is None:
+                        demo_uids.add(uid)
+                        history = ForecastService.demo_history(uid)
+                    country = ForecastService.get_country(db, uid)
+                except Exception as e:
+                    db.rollback()
+                    load_failures.append({
+                        "restaurant_uid": uid,
+                        "status": "failed",
+                        "error": f"{type(e).__name__}: {e}",
+                    })
+                    continue
+                yield uid, history, country
+
+        results = []
+        workers = max_workers or settings.forecast_batch_workers or None
+        for result in run_batch(
+            jobs(), days_ahead=days_ahead, max_workers=workers, model_dir=model_registry.model_dir
+        ):
+            forecasts = result.pop("forecasts", None)
+            if result["restaurant_uid"] in demo_uids:
+                # Trained on demo history: serve its forecasts, but don't warm-start from it
+                model_registry.discard_saved(result["restaurant_uid"])
+            if result["status"] == "ok":
+                try:
+                    uid = result["restaurant_uid"]
+                    result["rows"] = ForecastService.save_forecasts(
+                        db, uid, forecasts, versions[uid]
+                    )
+                except Exception as e:
+                    db.rollback()
+                    result["status"] = "failed"
+                    result["error"] = f"{type(e).__name__}: {e}"
+            results.append(result)
+        results.extend(load_failures)
+
+        return {
+            "restaurants": results,
+            "succeeded": sum(1 for r in results if r["status"] == "ok"),
+            "failed": sum(1 for r in results if r["status"] == "failed"),
+            "rows_written": sum(r.get("rows", 0) for r in results),
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+        }
+
+    @staticmethod
+    def notify_new_order(restaurant_uid: str, order_date: datetime):
+        """
+        Orders for today are folded in when the day closes; an order backdated
+        into an already-trained day marks the cached engine stale instead.
+        """
+        if order_date.date() < date.today():
+            model_registry.mark_stale(restaurant_uid)
@@ -0,0 +1,203 @@
+"""
+Forkast Lot Service
+Received inventory lots, first-in first-out usage and expiry, kept in an in-memory index
+"""
+import dataclasses
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.models.db_models import InventoryItemDB, InventoryLotDB
+from inventory.lots import LotIndex
+from models.core import InventoryLot
+
+# Per-restaurant lot indexes, built from the lots table on first use
+_indexes: Dict[str, LotIndex] = {}
+_lock = threading.RLock()
+
+
+def _lot(row: InventoryLotDB) -> InventoryLot:
+    return InventoryLot(
+        uid=row.uid,
+        item_uid=row.item_uid,
+        quantity=row.quantity,
+        received_date=row.received_date,
+        expiry_date=row.expiry_date,
+    )
+
+
+class LotService:
+    """
+    Lot-level inventory.
+
+    Every change is written to the lots table and applied to the
+    restaurant's LotIndex; an item's current_stock moves with it. If a write
+    fails the index is dropped and rebuilt from the table on next use.
+    """
+
+    @staticmethod
+    def get_index(db: Session, restaurant_uid: str) -> LotIndex:
+        with _lock:
+            index = _indexes.get(restaurant_uid)
+            if index is None:
+                rows = db.query(InventoryLotDB).filter(InventoryLotDB.restaurant_uid == restaurant_uid).all()
+                index = _indexes[restaurant_uid] = LotIndex(_lot(row) for row in rows)
+            return index
+
+    @staticmethod
+    def invalidate(restaurant_uid: Optional[str] = None):
+        with _lock:
+            if restaurant_uid is None:
+                _indexes.clear()
+            else:
+                _indexes.pop(restaurant_uid, None)
+
+    @staticmethod
+    def receive_lot(
+        db: Session,
+        restaurant_uid: str,
+        item_uid: str,
+        quantity: float,
+        received_date: Optional[date] = None,
+        expiry_date: Optional[date] = None,
+    ) -> Optional[InventoryLotDB]:
+        """
+        Record a delivery of one item. The expiry date (the first day the lot
+        can't be used) defaults to received date + the item's shelf life.
+        """
+        item = db.query(InventoryItemDB).filter(
+            InventoryItemDB.restaurant_uid == restaurant_uid, InventoryItemDB.uid == item_uid
+        ).first()
+        if item is None:
+            return None
+        received_date = received_date or date.today()
+        row = InventoryLotDB(
+            restaurant_uid=restaurant_uid,
+            item_uid=item_uid,
+            quantity=quantity,
+            received_date=received_date,
+            expiry_date=expiry_date or received_date + timedelta(days=item.shelf_life_days),
+        )
+        with _lock:
+            index = LotService.get_index(db, restaurant_uid)
+            try:
+                db.add(row)
+                item.current_stock += quantity
+                item.last_restock = datetime.now()
+                db.commit()
+            except Exception:
+                db.rollback()
+                LotService.invalidate(restaurant_uid)
+                raise
+            db.refresh(row)
+            index.add(_lot(row))
+        return row
+
+    @staticmethod
+    def record_usage(db: Session, restaurant_uid: str, item_uid: str, quantity: float) -> Optional[dict]:
+        """
+        Take used stock from an item's oldest lots first, then from its
+        untracked stock (current_stock not covered by any lot). Whatever is
+        left is reported as shortfall. Returns None for an unknown item.
+        """
+        item = db.query(InventoryItemDB).filter(
+            InventoryItemDB.restaurant_uid == restaurant_uid, InventoryItemDB.uid == item_uid
+        ).first()
+        if item is None:
+            return None
+        with _lock:
+            index = LotService.get_index(db, restaurant_uid)
+            untracked = max(item.current_stock - index.on_hand(item_uid), 0.0)
+            taken, shortfall = index.consume(item_uid, quantity)
+            from_untracked = min(shortfall, untracked)
+            shortfall -= from_untracked
+            used = quantity - shortfall
+            try:
+                LotService._write_back(db, [lot for lot, _ in taken])
+                db.query(InventoryItemDB).filter(
+                    InventoryItemDB.restaurant_uid == restaurant_uid, InventoryItemDB.uid == item_uid
+                ).update(
+                    {InventoryItemDB.current_stock: InventoryItemDB.current_stock - used},
+                    synchronize_session=False,
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                LotService.invalidate(restaurant_uid)
+                raise
+            lots = [{"uid": lot.uid, "taken": round(qty, 3), "remaining": round(lot.quantity, 3)} for lot, qty in taken]
+        return {
+            "item_uid": item_uid,
+            "used": round(used, 3),
+            "untracked_used": round(from_untracked, 3),
+            "shortfall": round(shortfall, 3),
+            "lots": lots,
+        }
+
+    @staticmethod
+    def expire_lots(db: Session, restaurant_uid: str, today: Optional[date] = None) -> List[dict]:
+        """Write off every lot past its expiry date; returns what was discarded."""
+        with _lock:
+            index = LotService.get_index(db, restaurant_uid)
+            expired = index.expire(today or date.today())
+            try:
+                wasted: Dict[str, float] = {}
+                for lot in expired:
+                    wasted[lot.item_uid] = wasted.get(lot.item_uid, 0.0) + lot.quantity
+                    lot.quantity = 0.0
+                LotService._write_back(db, expired)
+                for item_uid, qty in wasted.items():
+                    db.query(InventoryItemDB).filter(
+                        InventoryItemDB.restaurant_uid == restaurant_uid, InventoryItemDB.uid == item_uid
+                    ).update(
+                        {InventoryItemDB.current_stock: InventoryItemDB.current_stock - qty},
+                        synchronize_session=False,
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                LotService.invalidate(restaurant_uid)
+                raise
+        return [{"item_uid": item_uid, "quantity": round(qty, 3)} for item_uid, qty in wasted.items()]
+
+    @staticmethod
+    def get_expiring(db: Session, restaurant_uid: str, days: int = 3) -> List[dict]:
+        """Lots expiring within days days (overdue ones included), soonest first."""
+        with _lock:
+            lots = [lot.to_dict() for lot in LotService.get_index(db, restaurant_uid).expiring_within(days, date.today())]
+        names = dict(db.query(InventoryItemDB.uid, InventoryItemDB.name).filter(
+            InventoryItemDB.uid.in_([lot["item_uid"] for lot in lots])
+        ).all())
+        for lot in lots:
+            lot["item_name"] = names.get(lot["item_uid"], "")
+        return lots
+
+    @staticmethod
+    def get_lots_by_item(db: Session, restaurant_uid: str) -> Dict[str, List[InventoryLot]]:
+        """Each item's lots in the order they will be used (copies, not the index's own lots)."""
+        with _lock:
+            index = LotService.get_index(db, restaurant_uid)
+            item_uids = [uid for uid, in db.query(InventoryItemDB.uid).filter(
+                InventoryItemDB.restaurant_uid == restaurant_uid
+            ).all()]
+            return {
+                uid: [dataclasses.replace(lot) for lot in index.lots(uid)]
+                for uid in item_uids if index.on_hand(uid) > 0
+            }
+
+    @staticmethod
+    def _write_back(db: Session, lots: List[InventoryLot]):
+        """Persist lot quantities; used-up lots are deleted"""
+        for lot in lots:
+            if lot.quantity <= 1e-9:
+                db.query(InventoryLotDB).filter(InventoryLotDB.uid == lot.uid).delete(synchronize_session=False)
+            else:
+                db.query(InventoryLotDB).filter(InventoryLotDB.uid == lot.uid).update(
+                    {InventoryLotDB.quantity: lot.quantity}, synchronize_session=False
+                )
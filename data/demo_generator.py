@@ -24,7 +24,8 @@ class DemoDataGenerator:
     """Generate comprehensive demo data for Forkast platform"""
 
     def __init__(self, seed: int = 42):
-        random.seed(seed)
+        # Own generator, so a seed gives the same data whatever else uses the random module
+        self.rng = random.Random(seed)
         self.restaurant = None
 
     def generate_restaurant(self) -> Restaurant:
@@ -84,7 +85,7 @@ class DemoDataGenerator:
                 prep_time_minutes=prep,
                 ingredients=ingredients,
                 popularity_score=popularity,
-                avg_daily_orders=round(popularity * random.uniform(8, 25), 1)
+                avg_daily_orders=round(popularity * self.rng.uniform(8, 25), 1)
             )
             menu.append(item)
 
@@ -123,8 +124,8 @@ class DemoDataGenerator:
         inventory = []
         for name, cat, unit, stock, min_s, max_s, reorder, cost, shelf, usage in inventory_data:
             # Add some randomness
-            stock_var = stock * random.uniform(0.6, 1.2)
-            wastage = random.uniform(2, 12) if cat in [IngredientCategory.PRODUCE, IngredientCategory.DAIRY, IngredientCategory.PROTEIN] else random.uniform(0.5, 3)
+            stock_var = stock * self.rng.uniform(0.6, 1.2)
+            wastage = self.rng.uniform(2, 12) if cat in [IngredientCategory.PRODUCE, IngredientCategory.DAIRY, IngredientCategory.PROTEIN] else self.rng.uniform(0.5, 3)
 
             item = InventoryItem(
                 name=name,
@@ -138,7 +139,7 @@ class DemoDataGenerator:
                 shelf_life_days=shelf,
                 daily_usage_avg=usage,
                 wastage_pct=round(wastage, 1),
-                last_restock=datetime.now() - timedelta(days=random.randint(1, 7))
+                last_restock=datetime.now() - timedelta(days=self.rng.randint(1, 7))
             )
             inventory.append(item)
 
@@ -167,8 +168,8 @@ class DemoDataGenerator:
                 min_order_value=min_order,
                 reliability_score=reliability,
                 avg_fill_rate=fill,
-                total_orders=random.randint(50, 300),
-                total_value=random.uniform(15000, 120000)
+                total_orders=self.rng.randint(50, 300),
+                total_value=self.rng.uniform(15000, 120000)
             )
             suppliers.append(supplier)
 
@@ -198,17 +199,17 @@ class DemoDataGenerator:
             trend = 1.0 + (day_offset / days) * 0.08
 
             # Random noise
-            noise = random.gauss(1.0, 0.1)
+            noise = self.rng.gauss(1.0, 0.1)
 
             total_covers = max(20, int(base_covers * day_factor * month_factor * trend * noise))
 
             # Channel split
-            dine_in_pct = random.uniform(0.45, 0.55)
-            delivery_pct = random.uniform(0.25, 0.35)
+            dine_in_pct = self.rng.uniform(0.45, 0.55)
+            delivery_pct = self.rng.uniform(0.25, 0.35)
             takeaway_pct = 1 - dine_in_pct - delivery_pct
 
             # Revenue per cover
-            avg_check = random.gauss(52, 8)
+            avg_check = self.rng.gauss(52, 8)
 
             daily_data = {
                 "date": current_date.date().isoformat(),
@@ -219,17 +220,17 @@ class DemoDataGenerator:
                 "takeaway": int(total_covers * takeaway_pct),
                 "total_revenue": round(total_covers * avg_check, 2),
                 "avg_check": round(avg_check, 2),
-                "orders_count": int(total_covers * random.uniform(0.6, 0.8)),
-                "peak_hour_covers": int(total_covers * random.uniform(0.25, 0.35)),
-                "food_waste_kg": round(total_covers * random.uniform(0.08, 0.15), 1),
-                "food_cost_pct": round(random.uniform(28, 35), 1),
-                "labor_cost_pct": round(random.uniform(22, 28), 1),
+                "orders_count": int(total_covers * self.rng.uniform(0.6, 0.8)),
+                "peak_hour_covers": int(total_covers * self.rng.uniform(0.25, 0.35)),
+                "food_waste_kg": round(total_covers * self.rng.uniform(0.08, 0.15), 1),
+                "food_cost_pct": round(self.rng.uniform(28, 35), 1),
+                "labor_cost_pct": round(self.rng.uniform(22, 28), 1),
             }
 
             # Item-level data
             item_orders = {}
             for item in menu:
-                qty = max(0, int(item.avg_daily_orders * day_factor * noise * random.uniform(0.7, 1.3)))
+                qty = max(0, int(item.avg_daily_orders * day_factor * noise * self.rng.uniform(0.7, 1.3)))
                 if qty > 0:
                     item_orders[item.name] = qty
 
@@ -326,7 +327,7 @@ class DemoDataGenerator:
 
             for name, role, rate in staff_roles:
                 # Not everyone works every day
-                if random.random() < (0.85 if is_peak else 0.70):
+                if self.rng.random() < (0.85 if is_peak else 0.70):
                     if role in ["head_chef", "manager"]:
                         start, end = "10:00", "22:00"
                         hours = 12
@@ -334,11 +335,11 @@ class DemoDataGenerator:
                         start, end = "11:00", "23:00"
                         hours = 12
                     elif is_peak:
-                        start = random.choice(["10:00", "11:00"])
-                        end = random.choice(["22:00", "23:00"])
+                        start = self.rng.choice(["10:00", "11:00"])
+                        end = self.rng.choice(["22:00", "23:00"])
                         hours = 12
                     else:
-                        shift_type = random.choice(["morning", "evening"])
+                        shift_type = self.rng.choice(["morning", "evening"])
                         if shift_type == "morning":
                             start, end = "10:00", "17:00"
                             hours = 7
@@ -0,0 +1,243 @@
+"""
+Forkast Demand Anomaly Detection
+Streaming per-restaurant check of daily covers against the forecast
+"""
+import math
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Forecast for a day as (predicted covers, upper bound of the forecast band), or None if unknown
+ExpectedLookup = Callable[[date], Optional[Tuple[float, float]]]
+
+# Longest run of order-less days scored when orders resume; older gaps are skipped
+_MAX_GAP_DAYS = 7
+# Weight of the latest day in each weekday's open rate, and the rate below which an
+# order-less day of that weekday counts as a closing day rather than zero covers
+_OPEN_ALPHA = 0.3
+_OPEN_THRESHOLD = 0.5
+
+
+class _StreamState:
+    __slots__ = (
+        "ordinal", "covers", "expected", "upper", "partial", "spike_alerted",
+        "mean", "var", "days_scored", "open_rate",
+    )
+
+    def __init__(self, ordinal: int, prior_sd: float):
+        self.ordinal = ordinal
+        self.covers = 0
+        self.expected: Optional[float] = None
+        self.upper: Optional[float] = None
+        # The first day seen by this process is missing the orders before it started
+        self.partial = True
+        self.spike_alerted = False
+        self.mean = 0.0
+        self.var = prior_sd ** 2
+        self.days_scored = 0
+        # Per weekday (Monday first), how often recent days of it had orders; 0 until seen open
+        self.open_rate = [0.0] * 7
+
+
+class CoversAnomalyDetector:
+    """
+    Flags days whose covers deviate from the forecast far more than usual.
+
+    Each restaurant keeps today's running covers and an exponentially
+    weighted mean/variance of its daily log residual
+    log((actual + 1) / (forecast + 1)). When an order arrives for a new
+    day, the finished day (and any order-less days in between, which
+    count as zero covers) is scored as a z-score against those statistics,
+    then folded in, clipped to the threshold so one outage doesn't mask the
+    next. Within a day, covers running far past the forecast band flag a
+    likely duplicated feed right away.
+
+    Order-less days only count as zero covers on weekdays the restaurant
+    is usually open: each weekday keeps an exponentially weighted rate of
+    its days having orders, so weekdays never seen open and regular
+    closing days are skipped instead of alerting "drop" every week.
+
+    Work per order is O(1): the forecast is looked up once per restaurant
+    per day, outside the detector's lock, and the day's check runs once
+    when it closes.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        z_threshold: float = 3.0,
+        warmup_days: int = 3,
+        prior_sd: float = 0.2,
+        spike_factor: float = 1.5,
+    ):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup_days = warmup_days
+        self.prior_sd = prior_sd
+        self.spike_factor = spike_factor
+        self._states: Dict[str, _StreamState] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, restaurant_uid: str, day: date, covers: int, lookup: ExpectedLookup
+    ) -> List[Dict[str, Any]]:
+        """
+        Add one order's covers and return any anomalies it reveals
+
+        Args:
+            restaurant_uid: Restaurant the order belongs to
+            day: Business day of the order
+            covers: Covers on the order
+            lookup: Forecast for a day, called outside the detector's lock,
+                about once per restaurant per day
+
+        Returns:
+            Anomaly dicts (kind "spike", "surge" or "drop", with date, actual,
+            expected, z and severity); usually empty
+        """
+        ordinal = day.toordinal()
+        found: Dict[int, Tuple[Optional[float], Optional[float]]] = {}
+        while True:
+            with self._lock:
+                missing = [o for o in self._days_needed(restaurant_uid, ordinal) if o not in found]
+                if not missing:
+                    return self._apply(restaurant_uid, ordinal, covers, found)
+            # Another order may move the state while these run; the loop fetches anything new
+            for o in missing:
+                found[o] = self._lookup(lookup, date.fromordinal(o))
+
+    def state(self, restaurant_uid: str) -> Optional[Dict[str, Any]]:
+        """Current running statistics for a restaurant, for display"""
+        with self._lock:
+            state = self._states.get(restaurant_uid)
+            if state is None:
+                return None
+            return {
+                "date": date.fromordinal(state.ordinal).isoformat(),
+                "covers_today": state.covers,
+                "expected_today": state.expected,
+                "residual_mean": round(state.mean, 4),
+                "residual_sd": round(math.sqrt(state.var), 4),
+                "days_scored": state.days_scored,
+            }
+
+    def reset(self, restaurant_uid: Optional[str] = None):
+        with self._lock:
+            if restaurant_uid is None:
+                self._states.clear()
+            else:
+                self._states.pop(restaurant_uid, None)
+
+    def _days_needed(self, restaurant_uid: str, ordinal: int) -> List[int]:
+        """Days whose forecast an order on ordinal needs: its own, and order-less days it closes"""
+        state = self._states.get(restaurant_uid)
+        if state is None:
+            return [ordinal]
+        if ordinal <= state.ordinal:
+            return []
+        return [o for o in self._gap_days(state, ordinal) if self._usually_open(state, o)] + [ordinal]
+
+    def _apply(
+        self, restaurant_uid: str, ordinal: int, covers: int,
+        found: Dict[int, Tuple[Optional[float], Optional[float]]],
+    ) -> List[Dict[str, Any]]:
+        """observe() with every forecast it needs already in found"""
+        state = self._states.get(restaurant_uid)
+        if state is None:
+            state = self._states[restaurant_uid] = _StreamState(ordinal, self.prior_sd)
+            state.expected, state.upper = found[ordinal]
+        if ordinal < state.ordinal:
+            # Backdated order; the day was already scored
+            return []
+
+        anomalies = []
+        if ordinal > state.ordinal:
+            anomalies.extend(self._close_day(state, ordinal, found))
+            state.expected, state.upper = found[ordinal]
+
+        state.covers += covers
+        if (
+            not state.spike_alerted and state.upper
+            and state.covers > self.spike_factor * state.upper
+        ):
+            state.spike_alerted = True
+            anomalies.append(self._anomaly("spike", state.ordinal, state.covers, state.expected, None))
+        return anomalies
+
+    def _close_day(
+        self, state: _StreamState, new_ordinal: int,
+        found: Dict[int, Tuple[Optional[float], Optional[float]]],
+    ) -> List[Dict[str, Any]]:
+        """Score the finished day and the order-less days before new_ordinal, then move to it"""
+        anomalies = []
+        if not state.partial:
+            anomalies.extend(self._score(state, state.ordinal, state.covers, state.expected))
+        # Same open rates _days_needed saw: the closing day is folded in after its gap
+        for ordinal in self._gap_days(state, new_ordinal):
+            if self._usually_open(state, ordinal):
+                expected, _ = found[ordinal]
+                anomalies.extend(self._score(state, ordinal, 0, expected))
+        for ordinal in self._gap_days(state, new_ordinal):
+            self._fold_open(state, ordinal, False)
+        self._fold_open(state, state.ordinal, True)
+
+        state.ordinal = new_ordinal
+        state.covers = 0
+        state.partial = False
+        state.spike_alerted = False
+        return anomalies
+
+    @staticmethod
+    def _gap_days(state: _StreamState, new_ordinal: int) -> range:
+        """Order-less days between the current day and new_ordinal, at most _MAX_GAP_DAYS"""
+        return range(max(state.ordinal + 1, new_ordinal - _MAX_GAP_DAYS), new_ordinal)
+
+    @staticmethod
+    def _usually_open(state: _StreamState, ordinal: int) -> bool:
+        return state.open_rate[date.fromordinal(ordinal).weekday()] >= _OPEN_THRESHOLD
+
+    @staticmethod
+    def _fold_open(state: _StreamState, ordinal: int, had_orders: bool):
+        weekday = date.fromordinal(ordinal).weekday()
+        state.open_rate[weekday] += _OPEN_ALPHA * (float(had_orders) - state.open_rate[weekday])
+
+    def _score(self, state: _StreamState, ordinal: int, actual: int, expected: Optional[float]) -> List[Dict[str, Any]]:
+        """z-score one day's residual, then fold it into the EWMA statistics"""
+        if expected is None:
+            return []
+        residual = math.log((actual + 1) / (expected + 1))
+        sd = math.sqrt(state.var)
+        z = (residual - state.mean) / sd if sd > 0 else 0.0
+
+        anomalies = []
+        if state.days_scored >= self.warmup_days and abs(z) >= self.z_threshold:
+            anomalies.append(self._anomaly("surge" if z > 0 else "drop", ordinal, actual, expected, z))
+            limit = self.z_threshold * sd
+            residual = min(max(residual, state.mean - limit), state.mean + limit)
+
+        diff = residual - state.mean
+        state.mean += self.alpha * diff
+        state.var = (1 - self.alpha) * (state.var + self.alpha * diff * diff)
+        state.days_scored += 1
+        return anomalies
+
+    def _anomaly(
+        self, kind: str, ordinal: int, actual: int, expected: Optional[float], z: Optional[float]
+    ) -> Dict[str, Any]:
+        if z is None or abs(z) >= 1.5 * self.z_threshold:
+            severity = "critical"
+        else:
+            severity = "high"
+        return {
+            "kind": kind,
+            "date": date.fromordinal(ordinal),
+            "actual": actual,
+            "expected": expected,
+            "z": None if z is None else round(z, 2),
+            "severity": severity,
+        }
+
+    @staticmethod
+    def _lookup(lookup: ExpectedLookup, day: date) -> Tuple[Optional[float], Optional[float]]:
+        found = lookup(day)
+        return found if found is not None else (None, None)
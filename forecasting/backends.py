@@ -0,0 +1,342 @@
+"""
+Forkast Forecast Backends
+Alternative daily-covers models the engine can select per restaurant by backtest
+"""
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# date.toordinal() of 1970-01-01, the datetime64 epoch
+_EPOCH_ORDINAL = 719163
+
+# Additive parts of a covers forecast, as returned by CoversModel.components
+COMPONENTS = ("trend", "day_of_week", "month", "event")
+
+
+class CoversModel:
+    """
+    Interface for a daily covers model.
+
+    The engine's own multiplicative seasonal x trend model is built in; a
+    backend is an alternative for the covers point forecast, while
+    quantiles, channels and items are still derived around whichever model
+    wins. Inputs are day ordinals, covers and event codes (EventCalendar)
+    for the closed days of the history, in chronological order.
+
+    fold_predict must score every rolling-origin fold without refitting
+    per cutoff, so model selection costs about as much as one fit.
+    """
+
+    name = ""
+
+    def fit(self, ordinals: np.ndarray, covers: np.ndarray, codes: np.ndarray):
+        raise NotImplementedError
+
+    def update(self, ordinal: int, covers: float, code: int):
+        """Fold one new closed day into the fitted model"""
+        raise NotImplementedError
+
+    def predict(self, ordinals: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Unrounded covers for each target day"""
+        raise NotImplementedError
+
+    def components(self, ordinals: np.ndarray, codes: np.ndarray) -> Dict[str, np.ndarray]:
+        """COMPONENTS -> covers contribution per target day; they sum to predict() before clipping at 0"""
+        raise NotImplementedError
+
+    def fold_predict(
+        self,
+        ordinals: np.ndarray,
+        covers: np.ndarray,
+        codes: np.ndarray,
+        cutoffs: np.ndarray,
+        fold: np.ndarray,
+        target: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Out-of-sample predictions for (fold, target) pairs
+
+        Fold f trains on rows [0, cutoffs[f]) and predicts row target[i] for
+        each pair i with fold[i] == f (see backtesting.fold_predictions).
+        """
+        raise NotImplementedError
+
+    def get_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """(meta, arrays) for forecasting.model_io"""
+        raise NotImplementedError
+
+    @classmethod
+    def from_state(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> "CoversModel":
+        raise NotImplementedError
+
+
+class HoltWintersModel(CoversModel):
+    """
+    Additive Holt-Winters with damped trend and a weekly season.
+
+    Smoothing parameters are picked from a grid by in-sample one-step
+    error; the recursion runs once for every grid point at the same time
+    (state arrays have a leading grid axis). Gaps between history days
+    advance the damped trend without an update, and event days are
+    skipped so holidays don't distort the level.
+    """
+
+    name = "holt_winters"
+
+    DAMPING = 0.98
+    WARMUP_DAYS = 14
+    # alpha (level) x beta (trend) x gamma (season)
+    _GRID = np.array(np.meshgrid(
+        [0.05, 0.1, 0.2, 0.3, 0.5], [0.01, 0.05], [0.05, 0.1, 0.2, 0.3], indexing="ij"
+    )).reshape(3, -1)
+
+    def __init__(self):
+        self.alpha = self.beta = self.gamma = 0.0
+        self.level = 0.0
+        self.trend = 0.0
+        self.season = np.zeros(7)
+        self.last_ordinal = 0
+
+    def fit(self, ordinals: np.ndarray, covers: np.ndarray, codes: np.ndarray):
+        states = self._run(ordinals, covers, codes)
+        best = int(np.argmin(states["sse"][-1]))
+        self.alpha, self.beta, self.gamma = (float(p) for p in self._GRID[:, best])
+        self.level = float(states["level"][-1, best])
+        self.trend = float(states["trend"][-1, best])
+        self.season = states["season"][-1, best].copy()
+        self.last_ordinal = int(states["last_ordinal"][-1])
+
+    def update(self, ordinal: int, covers: float, code: int):
+        if code:
+            return
+        gap = ordinal - self.last_ordinal
+        level, trend = self._advance(self.level, self.trend, gap)
+        dow = (ordinal - 1) % 7
+        new_level = self.alpha * (covers - self.season[dow]) + (1 - self.alpha) * level
+        self.trend = self.beta * (new_level - self.level) + (1 - self.beta) * trend
+        self.season[dow] = self.gamma * (covers - new_level) + (1 - self.gamma) * self.season[dow]
+        self.level = new_level
+        self.last_ordinal = ordinal
+
+    def predict(self, ordinals: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        steps = ordinals - self.last_ordinal
+        return np.maximum(
+            0, self.level + self.trend * self._damped_sum(steps) + self.season[(ordinals - 1) % 7]
+        )
+
+    def components(self, ordinals: np.ndarray, codes: np.ndarray) -> Dict[str, np.ndarray]:
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        zeros = np.zeros(len(ordinals))
+        return {
+            "trend": self.level + self.trend * self._damped_sum(ordinals - self.last_ordinal),
+            "day_of_week": self.season[(ordinals - 1) % 7],
+            "month": zeros,
+            "event": zeros,
+        }
+
+    def fold_predict(self, ordinals, covers, codes, cutoffs, fold, target) -> np.ndarray:
+        # State after the last training row of each fold, with that fold's best parameters
+        states = self._run(ordinals, covers, codes)
+        last_row = cutoffs - 1
+        best = np.argmin(states["sse"][last_row], axis=1)
+        level = states["level"][last_row, best]
+        trend = states["trend"][last_row, best]
+        season = states["season"][last_row, best]
+        origin = states["last_ordinal"][last_row]
+
+        target_ordinals = ordinals[target].astype(np.int64)
+        steps = target_ordinals - origin[fold]
+        predicted = (
+            level[fold] + trend[fold] * self._damped_sum(steps)
+            + season[fold, (target_ordinals - 1) % 7]
+        )
+        return np.maximum(0, predicted)
+
+    def get_state(self):
+        meta = {
+            "alpha": self.alpha, "beta": self.beta, "gamma": self.gamma,
+            "level": self.level, "trend": self.trend, "last_ordinal": self.last_ordinal,
+        }
+        return meta, {"season": self.season}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        model = cls()
+        for key, value in meta.items():
+            setattr(model, key, value)
+        model.season = arrays["season"]
+        return model
+
+    @classmethod
+    def _damped_sum(cls, steps: np.ndarray) -> np.ndarray:
+        """phi + phi^2 + ... + phi^steps"""
+        phi = cls.DAMPING
+        return phi * (1 - phi ** np.asarray(steps, dtype=np.float64)) / (1 - phi)
+
+    @classmethod
+    def _advance(cls, level, trend, gap):
+        return level + trend * cls._damped_sum(gap), trend * cls.DAMPING ** gap
+
+    def _run(self, ordinals: np.ndarray, covers: np.ndarray, codes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Run the recursion over the history for every grid point at once
+
+        Returns per-row states after absorbing each row: level, trend (rows x G),
+        season (rows x G x 7), cumulative one-step squared error sse (rows x G)
+        and last_ordinal, the last day absorbed (rows,)
+        """
+        alpha, beta, gamma = self._GRID
+        n, g = len(ordinals), self._GRID.shape[1]
+        ordinals = ordinals.astype(np.int64)
+        covers = covers.astype(np.float64)
+        ordinary = codes == 0
+        dows = (ordinals - 1) % 7
+
+        # Start from the first week: level = its mean, season = DOW deviations
+        first = np.nonzero(ordinary)[0][:7]
+        start_level = covers[first].mean() if len(first) else 0.0
+        level = np.full(g, start_level)
+        trend = np.zeros(g)
+        season = np.zeros((g, 7))
+        season[:, dows[first]] = covers[first] - start_level
+        last = int(ordinals[first[0]]) - 1 if len(first) else int(ordinals[0]) - 1
+
+        # Only ordinary days update the state; precompute each one's gap since the previous
+        rows = np.nonzero(ordinary)[0]
+        gaps = np.diff(ordinals[rows], prepend=last)
+        gap_sums = self._damped_sum(gaps)
+        gap_decay = self.DAMPING ** gaps.astype(np.float64)
+
+        # State after absorbing 0, 1, ..., len(rows) days
+        m = len(rows)
+        levels, trends = np.empty((m + 1, g)), np.empty((m + 1, g))
+        seasons, sses = np.empty((m + 1, g, 7)), np.zeros((m + 1, g))
+        levels[0], trends[0], seasons[0] = level, trend, season
+        sse = np.zeros(g)
+        for k, i in enumerate(rows):
+            dow, y = dows[i], covers[i]
+            prior_level = level + trend * gap_sums[k]
+            if k >= self.WARMUP_DAYS:
+                error = y - (prior_level + season[:, dow])
+                sse = sse + error * error
+            new_level = alpha * (y - season[:, dow]) + (1 - alpha) * prior_level
+            trend = beta * (new_level - level) + (1 - beta) * trend * gap_decay[k]
+            season[:, dow] = gamma * (y - new_level) + (1 - gamma) * season[:, dow]
+            level = new_level
+            levels[k + 1], trends[k + 1], seasons[k + 1], sses[k + 1] = level, trend, season, sse
+
+        # Each history row sees the state after the ordinary days up to and including it
+        absorbed = np.cumsum(ordinary)
+        last_ordinals = np.concatenate([[last], ordinals[rows]])
+        return {
+            "level": levels[absorbed], "trend": trends[absorbed], "season": seasons[absorbed],
+            "sse": sses[absorbed], "last_ordinal": last_ordinals[absorbed],
+        }
+
+
+class RidgeCalendarModel(CoversModel):
+    """
+    Ridge regression of covers on calendar features.
+
+    Features are an intercept, a linear trend in years, and one-hot day of
+    week, month and calendar event (for the events seen in the history;
+    others count as ordinary days). Fitting only needs X'X and X'y, so
+    update() adds one day's outer product, and every backtest fold's
+    coefficients come from prefix sums of the per-day outer products with
+    one batched solve.
+    """
+
+    name = "ridge"
+
+    ALPHA = 1.0
+
+    def __init__(self):
+        self.origin_ordinal = 0
+        self.event_codes = np.zeros(0, dtype=np.int64)
+        self.xtx = np.zeros((0, 0))
+        self.xty = np.zeros(0)
+        self.coef = np.zeros(0)
+
+    def fit(self, ordinals: np.ndarray, covers: np.ndarray, codes: np.ndarray):
+        self.origin_ordinal = int(ordinals[0])
+        self.event_codes = np.unique(codes[codes > 0])
+        features = self._features(ordinals, codes)
+        self.xtx = features.T @ features
+        self.xty = features.T @ covers.astype(np.float64)
+        self.coef = self._solve(self.xtx, self.xty)
+
+    def update(self, ordinal: int, covers: float, code: int):
+        features = self._features(np.array([ordinal]), np.array([code]))[0]
+        self.xtx = self.xtx + np.outer(features, features)
+        self.xty = self.xty + features * covers
+        self.coef = self._solve(self.xtx, self.xty)
+
+    def predict(self, ordinals: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        return np.maximum(0, self._features(np.asarray(ordinals), np.asarray(codes)) @ self.coef)
+
+    def components(self, ordinals: np.ndarray, codes: np.ndarray) -> Dict[str, np.ndarray]:
+        contributions = self._features(np.asarray(ordinals), np.asarray(codes)) * self.coef
+        return {
+            "trend": contributions[:, :2].sum(axis=1),
+            "day_of_week": contributions[:, 2:9].sum(axis=1),
+            "month": contributions[:, 9:21].sum(axis=1),
+            "event": contributions[:, 21:].sum(axis=1),
+        }
+
+    def fold_predict(self, ordinals, covers, codes, cutoffs, fold, target) -> np.ndarray:
+        self.origin_ordinal = int(ordinals[0])
+        # Events first seen after a cutoff have all-zero columns before it, so ridge gives them 0
+        self.event_codes = np.unique(codes[codes > 0])
+        features = self._features(ordinals, codes)
+        p = features.shape[1]
+
+        # Prefix sums of x x' and x y: fold f's normal equations are row cutoffs[f]
+        xtx = np.zeros((len(ordinals) + 1, p, p))
+        np.cumsum(features[:, :, None] * features[:, None, :], axis=0, out=xtx[1:])
+        xty = np.zeros((len(ordinals) + 1, p))
+        np.cumsum(features * covers[:, None].astype(np.float64), axis=0, out=xty[1:])
+        coef = self._solve(xtx[cutoffs], xty[cutoffs])
+
+        predicted = np.einsum("ij,ij->i", features[target], coef[fold])
+        return np.maximum(0, predicted)
+
+    def get_state(self):
+        meta = {"origin_ordinal": self.origin_ordinal}
+        return meta, {"event_codes": self.event_codes, "xtx": self.xtx, "xty": self.xty, "coef": self.coef}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        model = cls()
+        model.origin_ordinal = meta["origin_ordinal"]
+        model.event_codes = arrays["event_codes"]
+        model.xtx, model.xty, model.coef = arrays["xtx"], arrays["xty"], arrays["coef"]
+        return model
+
+    def _features(self, ordinals: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """(days x p): intercept, years since origin, DOW, month and event one-hots"""
+        ordinals = ordinals.astype(np.int64)
+        n = len(ordinals)
+        days = (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+        month = days.astype("datetime64[M]").astype(np.int64) % 12
+        event_column = np.searchsorted(self.event_codes, codes)
+        has_event = (codes > 0) & (event_column < len(self.event_codes))
+        has_event[has_event] = self.event_codes[event_column[has_event]] == codes[has_event]
+
+        features = np.zeros((n, 2 + 7 + 12 + len(self.event_codes)))
+        rows = np.arange(n)
+        features[:, 0] = 1.0
+        features[:, 1] = (ordinals - self.origin_ordinal) / 365.0
+        features[rows, 2 + (ordinals - 1) % 7] = 1.0
+        features[rows, 9 + month] = 1.0
+        features[rows[has_event], 21 + event_column[has_event]] = 1.0
+        return features
+
+    def _solve(self, xtx: np.ndarray, xty: np.ndarray) -> np.ndarray:
+        """Ridge coefficients for one (p x p) system or a stack of them; intercept unpenalized"""
+        penalty = np.full(xtx.shape[-1], self.ALPHA)
+        penalty[0] = 0.0
+        return np.linalg.solve(xtx + np.diag(penalty), xty[..., None])[..., 0]
+
+
+BACKENDS = (HoltWintersModel, RidgeCalendarModel)
@@ -0,0 +1,105 @@
+"""
+Forkast Batch Forecasting
+Fans per-restaurant training and forecasting out across worker processes
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from forecasting.demand_engine import DemandForecastEngine
+from forecasting.model_registry import MODEL_FILE_SUFFIX
+
+
+def forecast_restaurant(
+    restaurant_uid: str,
+    history: List[Dict[str, Any]],
+    days_ahead: int = 14,
+    country: Optional[str] = None,
+    model_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Train an engine on one restaurant's history and forecast it.
+
+    Runs inside a worker process, so it takes and returns plain picklable data.
+    With a model_dir, the trained engine is also saved there as
+    <restaurant_uid>.fkm for ForecastModelRegistry to load.
+    """
+    started = time.perf_counter()
+    engine = DemandForecastEngine(country=country)
+    engine.train(history)
+    trained = time.perf_counter()
+    forecasts = engine.forecast(days_ahead=days_ahead)
+    finished = time.perf_counter()
+    if model_dir is not None:
+        Path(model_dir).mkdir(parents=True, exist_ok=True)
+        engine.save(Path(model_dir) / f"{restaurant_uid}{MODEL_FILE_SUFFIX}")
+
+    return {
+        "restaurant_uid": restaurant_uid,
+        "forecasts": forecasts,
+        "accuracy": engine.accuracy_metrics,
+        "train_ms": round((trained - started) * 1000, 1),
+        "forecast_ms": round((finished - trained) * 1000, 1),
+    }
+
+
+def run_batch(
+    jobs: Iterable[Tuple[str, List[Dict[str, Any]], Optional[str]]],
+    days_ahead: int = 14,
+    max_workers: Optional[int] = None,
+    model_dir: Optional[Path] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Forecast many restaurants in parallel, yielding results as they finish
+
+    Args:
+        jobs: (restaurant_uid, daily history, country) tuples, pulled lazily so
+            at most 2 x max_workers histories are loaded or in flight at once
+        days_ahead: Forecast horizon per restaurant
+        max_workers: Worker processes (defaults to the CPU count)
+        model_dir: Optional directory the workers save trained models to
+
+    Yields:
+        The forecast_restaurant result with status "ok", or a
+        {"restaurant_uid", "status": "failed", "error"} dict
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = 2 * max_workers
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        exhausted = False
+        while futures or not exhausted:
+            while not exhausted and len(futures) < max_in_flight:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                restaurant_uid, history, country = job
+                future = pool.submit(
+                    forecast_restaurant, restaurant_uid, history, days_ahead, country, model_dir
+                )
+                futures[future] = (restaurant_uid, time.perf_counter())
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                restaurant_uid, submitted = futures.pop(future)
+                try:
+                    result = future.result()
+                    result["status"] = "ok"
+                except Exception as e:
+                    result = {
+                        "restaurant_uid": restaurant_uid,
+                        "status": "failed",
+                        "error": f"{type(e).__name__}: {e}",
+                    }
+                result["wall_ms"] = round((time.perf_counter() - submitted) * 1000, 1)
+                yield result
@@ -2,18 +2,52 @@
 Forkast Demand Forecasting Engine
 Prediction-first AI for restaurant demand forecasting
 """
+import dataclasses
 import math
 import random
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Type
 import sys
 from pathlib import Path
 
+import numpy as np
+
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from models.core import DemandForecast
+from forecasting.backends import BACKENDS, CoversModel
+from forecasting.backtesting import SEASONAL_TREND, backend_fold_predictions, fold_predictions, model_scores
+from forecasting.events import load_event_calendar, shrink_uplift
+from forecasting.history import DailyHistory
+from forecasting.intervals import (
+    HORIZON_EDGES, QUANTILE_HORIZON, QUANTILE_LEVELS, QUANTILE_MIN_TRAIN_DAYS,
+    fit_quantile_tables, ratio_quantiles,
+)
+from forecasting.item_forecast import ItemForecastGrid
+from forecasting.model_io import read_model_file, write_model_file
+from forecasting.reconciliation import reconcile, round_preserving_sum
+
+
+CHANNELS = ("dine_in", "delivery", "takeaway")
+# Channel split for weekdays without channel history: Fri/Sat lean delivery, Thu in between
+_DEFAULT_CHANNEL_SHARES = np.array(
+    [[0.52, 0.28, 0.20]] * 3 + [[0.50, 0.30, 0.20]] + [[0.42, 0.38, 0.20]] * 2 + [[0.52, 0.28, 0.20]]
+)
+
+# Model file contents: the running sums and residual tables; everything else is re-derived on load
+_SAVED_SCALARS = (
+    "_n", "_sum_covers", "_sum_revenue", "_sum_check", "_sum_item_units",
+    "_sum_x", "_sum_xx", "_sum_xy", "_channel_n", "_channel_sum_x", "_channel_sum_xx",
+)
+_SAVED_ARRAYS = (
+    "_day_sums", "_day_counts", "_month_sums", "_month_counts",
+    "_item_sums", "_item_sqsums", "_item_counts",
+    "_channel_dow_sums", "_channel_sum_share", "_channel_sum_xshare",
+    "residual_quantiles", "pooled_quantiles",
+)
+# Per-event running sums; files written before they existed get them rebuilt from the history
+_EVENT_ARRAYS = ("_event_counts", "_event_x_sums", "_event_actual")
 
 
 class DemandForecastEngine:
@@ -22,8 +56,15 @@ class DemandForecastEngine:
     Uses statistical decomposition + ML patterns for accurate predictions.
     """
 
-    def __init__(self):
-        self.historical_data: List[Dict[str, Any]] = []
+    def __init__(self, country: Optional[str] = None, backends: Sequence[Type[CoversModel]] = BACKENDS):
+        self.country = country
+        # Alternative covers models; train() keeps whichever backtests best, built-in model included
+        self.backends = tuple(backends)
+        self.model_name = SEASONAL_TREND
+        self.model: Optional[CoversModel] = None
+        self.model_scores: Dict[str, float] = {}
+        self.calendar = load_event_calendar(country)
+        self.history = DailyHistory()
         self.day_patterns: Dict[int, float] = {}
         self.month_patterns: Dict[int, float] = {}
         self.trend_slope: float = 0.0
@@ -33,6 +74,54 @@ class DemandForecastEngine:
         self.is_trained: bool = False
         self.accuracy_metrics: Dict[str, float] = {}
         self.item_patterns: Dict[str, Dict[int, float]] = {}
+        self.event_factors: Dict[str, float] = {}
+        self.channel_shares: Dict[int, Dict[str, float]] = {}
+        self.channel_trends: Dict[str, float] = {}
+        self._channel_table = _DEFAULT_CHANNEL_SHARES.copy()
+        self._channel_slope = np.zeros(len(CHANNELS))
+        self._channel_x_mean = 0.0
+        self._event_factor = np.ones(self.calendar.n_events)
+        self.origin_ordinal: int = 0
+        self.last_ordinal: int = 0
+
+        # Relative forecast errors (actual / predicted - 1) at QUANTILE_LEVELS, per
+        # (DOW, horizon bucket) and pooled per horizon bucket; NaN = too few samples
+        self.residual_quantiles = np.full((7, len(HORIZON_EDGES), len(QUANTILE_LEVELS)), np.nan)
+        self.pooled_quantiles = np.full((len(HORIZON_EDGES), len(QUANTILE_LEVELS)), np.nan)
+        self.residual_samples = 0
+
+        # Running sums behind the patterns above; train() sets them, update() extends them
+        self._n = 0
+        self._sum_covers = 0.0
+        self._sum_revenue = 0.0
+        self._sum_check = 0.0
+        self._sum_item_units = 0.0
+        self._day_sums = np.zeros(7)
+        self._day_counts = np.zeros(7)
+        self._month_sums = np.zeros(13)
+        self._month_counts = np.zeros(13)
+        self._sum_x = 0.0
+        self._sum_xx = 0.0
+        self._sum_xy = 0.0
+        self._item_sums = np.zeros((0, 7))
+        self._item_sqsums = np.zeros((0, 7))
+        self._item_counts = np.zeros((0, 7))
+        # Channel covers per DOW, and share-vs-day regression sums over days with channel data
+        self._channel_dow_sums = np.zeros((7, len(CHANNELS)))
+        self._channel_n = 0
+        self._channel_sum_x = 0.0
+        self._channel_sum_xx = 0.0
+        self._channel_sum_share = np.zeros(len(CHANNELS))
+        self._channel_sum_xshare = np.zeros(len(CHANNELS))
+        # Event days per (event code, DOW, month), their summed x and summed covers per code
+        self._event_counts = np.zeros((self.calendar.n_events, 7, 13))
+        self._event_x_sums = np.zeros((self.calendar.n_events, 7, 13))
+        self._event_actual = np.zeros(self.calendar.n_events)
+
+    @property
+    def historical_data(self) -> DailyHistory:
+        """Training days as a read-only sequence of daily summary dicts"""
+        return self.history
 
     def train(self, historical_orders: List[Dict[str, Any]]):
         """
@@ -44,77 +133,330 @@ class DemandForecastEngine:
         if not historical_orders:
             raise ValueError("No historical data for training")
 
-        self.historical_data = historical_orders
-        n = len(historical_orders)
-
-        # Calculate base metrics
-        covers = [d['total_covers'] for d in historical_orders]
-        revenues = [d['total_revenue'] for d in historical_orders]
-        checks = [d['avg_check'] for d in historical_orders]
-
-        self.base_covers = sum(covers) / n
-        self.base_revenue = sum(revenues) / n
-        self.avg_check = sum(checks) / n
-
-        # Day-of-week patterns
-        day_sums = defaultdict(list)
-        for d in historical_orders:
-            dow = datetime.fromisoformat(d['date']).weekday()
-            day_sums[dow].append(d['total_covers'])
-
-        for dow, values in day_sums.items():
-            self.day_patterns[dow] = (sum(values) / len(values)) / self.base_covers
-
-        # Monthly patterns
-        month_sums = defaultdict(list)
-        for d in historical_orders:
-            month = datetime.fromisoformat(d['date']).month
-            month_sums[month].append(d['total_covers'])
-
-        for month, values in month_sums.items():
-            self.month_patterns[month] = (sum(values) / len(values)) / self.base_covers
-
-        # Trend (linear regression on covers)
-        x_mean = (n - 1) / 2
-        y_mean = self.base_covers
-        num = sum((i - x_mean) * (covers[i] - y_mean) for i in range(n))
-        den = sum((i - x_mean) ** 2 for i in range(n))
-        self.trend_slope = num / den if den != 0 else 0
-
-        # Item-level patterns
-        for d in historical_orders:
-            dow = datetime.fromisoformat(d['date']).weekday()
-            item_orders = d.get('item_orders', {})
-            for item_name, qty in item_orders.items():
-                if item_name not in self.item_patterns:
-                    self.item_patterns[item_name] = defaultdict(list)
-                self.item_patterns[item_name][dow].append(qty)
-
-        # Compute item averages
-        for item_name in self.item_patterns:
-            for dow in self.item_patterns[item_name]:
-                values = self.item_patterns[item_name][dow]
-                self.item_patterns[item_name][dow] = sum(values) / len(values)
+        self.history = DailyHistory.from_records(historical_orders)
+        self._fit(self.history)
+        folds = self._rolling_folds()
+        self._fit_quantiles(folds, self._select_model(folds))
 
         # Calculate accuracy (on last 20% of data as holdout)
         self._calculate_accuracy()
 
         self.is_trained = True
 
+    def update(self, day_summary: Dict[str, Any]):
+        """
+        Fold one closed day into the trained model without rescanning history
+
+        Updates the running sums for day/month/item patterns and the trend
+        regression, then re-derives the factors from them; a selected
+        backend model is updated too. Days must be folded in chronological
+        order, each one once. Accuracy metrics, residual quantiles and the
+        model choice keep the values from the last full train().
+
+        Args:
+            day_summary: Daily order summary in the same format train() takes
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        day = datetime.fromisoformat(day_summary['date'])
+        ordinal = day.toordinal()
+        if ordinal <= self.last_ordinal:
+            raise ValueError(f"{day_summary['date']} is not after the last trained day")
+
+        covers = day_summary['total_covers']
+        dow = day.weekday()
+        x = ordinal - self.origin_ordinal
+
+        self._n += 1
+        self._sum_covers += covers
+        self._sum_revenue += day_summary['total_revenue']
+        self._sum_check += day_summary['avg_check']
+        self._sum_item_units += sum(day_summary.get('item_orders', {}).values())
+        self._day_sums[dow] += covers
+        self._day_counts[dow] += 1
+        code = self.calendar.code_for(ordinal)
+        if code:
+            self._event_counts[code, dow, day.month] += 1
+            self._event_x_sums[code, dow, day.month] += x
+            self._event_actual[code] += covers
+        else:
+            self._month_sums[day.month] += covers
+            self._month_counts[day.month] += 1
+        self._sum_x += x
+        self._sum_xx += x * x
+        self._sum_xy += x * covers
+        self.last_ordinal = ordinal
+        if self.model is not None:
+            self.model.update(ordinal, covers, code)
+
+        channel_covers = np.array([day_summary.get(c, 0) for c in CHANNELS], dtype=np.float64)
+        self._channel_dow_sums[dow] += channel_covers
+        if channel_covers.sum() > 0:
+            share = channel_covers / channel_covers.sum()
+            self._channel_n += 1
+            self._channel_sum_x += x
+            self._channel_sum_xx += x * x
+            self._channel_sum_share += share
+            self._channel_sum_xshare += x * share
+
+        self.history.append(day_summary)
+        new_items = len(self.history.item_names) - len(self._item_sums)
+        if new_items:
+            self._item_sums = np.vstack([self._item_sums, np.zeros((new_items, 7))])
+            self._item_sqsums = np.vstack([self._item_sqsums, np.zeros((new_items, 7))])
+            self._item_counts = np.vstack([self._item_counts, np.zeros((new_items, 7))])
+
+        for item_name, qty in day_summary.get('item_orders', {}).items():
+            col = self.history.item_index[item_name]
+            self._item_sums[col, dow] += qty
+            self._item_sqsums[col, dow] += qty * qty
+            self._item_counts[col, dow] += 1
+            self.item_patterns.setdefault(item_name, {})[dow] = float(
+                self._item_sums[col, dow] / self._item_counts[col, dow]
+            )
+
+        self._derive_patterns()
+
+    def _fit(self, history: DailyHistory):
+        """Compute the running sums with vectorized group-bys, then derive patterns"""
+        n = len(history)
+        covers = history.covers
+        self.origin_ordinal = int(history.ordinals[0])
+        self.last_ordinal = int(history.ordinals.max())
+
+        self._n = n
+        self._sum_covers = float(covers.sum())
+        self._sum_revenue = float(history.revenue.sum())
+        self._sum_check = float(history.avg_check.sum())
+        self._sum_item_units = float(np.nansum(history.item_qty))
+        self._day_sums = np.bincount(history.dow, weights=covers, minlength=7)
+        self._day_counts = np.bincount(history.dow, minlength=7).astype(np.float64)
+        # Month factors from ordinary days only; event days get their own uplift
+        codes = self.calendar.codes_for(history.ordinals)
+        ordinary = codes == 0
+        self._month_sums = np.bincount(history.month, weights=covers * ordinary, minlength=13)
+        self._month_counts = np.bincount(history.month, weights=ordinary, minlength=13)
+
+        # Trend regression on x = days since the first history day
+        x = (history.ordinals - self.origin_ordinal).astype(np.float64)
+        self._fit_event_sums(codes, x, history)
+        self._sum_x = float(x.sum())
+        self._sum_xx = float(np.dot(x, x))
+        self._sum_xy = float(np.dot(x, covers))
+
+        dow_onehot = np.zeros((n, 7))
+        dow_onehot[np.arange(n), history.dow] = 1.0
+
+        # Channel mix: covers per DOW and daily shares for the share trend
+        channel_covers = np.column_stack([history.column(c, default=0) for c in CHANNELS]).astype(np.float64)
+        channel_totals = channel_covers.sum(axis=1)
+        has_channels = channel_totals > 0
+        shares = channel_covers[has_channels] / channel_totals[has_channels, None]
+        x_channels = x[has_channels]
+        self._channel_dow_sums = dow_onehot.T @ channel_covers
+        self._channel_n = int(has_channels.sum())
+        self._channel_sum_x = float(x_channels.sum())
+        self._channel_sum_xx = float(np.dot(x_channels, x_channels))
+        self._channel_sum_share = shares.sum(axis=0)
+        self._channel_sum_xshare = x_channels @ shares
+
+        # Item-level running sums per DOW
+        item_qty = np.nan_to_num(history.item_qty).astype(np.float64)
+        self._item_sums = item_qty.T @ dow_onehot
+        self._item_sqsums = (item_qty * item_qty).T @ dow_onehot
+        self._item_counts = history.item_mask.T.astype(np.float64) @ dow_onehot
+        self._derive_item_patterns()
+
+        self._derive_patterns()
+
+    def _fit_event_sums(self, codes: np.ndarray, x: np.ndarray, history: DailyHistory):
+        """Event-day running sums: day counts and summed x per (code, DOW, month), covers per code"""
+        shape = (self.calendar.n_events, 7, 13)
+        self._event_counts = np.zeros(shape)
+        self._event_x_sums = np.zeros(shape)
+        self._event_actual = np.zeros(self.calendar.n_events)
+        event_days = np.nonzero(codes)[0]
+        cell = (codes[event_days], history.dow[event_days], history.month[event_days])
+        np.add.at(self._event_counts, cell, 1.0)
+        np.add.at(self._event_x_sums, cell, x[event_days])
+        np.add.at(self._event_actual, codes[event_days], history.covers[event_days])
+
+    def _derive_item_patterns(self):
+        """Per-item, per-DOW mean quantity over the days each item was sold"""
+        self.item_patterns = {}
+        for col, item_name in enumerate(self.history.item_names):
+            sold = np.nonzero(self._item_counts[col])[0]
+            self.item_patterns[item_name] = {
+                int(dow): float(self._item_sums[col, dow] / self._item_counts[col, dow])
+                for dow in sold
+            }
+
+    def _derive_patterns(self):
+        """Base metrics, DOW/month factors and trend slope from the running sums"""
+        n = self._n
+        self.base_covers = self._sum_covers / n
+        self.base_revenue = self._sum_revenue / n
+        self.avg_check = self._sum_check / n
+
+        self.day_patterns = {
+            int(dow): float(self._day_sums[dow] / self._day_counts[dow]) / self.base_covers
+            for dow in np.nonzero(self._day_counts)[0]
+        }
+        self.month_patterns = {
+            int(month): float(self._month_sums[month] / self._month_counts[month]) / self.base_covers
+            for month in np.nonzero(self._month_counts)[0]
+        }
+
+        # Least-squares slope from the accumulated sums
+        den = n * self._sum_xx - self._sum_x ** 2
+        num = n * self._sum_xy - self._sum_x * self._sum_covers
+        self.trend_slope = num / den if den != 0 else 0
+
+        self._derive_channel_shares()
+        self._derive_event_factors()
+
+    def _derive_channel_shares(self):
+        """Per-DOW channel shares and their per-day drift from the running sums"""
+        dow_totals = self._channel_dow_sums.sum(axis=1)
+        learned = dow_totals > 0
+        self._channel_table = _DEFAULT_CHANNEL_SHARES.copy()
+        self._channel_table[learned] = self._channel_dow_sums[learned] / dow_totals[learned, None]
+        self.channel_shares = {
+            int(dow): dict(zip(CHANNELS, self._channel_table[dow].tolist()))
+            for dow in np.nonzero(learned)[0]
+        }
+
+        n = self._channel_n
+        den = n * self._channel_sum_xx - self._channel_sum_x ** 2
+        if n > 1 and den != 0:
+            self._channel_slope = (n * self._channel_sum_xshare - self._channel_sum_x * self._channel_sum_share) / den
+            self._channel_x_mean = self._channel_sum_x / n
+        else:
+            self._channel_slope = np.zeros(len(CHANNELS))
+            self._channel_x_mean = 0.0
+        self.channel_trends = dict(zip(CHANNELS, self._channel_slope.tolist()))
+
+    def _channel_split_shares(self, dow: int, x: float) -> Dict[str, float]:
+        """Channel shares for one date: the DOW table entry moved along the share trend"""
+        shares = np.maximum(self._channel_table[dow] + self._channel_slope * (x - self._channel_x_mean), 0)
+        total = shares.sum()
+        if total <= 0:
+            shares, total = self._channel_table[dow], 1.0
+        return dict(zip(CHANNELS, (shares / total).tolist()))
+
+    def _derive_event_factors(self):
+        """
+        Uplift per calendar event: actual covers on its days vs the baseline model
+
+        The baseline on a day is (base + slope x) * DOW factor * month factor,
+        so its sum over an event's days only needs the day counts and summed
+        x per (DOW, month) cell -- no pass over the history.
+        """
+        seen = self._event_counts.sum(axis=(1, 2))
+        day_factor = np.array([self.day_patterns.get(d, 1.0) for d in range(7)])
+        month_factor = np.array([self.month_patterns.get(m, 1.0) for m in range(13)])
+        level = self.base_covers * self._event_counts + self.trend_slope * self._event_x_sums
+        baseline_sums = np.einsum("cdm,d,m->c", level, day_factor, month_factor)
+        self._event_factor = shrink_uplift(seen, self._event_actual, baseline_sums)
+        self.event_factors = {
+            self.calendar.names[code]: round(float(self._event_factor[code]), 3)
+            for code in np.nonzero(seen)[0] if code
+        }
+
+    def _rolling_folds(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Rolling-origin out-of-sample predictions of the built-in model
+
+        Every day after the first QUANTILE_MIN_TRAIN_DAYS is a cutoff whose
+        next QUANTILE_HORIZON days are predicted (from prefix sums, see
+        forecasting.backtesting). None when the history is too short.
+        """
+        if len(self.history) <= QUANTILE_MIN_TRAIN_DAYS:
+            return None
+        return fold_predictions(
+            self.history, horizon=QUANTILE_HORIZON, step=1,
+            min_train_days=QUANTILE_MIN_TRAIN_DAYS, calendar=self.calendar,
+        )
+
+    def _select_model(self, folds: Optional[Dict[str, np.ndarray]]) -> Optional[np.ndarray]:
+        """
+        Keep the covers model with the lowest WAPE on the rolling folds
+
+        Backends predict all folds in one pass each (CoversModel.fold_predict),
+        so scoring them costs about one extra fit apiece. Ties go to the
+        built-in model.
+
+        Returns:
+            The selected model's fold predictions (None without folds)
+        """
+        self.model, self.model_name, self.model_scores = None, SEASONAL_TREND, {}
+        if folds is None or not self.backends:
+            return None if folds is None else folds["predicted"]
+
+        candidates = {
+            SEASONAL_TREND: folds["predicted"],
+            **backend_fold_predictions(self.history, folds, self.calendar, self.backends),
+        }
+        self.model_scores = model_scores(folds["actual"], candidates)
+        best = min(self.model_scores, key=self.model_scores.get)
+        if best != SEASONAL_TREND:
+            self.model = {b.name: b for b in self.backends}[best]()
+            self.model.fit(
+                self.history.ordinals.astype(np.int64), self.history.covers,
+                self.calendar.codes_for(self.history.ordinals),
+            )
+        self.model_name = best
+        return candidates[best]
+
+    def _fit_quantiles(self, folds: Optional[Dict[str, np.ndarray]], fold_predicted: Optional[np.ndarray]):
+        """
+        Empirical forecast-error distributions from rolling-origin residuals
+
+        Relative errors of the selected model's fold predictions are grouped
+        by target DOW and horizon bucket and reduced to quantile tables, so
+        a forecast looks its band up instead of assuming one.
+        """
+        self.residual_quantiles[:] = np.nan
+        self.pooled_quantiles[:] = np.nan
+        self.residual_samples = 0
+        if folds is None:
+            return
+
+        self.residual_samples = int((fold_predicted > 0).sum())
+        self.residual_quantiles[:], self.pooled_quantiles[:] = fit_quantile_tables(
+            folds["actual"], fold_predicted, folds["days_ahead"], folds["dow"]
+        )
+
+    def _forecast_quantiles(self, predicted_covers: int, dow: int, horizon: int) -> List[float]:
+        """Covers at QUANTILE_LEVELS for one prediction, banded around it (O(1) table lookup)"""
+        ratios = ratio_quantiles(
+            self.residual_quantiles, self.pooled_quantiles, np.array([dow]), np.array([max(horizon, 1)])
+        )[0]
+        if not np.isnan(ratios[0]):
+            return [max(0.0, predicted_covers * r) for r in ratios.tolist()]
+
+        # Not enough history for empirical errors: fixed normal band
+        std_dev = self.base_covers * 0.12
+        return [
+            max(0.0, predicted_covers + z * std_dev)
+            for z in (-1.96, -1.2816, 0.0, 1.2816, 1.96)
+        ]
+
     def _calculate_accuracy(self):
         """Calculate model accuracy metrics"""
-        n = len(self.historical_data)
+        n = len(self.history)
         holdout_start = int(n * 0.8)
-        holdout = self.historical_data[holdout_start:]
+        holdout_ordinals = self.history.ordinals[holdout_start:]
+        holdout_covers = self.history.column('total_covers')[holdout_start:]
 
-        if not holdout:
+        if not len(holdout_ordinals):
             return
 
         errors = []
-        for d in holdout:
-            actual = d['total_covers']
-            target_date = datetime.fromisoformat(d['date']).date()
-            forecast = self._predict_single(target_date, len(self.historical_data))
+        for ordinal, actual in zip(holdout_ordinals.tolist(), holdout_covers.tolist()):
+            target_date = date.fromordinal(ordinal)
+            forecast = self._predict_single(target_date, n)
             predicted = forecast.predicted_covers
             if actual > 0:
                 errors.append(abs(actual - predicted) / actual)
@@ -123,7 +465,7 @@ class DemandForecastEngine:
             self.accuracy_metrics = {
                 "mape": round(sum(errors) / len(errors) * 100, 2),
                 "accuracy": round((1 - sum(errors) / len(errors)) * 100, 2),
-                "holdout_size": len(holdout),
+                "holdout_size": len(holdout_ordinals),
                 "total_samples": n
             }
 
@@ -131,32 +473,52 @@ class DemandForecastEngine:
         """Generate forecast for a single date"""
         dow = target_date.weekday()
         month = target_date.month
+        event = self.calendar.code_for(target_date.toordinal())
 
         # Components
         day_factor = self.day_patterns.get(dow, 1.0)
         month_factor = self.month_patterns.get(month, 1.0)
+        event_factor = self._event_factor[event]
         trend_value = self.base_covers + self.trend_slope * days_from_start
 
-        # Combined prediction
-        predicted_covers = int(trend_value * day_factor * month_factor)
+        # Combined prediction, unless a backend model backtested better. Each
+        # factor's effect is also kept in covers, applied in order, for explanations
+        if self.model is None:
+            predicted_covers = int(trend_value * day_factor * month_factor * event_factor)
+            parts = {
+                "trend": trend_value,
+                "day_of_week": trend_value * (day_factor - 1),
+                "month": trend_value * day_factor * (month_factor - 1),
+                "event": trend_value * day_factor * month_factor * (event_factor - 1),
+            }
+        else:
+            ordinals, codes = np.array([target_date.toordinal()]), np.array([event])
+            predicted_covers = int(self.model.predict(ordinals, codes)[0])
+            parts = {name: float(v[0]) for name, v in self.model.components(ordinals, codes).items()}
+        components = {
+            "model": self.model_name,
+            "event_name": self.calendar.names[event] if event else None,
+            "effects": {name: round(float(v), 2) for name, v in parts.items()},
+        }
+        if self.model is None:
+            components["factors"] = {
+                "day_of_week": round(day_factor, 4),
+                "month": round(month_factor, 4),
+                "event": round(float(event_factor), 4),
+            }
 
-        # Confidence interval (wider for further dates)
-        std_dev = self.base_covers * 0.12
-        confidence_lower = max(0, predicted_covers - 1.96 * std_dev)
-        confidence_upper = predicted_covers + 1.96 * std_dev
+        # Empirical quantiles for this DOW and horizon; the 95% interval is P2.5-P97.5
+        horizon = target_date.toordinal() - self.last_ordinal
+        confidence_lower, p10, p50, p90, confidence_upper = self._forecast_quantiles(
+            predicted_covers, dow, horizon
+        )
 
         # Revenue prediction
         predicted_revenue = predicted_covers * self.avg_check
 
-        # Channel breakdown
-        if dow in [4, 5]:  # Fri, Sat - more delivery
-            channels = {"dine_in": 0.42, "delivery": 0.38, "takeaway": 0.20}
-        elif dow == 3:  # Thursday
-            channels = {"dine_in": 0.50, "delivery": 0.30, "takeaway": 0.20}
-        else:
-            channels = {"dine_in": 0.52, "delivery": 0.28, "takeaway": 0.20}
-
-        channel_breakdown = {k: round(v * predicted_covers) for k, v in channels.items()}
+        # Channel breakdown from the learned DOW shares and their trend
+        channels = self._channel_split_shares(dow, days_from_start)
+        channel_breakdown = self._split_channels(predicted_covers, channels)
 
         return DemandForecast(
             forecast_date=target_date,
@@ -164,8 +526,14 @@ class DemandForecastEngine:
             predicted_revenue=round(predicted_revenue, 2),
             confidence_lower=round(confidence_lower),
             confidence_upper=round(confidence_upper),
+            p10=round(p10),
+            p50=round(p50),
+            p90=round(p90),
             day_of_week=target_date.strftime("%A"),
-            channel_breakdown=channel_breakdown
+            is_holiday=self.calendar.holidays[event],
+            is_ramadan=self.calendar.categories[event] == "ramadan",
+            channel_breakdown=channel_breakdown,
+            components=components,
         )
 
     def forecast(self, days_ahead: int = 14) -> List[DemandForecast]:
@@ -178,59 +546,149 @@ class DemandForecastEngine:
         Returns:
             List of DemandForecast objects
         """
-        if not self.is_trained:
-            raise RuntimeError("Model not trained. Call train() first.")
-
-        forecasts = []
         today = date.today()
-        days_from_start = len(self.historical_data)
+        return self.forecast_dates([today + timedelta(days=i) for i in range(1, days_ahead + 1)])
+
+    def forecast_dates(self, target_dates: List[date]) -> List[DemandForecast]:
+        """
+        Generate demand forecasts for specific dates
 
-        for i in range(1, days_ahead + 1):
-            target_date = today + timedelta(days=i)
-            forecast = self._predict_single(target_date, days_from_start + i)
-            forecasts.append(forecast)
+        The trend is indexed by calendar day, so a date's forecast depends only
+        on the trained model, not on the day it is requested.
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
 
-        return forecasts
+        return [
+            self._predict_single(d, d.toordinal() - self.origin_ordinal)
+            for d in target_dates
+        ]
 
-    def forecast_items(self, days_ahead: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    def forecast_items(self, days_ahead: int = 7, reconcile_method: Optional[str] = "mint") -> ItemForecastGrid:
         """
         Forecast demand for individual menu items
 
+        Computes the whole items x days grid at once: each item's per-DOW
+        mean quantity, scaled by the covers trend for each day ahead, then
+        reconciled with the daily covers forecast (see forecast_hierarchy).
+
         Args:
             days_ahead: Number of days to forecast
+            reconcile_method: "mint", "top_down", "bottom_up", or None for the
+                unreconciled item model
 
         Returns:
-            Dict mapping item names to daily forecast lists
+            ItemForecastGrid; reads as a dict mapping item names to daily forecast lists
         """
-        if not self.is_trained:
-            raise RuntimeError("Model not trained. Call train() first.")
+        if reconcile_method is not None:
+            return self.forecast_hierarchy(days_ahead, reconcile_method)[1]
 
-        item_forecasts = {}
-        today = date.today()
+        dates = self._forecast_days(days_ahead)
+        quantities = np.trunc(self._item_base_grid(dates)).astype(np.int64)
+        return ItemForecastGrid(list(self.history.item_names), dates, quantities)
 
-        for item_name, dow_patterns in self.item_patterns.items():
-            forecasts = []
-            for i in range(1, days_ahead + 1):
-                target_date = today + timedelta(days=i)
-                dow = target_date.weekday()
+    def forecast_hierarchy(
+        self, days_ahead: int = 7, method: str = "mint"
+    ) -> Tuple[List[DemandForecast], ItemForecastGrid]:
+        """
+        Daily covers (with channels) and item quantities that add up
 
-                base_qty = dow_patterns.get(dow, 0)
-                if isinstance(base_qty, list):
-                    base_qty = sum(base_qty) / len(base_qty) if base_qty else 0
+        Items are tied to covers through units per cover (total item
+        quantity / total covers in history): each day's item units must sum
+        to covers x units_per_cover. The daily and item forecasts are
+        reconciled for all days in one vectorized pass; MinT weighs the
+        covers forecast by its empirical P10-P90 spread and each item by the
+        variance of its quantity on that weekday.
 
-                # Apply trend
-                trend_factor = 1.0 + (self.trend_slope / self.base_covers) * i
-                predicted_qty = max(0, int(base_qty * trend_factor))
+        Args:
+            days_ahead: Number of days to forecast
+            method: "mint", "top_down" (items follow covers) or "bottom_up"
+                (covers follow items)
 
-                forecasts.append({
-                    "date": target_date.isoformat(),
-                    "day_of_week": target_date.strftime("%A"),
-                    "predicted_quantity": predicted_qty
-                })
+        Returns:
+            (daily forecasts, item grid); channel splits sum to covers
+        """
+        dates = self._forecast_days(days_ahead)
+        daily = self.forecast_dates(dates)
+        items = self._item_base_grid(dates)
+        item_names = list(self.history.item_names)
+
+        units_per_cover = self._sum_item_units / self._sum_covers if self._sum_covers else 0.0
+        if units_per_cover <= 0 or not len(items):
+            return daily, ItemForecastGrid(item_names, dates, np.trunc(items).astype(np.int64))
+
+        covers = np.array([f.predicted_covers for f in daily], dtype=np.float64)
+        spread = np.array([f.p90 - f.p10 for f in daily], dtype=np.float64)
+        top_var = np.maximum((spread / 2.5631 * units_per_cover) ** 2, 1e-9)
+        units, items = reconcile(
+            covers * units_per_cover, items, method,
+            top_var=top_var, bottom_var=self._item_variance(dates),
+        )
 
-            item_forecasts[item_name] = forecasts
+        unit_totals = np.rint(units)
+        quantities = round_preserving_sum(items.T, unit_totals).T
+        reconciled_covers = np.rint(unit_totals / units_per_cover).astype(np.int64)
+        daily = [
+            f if f.predicted_covers == c else self._with_covers(f, int(c))
+            for f, c in zip(daily, reconciled_covers)
+        ]
+        return daily, ItemForecastGrid(item_names, dates, quantities)
 
-        return item_forecasts
+    def _forecast_days(self, days_ahead: int) -> List[date]:
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+        today = date.today()
+        return [today + timedelta(days=i) for i in range(1, days_ahead + 1)]
+
+    def _item_base_grid(self, dates: List[date]) -> np.ndarray:
+        """(items x days) unrounded item quantities before reconciliation"""
+        dows = np.array([d.weekday() for d in dates], dtype=np.int64)
+        dow_means = np.divide(
+            self._item_sums, self._item_counts,
+            out=np.zeros_like(self._item_sums), where=self._item_counts > 0,
+        )
+        # Apply trend
+        trend_factor = 1.0 + (self.trend_slope / self.base_covers) * np.arange(1, len(dates) + 1)
+        return np.maximum(0, dow_means[:, dows] * trend_factor)
+
+    def _item_variance(self, dates: List[date]) -> np.ndarray:
+        """(items x days) variance of each item's quantity on the target weekday"""
+        dows = np.array([d.weekday() for d in dates], dtype=np.int64)
+        counts = np.maximum(self._item_counts, 1)
+        mean = self._item_sums / counts
+        var = self._item_sqsums / counts - mean ** 2
+        # At least Poisson-level noise, so single-sale cells aren't treated as certain
+        return np.maximum(var, np.maximum(mean, 1.0))[:, dows]
+
+    @staticmethod
+    def _split_channels(covers: int, shares: Dict[str, float]) -> Dict[str, int]:
+        """Channel covers that add up to the day's covers"""
+        split = round_preserving_sum(np.array([list(shares.values())]) * covers, np.array([covers]))[0]
+        return dict(zip(shares, split.tolist()))
+
+    def _with_covers(self, forecast: DemandForecast, covers: int) -> DemandForecast:
+        """Same forecast moved to a reconciled covers total"""
+        delta = covers - forecast.predicted_covers
+        old = forecast.predicted_covers
+        shares = {
+            k: (v / old if old else 1.0 / len(forecast.channel_breakdown))
+            for k, v in forecast.channel_breakdown.items()
+        }
+        return dataclasses.replace(
+            forecast,
+            predicted_covers=covers,
+            predicted_revenue=round(covers * self.avg_check, 2),
+            confidence_lower=max(0, forecast.confidence_lower + delta),
+            confidence_upper=max(0, forecast.confidence_upper + delta),
+            p10=max(0, forecast.p10 + delta),
+            p50=max(0, forecast.p50 + delta),
+            p90=max(0, forecast.p90 + delta),
+            channel_breakdown=self._split_channels(covers, shares),
+            components={
+                **forecast.components,
+                "effects": {**forecast.components.get("effects", {}), "reconciliation": delta},
+            },
+        )
 
     def get_insights(self) -> List[Dict[str, str]]:
         """Generate actionable insights from forecast data"""
@@ -278,9 +736,11 @@ class DemandForecastEngine:
             })
 
         # Delivery growth
-        recent = self.historical_data[-14:]
-        if recent:
-            avg_delivery_pct = sum(d['delivery'] / d['total_covers'] for d in recent if d['total_covers'] > 0) / len(recent)
+        recent_covers = self.history.column('total_covers')[-14:]
+        if len(recent_covers):
+            recent_delivery = self.history.column('delivery')[-14:]
+            served = recent_covers > 0
+            avg_delivery_pct = float((recent_delivery[served] / recent_covers[served]).sum()) / len(recent_covers)
             if avg_delivery_pct > 0.30:
                 insights.append({
                     "type": "channel",
@@ -290,8 +750,8 @@ class DemandForecastEngine:
                 })
 
         # Waste reduction opportunity
-        avg_waste = sum(d.get('food_waste_kg', 0) for d in self.historical_data[-30:]) / 30
-        avg_covers = sum(d['total_covers'] for d in self.historical_data[-30:]) / 30
+        avg_waste = float(self.history.column('food_waste_kg', default=0)[-30:].sum()) / 30
+        avg_covers = float(self.history.column('total_covers')[-30:].sum()) / 30
         waste_per_cover = avg_waste / avg_covers if avg_covers > 0 else 0
         if waste_per_cover > 0.10:
             insights.append({
@@ -307,7 +767,7 @@ class DemandForecastEngine:
         """Get summary of the trained model"""
         return {
             "is_trained": self.is_trained,
-            "training_samples": len(self.historical_data),
+            "training_samples": len(self.history),
             "base_daily_covers": round(self.base_covers, 1),
             "base_daily_revenue": round(self.base_revenue, 2),
             "avg_check": round(self.avg_check, 2),
@@ -318,5 +778,100 @@ class DemandForecastEngine:
                 ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][k]: round(v, 3)
                 for k, v in sorted(self.day_patterns.items())
             },
-            "items_tracked": len(self.item_patterns)
+            "items_tracked": len(self.item_patterns),
+            "event_factors": self.event_factors,
+            "channel_shares": {
+                ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][k]: {c: round(v, 3) for c, v in shares.items()}
+                for k, shares in sorted(self.channel_shares.items())
+            },
+            "channel_trend_per_30d": {c: round(v * 30, 4) for c, v in self.channel_trends.items()},
+            "model": self.model_name,
+            "model_scores": self.model_scores,
+            "uncertainty": "empirical" if self.residual_samples else "fixed",
+            "residual_samples": self.residual_samples,
         }
+
+    def save(self, path):
+        """
+        Write the trained model to a versioned binary file (see forecasting.model_io)
+
+        Stores the running sums, residual quantile tables, columnar history
+        and the selected backend's state; patterns, trend, channel shares and event factors are cheap
+        to re-derive from them and are rebuilt by load().
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        history_meta, history_arrays = self.history.to_arrays()
+        meta = {
+            "engine": type(self).__name__,
+            "country": self.country,
+            "origin_ordinal": self.origin_ordinal,
+            "last_ordinal": self.last_ordinal,
+            "accuracy_metrics": self.accuracy_metrics,
+            "residual_samples": self.residual_samples,
+            "scalars": {name: getattr(self, name) for name in _SAVED_SCALARS},
+            "history": history_meta,
+            "model": self.model_name,
+            "model_scores": self.model_scores,
+        }
+        arrays = {name: getattr(self, name) for name in _SAVED_ARRAYS + _EVENT_ARRAYS}
+        arrays.update({f"history/{name}": a for name, a in history_arrays.items()})
+        if self.model is not None:
+            meta["model_state"], model_arrays = self.model.get_state()
+            arrays.update({f"model/{name}": a for name, a in model_arrays.items()})
+        write_model_file(path, meta, arrays)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "DemandForecastEngine":
+        """
+        Restore a model written by save() without retraining
+
+        Args:
+            path: Model file
+            mmap: Memory-map the arrays copy-on-write (pages load on first use,
+                and update() still works); False reads them into memory
+
+        Returns:
+            Trained engine
+        """
+        meta, arrays = read_model_file(path, mmap=mmap)
+        if meta.get("engine") != cls.__name__:
+            raise ValueError(f"{path} holds a {meta.get('engine')} model, not {cls.__name__}")
+
+        engine = cls(country=meta["country"])
+        engine.origin_ordinal = meta["origin_ordinal"]
+        engine.last_ordinal = meta["last_ordinal"]
+        engine.accuracy_metrics = meta["accuracy_metrics"]
+        engine.residual_samples = meta["residual_samples"]
+        for name, value in meta["scalars"].items():
+            setattr(engine, name, value)
+        for name in _SAVED_ARRAYS:
+            setattr(engine, name, arrays[name])
+        engine.history = DailyHistory.from_arrays(meta["history"], {
+            name[len("history/"):]: a for name, a in arrays.items() if name.startswith("history/")
+        })
+        if all(name in arrays for name in _EVENT_ARRAYS):
+            for name in _EVENT_ARRAYS:
+                setattr(engine, name, arrays[name])
+        else:
+            history = engine.history
+            engine._fit_event_sums(
+                engine.calendar.codes_for(history.ordinals),
+                (history.ordinals - engine.origin_ordinal).astype(np.float64),
+                history,
+            )
+        engine.model_name = meta.get("model", SEASONAL_TREND)
+        engine.model_scores = meta.get("model_scores", {})
+        if engine.model_name != SEASONAL_TREND:
+            backends = {b.name: b for b in engine.backends + BACKENDS}
+            if engine.model_name not in backends:
+                raise ValueError(f"{path} uses unknown model backend {engine.model_name}")
+            engine.model = backends[engine.model_name].from_state(meta["model_state"], {
+                name[len("model/"):]: a for name, a in arrays.items() if name.startswith("model/")
+            })
+
+        engine._derive_item_patterns()
+        engine._derive_patterns()
+        engine.is_trained = True
+        return engine
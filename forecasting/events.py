@@ -0,0 +1,208 @@
+"""
+Forkast Event Calendar
+Hijri-aware holiday/Ramadan index joined to forecasts by date ordinal
+"""
+import json
+import math
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+EVENTS_FILE = Path(__file__).parent / "data" / "mena_events.json"
+
+# Range covered by the dense index; dates outside it have no events
+_INDEX_START = date(2000, 1, 1).toordinal()
+_INDEX_END = date(2060, 12, 31).toordinal()
+
+# Event uplift is shrunk toward 1.0 as if this many ordinary days were also seen
+EVENT_PRIOR_DAYS = 2.0
+
+# Julian day number of 1 Muharram 1 AH (tabular/civil epoch) minus that of date(1, 1, 1)
+_HIJRI_EPOCH_OFFSET = 1948439 - 1721425
+
+
+def tabular_hijri_to_ordinal(year: int, month: int, day: int) -> int:
+    """date.toordinal() of a Hijri date in the arithmetic (tabular) Islamic calendar"""
+    return (
+        day
+        + math.ceil(29.5 * (month - 1))
+        + (year - 1) * 354
+        + (3 + 11 * year) // 30
+        + _HIJRI_EPOCH_OFFSET
+        - 1
+    )
+
+
+class EventCalendar:
+    """
+    Dense day -> event code index built once from the events data file.
+
+    codes[ordinal - start_ordinal] is 0 on ordinary days and otherwise an
+    index into names/categories/holidays; where events overlap, the one
+    listed first in the file wins. Lookups are a single array index, so
+    the engine joins whole histories with codes_for(ordinals).
+    """
+
+    def __init__(self, spec: Dict[str, Any], country: Optional[str] = None):
+        self.country = country
+        self.start_ordinal = _INDEX_START
+        self.codes = np.zeros(_INDEX_END - _INDEX_START + 1, dtype=np.int16)
+        self.names: List[str] = ["none"]
+        self.categories: List[str] = ["none"]
+        self.holidays: List[bool] = [False]
+
+        self._month_starts = {
+            tuple(int(p) for p in key.split("-")): date.fromisoformat(value).toordinal()
+            for key, value in spec.get("month_starts", {}).items()
+        }
+
+        first_year, last_year = date.fromordinal(_INDEX_START).year, date.fromordinal(_INDEX_END).year
+        hijri_years = range(self._hijri_year(_INDEX_START) - 1, self._hijri_year(_INDEX_END) + 2)
+        for event in spec.get("hijri_events", []):
+            if not self._applies(event):
+                continue
+            code = self._add_event(event)
+            for year in hijri_years:
+                start = self._hijri_month_start(year, event["month"]) + event["day"] - 1
+                if event.get("until_month_end"):
+                    end = self._hijri_month_start(*self._next_month(year, event["month"]))
+                else:
+                    end = start + event["days"]
+                self._mark(start, end, code)
+
+        for event in spec.get("gregorian_events", []):
+            if not self._applies(event):
+                continue
+            code = self._add_event(event)
+            for year in range(first_year, last_year + 1):
+                start = date(year, event["month"], event["day"]).toordinal()
+                self._mark(start, start + event["days"], code)
+
+    @classmethod
+    def load(cls, path: Path = EVENTS_FILE, country: Optional[str] = None) -> "EventCalendar":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), country=country)
+
+    @property
+    def n_events(self) -> int:
+        return len(self.names)
+
+    def code_for(self, ordinal: int) -> int:
+        """Event code for one day (0 = no event)"""
+        i = ordinal - self.start_ordinal
+        return int(self.codes[i]) if 0 <= i < len(self.codes) else 0
+
+    def codes_for(self, ordinals: np.ndarray) -> np.ndarray:
+        """Event codes for an array of day ordinals"""
+        i = np.asarray(ordinals, dtype=np.int64) - self.start_ordinal
+        inside = (i >= 0) & (i < len(self.codes))
+        return np.where(inside, self.codes[np.clip(i, 0, len(self.codes) - 1)], 0).astype(np.int64)
+
+    def events_between(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Event days in [start, end], for display"""
+        return [
+            {"date": date.fromordinal(o).isoformat(), "event": self.names[c],
+             "category": self.categories[c], "is_holiday": self.holidays[c]}
+            for o in range(start.toordinal(), end.toordinal() + 1)
+            for c in [self.code_for(o)]
+            if c
+        ]
+
+    def _applies(self, event: Dict[str, Any]) -> bool:
+        countries = event.get("countries")
+        if not countries:
+            return True
+        return self.country is not None and self.country.lower() in (c.lower() for c in countries)
+
+    def _add_event(self, event: Dict[str, Any]) -> int:
+        self.names.append(event["name"])
+        self.categories.append(event.get("category", "holiday"))
+        self.holidays.append(bool(event.get("holiday", False)))
+        return len(self.names) - 1
+
+    def _mark(self, start: int, end: int, code: int):
+        """Set code on [start, end) where no earlier-listed event is set"""
+        lo = max(start, _INDEX_START) - _INDEX_START
+        hi = min(end, _INDEX_END + 1) - _INDEX_START
+        if lo < hi:
+            span = self.codes[lo:hi]
+            span[span == 0] = code
+
+    def _hijri_month_start(self, year: int, month: int) -> int:
+        return self._month_starts.get((year, month), tabular_hijri_to_ordinal(year, month, 1))
+
+    @staticmethod
+    def _next_month(year: int, month: int):
+        return (year + 1, 1) if month == 12 else (year, month + 1)
+
+    @staticmethod
+    def _hijri_year(ordinal: int) -> int:
+        # Mean Hijri year is 10631/30 days
+        return int((ordinal - _HIJRI_EPOCH_OFFSET) * 30 / 10631) + 1
+
+
+def event_uplift(
+    codes: np.ndarray,
+    actual: np.ndarray,
+    baseline: np.ndarray,
+    n_events: int,
+    visible: Optional[np.ndarray] = None,
+    prior_days: float = EVENT_PRIOR_DAYS,
+) -> np.ndarray:
+    """
+    Learned demand multiplier per event: actual / baseline covers on its days
+
+    The ratio is shrunk toward 1.0 as if prior_days ordinary days had also
+    been observed, so an event seen once doesn't swing the forecast.
+
+    Args:
+        codes: Event code of each event day (J,)
+        actual: Actual covers on those days (J,)
+        baseline: (F x J) model predictions without event factors, one row per fit
+        n_events: Number of event codes (EventCalendar.n_events)
+        visible: Optional (F x J) mask of the days each fit may learn from
+
+    Returns:
+        (F x n_events) factors; code 0 (no event) is always 1.0
+    """
+    onehot = np.zeros((len(codes), n_events))
+    onehot[np.arange(len(codes)), codes] = 1.0
+    weights = np.ones_like(baseline) if visible is None else visible.astype(np.float64)
+
+    seen = weights @ onehot
+    actual_sums = (weights * actual) @ onehot
+    baseline_sums = (weights * baseline) @ onehot
+    return shrink_uplift(seen, actual_sums, baseline_sums, prior_days)
+
+
+def shrink_uplift(
+    seen: np.ndarray,
+    actual_sums: np.ndarray,
+    baseline_sums: np.ndarray,
+    prior_days: float = EVENT_PRIOR_DAYS,
+) -> np.ndarray:
+    """
+    Event factors from per-code day counts and summed actual / baseline covers
+
+    Args:
+        seen: Event days observed per code (... x n_events)
+        actual_sums: Actual covers summed over those days
+        baseline_sums: Baseline covers summed over those days
+        prior_days: Ordinary days the ratio is shrunk toward 1.0 with
+
+    Returns:
+        Factors shaped like seen; code 0 (no event) is always 1.0
+    """
+    ratio = np.divide(actual_sums, baseline_sums, out=np.ones_like(actual_sums), where=baseline_sums > 0)
+    factors = (seen * ratio + prior_days) / (seen + prior_days)
+    factors[..., 0] = 1.0
+    return factors
+
+
+@lru_cache(maxsize=None)
+def load_event_calendar(country: Optional[str] = None) -> EventCalendar:
+    """Calendar for a country, built once per process from EVENTS_FILE"""
+    return EventCalendar.load(country=country)
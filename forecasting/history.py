@@ -0,0 +1,257 @@
+"""
+Forkast Daily History
+Compact columnar (NumPy) storage of daily order summaries
+"""
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# date.toordinal() of 1970-01-01, the datetime64 epoch
+_EPOCH_ORDINAL = 719163
+
+# Keys that are derived (date, day_of_week) or stored in the item matrix
+_RESERVED_KEYS = ("date", "day_of_week", "item_orders")
+
+
+def _to_column(values: List[Any]) -> np.ndarray:
+    """Smallest sensible typed array for one field across all days"""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        if len(arr) == 0 or (arr.min() >= np.iinfo(np.int32).min and arr.max() <= np.iinfo(np.int32).max):
+            return arr.astype(np.int32)
+        return arr.astype(np.int64)
+    if arr.dtype.kind in "fb":
+        return arr.astype(np.float64) if arr.dtype.kind == "f" else arr
+    return np.array(values, dtype=object)
+
+
+def _to_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class DailyHistory:
+    """
+    Daily order summaries held as typed columns instead of a list of dicts.
+
+    Scalar fields become one NumPy array each (int32 for counts, float64 for
+    money), menu items are integer-coded through item_names/item_index, and
+    item quantities live in one dense float32 (days x items) matrix where NaN
+    means "not sold that day". Dates are kept as int32 ordinals; date and
+    day_of_week are rebuilt on access.
+
+    Supports len(), indexing, slicing and iteration, each yielding dicts in the
+    format DemandForecastEngine.train takes, so it can stand in for the list.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._n = 0
+        self._ordinals = np.zeros(capacity, dtype=np.int32)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._item_qty = np.full((capacity, 0), np.nan, dtype=np.float32)
+        self.item_names: List[str] = []
+        self.item_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "DailyHistory":
+        """Build columns from the list-of-dicts format used by DemandForecastEngine.train"""
+        n = len(records)
+        history = cls(capacity=n)
+        history._n = n
+        history._ordinals[:] = [datetime.fromisoformat(d['date']).toordinal() for d in records]
+
+        keys = dict.fromkeys(k for d in records for k in d if k not in _RESERVED_KEYS)
+        history._columns = {key: _to_column([d.get(key, 0) for d in records]) for key in keys}
+
+        item_index = history.item_index
+        add_item = item_index.setdefault
+        row_sizes = np.empty(n, dtype=np.int64)
+        cols: List[int] = []
+        qtys: List[float] = []
+        for i, d in enumerate(records):
+            item_orders = d.get('item_orders', {})
+            row_sizes[i] = len(item_orders)
+            cols.extend([add_item(name, len(item_index)) for name in item_orders])
+            qtys.extend(item_orders.values())
+
+        history.item_names = list(item_index)
+        history._item_qty = np.full((n, len(item_index)), np.nan, dtype=np.float32)
+        if cols:
+            rows = np.repeat(np.arange(n), row_sizes)
+            history._item_qty[rows, np.array(cols, dtype=np.int64)] = qtys
+
+        return history
+
+    def append(self, record: Dict[str, Any]):
+        """Add one day, growing the arrays geometrically"""
+        i = self._n
+        if i == len(self._ordinals):
+            self._grow(max(8, 2 * i))
+        self._ordinals[i] = datetime.fromisoformat(record['date']).toordinal()
+
+        for key, value in record.items():
+            if key not in _RESERVED_KEYS and key not in self._columns:
+                self._columns[key] = _to_column([0] * len(self._ordinals))
+        for key, column in self._columns.items():
+            value = record.get(key, 0)
+            try:
+                column[i] = value
+                if column.dtype.kind in "iu" and column[i] != value:
+                    raise ValueError
+            except (TypeError, ValueError, OverflowError):
+                # Value doesn't fit the column's type (e.g. a float in an int column)
+                column = self._columns[key] = _to_column(list(column[:i]) + [value] * (len(column) - i))
+                column[i] = value
+
+        item_orders = record.get('item_orders', {})
+        new_items = [name for name in item_orders if name not in self.item_index]
+        if new_items:
+            for name in new_items:
+                self.item_index[name] = len(self.item_names)
+                self.item_names.append(name)
+            padding = np.full((len(self._ordinals), len(new_items)), np.nan, dtype=np.float32)
+            self._item_qty = np.hstack([self._item_qty, padding])
+        for name, qty in item_orders.items():
+            self._item_qty[i, self.item_index[name]] = qty
+
+        self._n += 1
+
+    def _grow(self, capacity: int):
+        extra = capacity - len(self._ordinals)
+        self._ordinals = np.concatenate([self._ordinals, np.zeros(extra, dtype=np.int32)])
+        self._columns = {
+            key: np.concatenate([col, np.zeros(extra, dtype=col.dtype)])
+            for key, col in self._columns.items()
+        }
+        padding = np.full((extra, len(self.item_names)), np.nan, dtype=np.float32)
+        self._item_qty = np.vstack([self._item_qty, padding])
+
+    # ---- column access -------------------------------------------------
+
+    @property
+    def ordinals(self) -> np.ndarray:
+        return self._ordinals[:self._n]
+
+    @property
+    def covers(self) -> np.ndarray:
+        return self.column('total_covers').astype(np.float64)
+
+    @property
+    def revenue(self) -> np.ndarray:
+        return self.column('total_revenue').astype(np.float64)
+
+    @property
+    def avg_check(self) -> np.ndarray:
+        return self.column('avg_check').astype(np.float64)
+
+    @property
+    def item_qty(self) -> np.ndarray:
+        """(days x items) quantities, NaN where the item wasn't sold"""
+        return self._item_qty[:self._n]
+
+    @property
+    def item_mask(self) -> np.ndarray:
+        return ~np.isnan(self.item_qty)
+
+    @property
+    def dow(self) -> np.ndarray:
+        return (self.ordinals.astype(np.int64) - 1) % 7
+
+    @property
+    def month(self) -> np.ndarray:
+        days = (self.ordinals.astype(np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+        return days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+    def column(self, name: str, default: Optional[float] = None) -> np.ndarray:
+        """
+        One scalar field for all days
+
+        Args:
+            name: Field name as in the daily summaries (e.g. "delivery")
+            default: Fill value when no day has the field; KeyError if None
+        """
+        if name in self._columns:
+            return self._columns[name][:self._n]
+        if default is None:
+            raise KeyError(name)
+        return np.full(self._n, default, dtype=np.float64)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays (including spare capacity)"""
+        return (
+            self._ordinals.nbytes
+            + self._item_qty.nbytes
+            + sum(col.nbytes for col in self._columns.values())
+        )
+
+    # ---- serialization -------------------------------------------------
+
+    def to_arrays(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        (meta, arrays) for forecasting.model_io, trimmed to the stored days
+
+        Numeric columns are saved as arrays; object columns (rare, e.g. text
+        fields) go into meta as lists.
+        """
+        n = self._n
+        arrays = {"ordinals": self.ordinals, "item_qty": self.item_qty}
+        object_columns = {}
+        for key, column in self._columns.items():
+            if column.dtype.kind == "O":
+                object_columns[key] = [_to_python(v) for v in column[:n]]
+            else:
+                arrays[f"column:{key}"] = column[:n]
+        meta = {"item_names": self.item_names, "columns": list(self._columns), "object_columns": object_columns}
+        return meta, arrays
+
+    @classmethod
+    def from_arrays(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> "DailyHistory":
+        """Rebuild from to_arrays output; arrays are used as given (no copy)"""
+        history = cls()
+        history._ordinals = arrays["ordinals"]
+        history._n = len(history._ordinals)
+        history._item_qty = arrays["item_qty"]
+        history._columns = {
+            key: arrays[f"column:{key}"] if f"column:{key}" in arrays
+            else np.array(meta["object_columns"][key], dtype=object)
+            for key in meta["columns"]
+        }
+        history.item_names = list(meta["item_names"])
+        history.item_index = {name: i for i, name in enumerate(history.item_names)}
+        return history
+
+    # ---- list-of-dicts view --------------------------------------------
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Rebuild the daily summary dict for row i"""
+        day = date.fromordinal(int(self._ordinals[i]))
+        record = {"date": day.isoformat(), "day_of_week": day.strftime("%A")}
+        for key, column in self._columns.items():
+            record[key] = _to_python(column[i])
+
+        row = self._item_qty[i]
+        item_orders = {}
+        for col in np.nonzero(~np.isnan(row))[0]:
+            qty = float(row[col])
+            item_orders[self.item_names[col]] = int(qty) if qty.is_integer() else qty
+        record["item_orders"] = item_orders
+        return record
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [self.record(i) for i in range(self._n)]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.record(i) for i in range(self._n))
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.record(i) for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("history index out of range")
+        return self.record(index)
@@ -0,0 +1,78 @@
+"""
+Forkast Forecast Intervals
+Empirical prediction intervals from rolling-origin forecast errors
+"""
+from typing import Tuple
+
+import numpy as np
+
+# Residual quantiles stored per (day of week, horizon bucket); P2.5/P97.5 give the 95% interval
+QUANTILE_LEVELS = (0.025, 0.10, 0.50, 0.90, 0.975)
+MEDIAN = QUANTILE_LEVELS.index(0.50)
+# Horizon buckets: 1 day, 2-3, 4-7, 8-14 and 15+ days ahead
+HORIZON_EDGES = np.array([1, 2, 4, 8, 15])
+# Rolling folds the errors come from: a cutoff every day after the first 28, 28 days ahead each
+QUANTILE_HORIZON = 28
+QUANTILE_MIN_TRAIN_DAYS = 28
+# Errors a (DOW, horizon) cell needs before its own quantiles replace the horizon's pooled ones
+MIN_SAMPLES = 40
+
+
+def horizon_bucket(days_ahead: np.ndarray) -> np.ndarray:
+    """Horizon bucket of each days-ahead value (1 day ahead and less is bucket 0)"""
+    return np.maximum(np.searchsorted(HORIZON_EDGES, days_ahead, side="right") - 1, 0)
+
+
+def fit_quantile_tables(
+    actual: np.ndarray, predicted: np.ndarray, days_ahead: np.ndarray, dow: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Relative error quantiles (actual / predicted - 1) per DOW and horizon bucket
+
+    Args:
+        actual, predicted, days_ahead, dow: Out-of-sample (fold, target) pairs
+
+    Returns:
+        (7 x buckets x levels) table and (buckets x levels) pooled table;
+        NaN rows where fewer than MIN_SAMPLES errors were seen
+    """
+    table = np.full((7, len(HORIZON_EDGES), len(QUANTILE_LEVELS)), np.nan)
+    pooled = np.full((len(HORIZON_EDGES), len(QUANTILE_LEVELS)), np.nan)
+    usable = predicted > 0
+    rel_error = actual[usable] / predicted[usable] - 1.0
+    bucket = horizon_bucket(days_ahead[usable])
+    dow = dow[usable]
+    for b in range(len(HORIZON_EDGES)):
+        in_bucket = bucket == b
+        if in_bucket.sum() < MIN_SAMPLES:
+            continue
+        pooled[b] = np.quantile(rel_error[in_bucket], QUANTILE_LEVELS)
+        for d in range(7):
+            cell = in_bucket & (dow == d)
+            if cell.sum() >= MIN_SAMPLES:
+                table[d, b] = np.quantile(rel_error[cell], QUANTILE_LEVELS)
+    return table, pooled
+
+
+def ratio_quantiles(
+    table: np.ndarray, pooled: np.ndarray, dow: np.ndarray, days_ahead: np.ndarray
+) -> np.ndarray:
+    """
+    Ratio quantiles for each forecast, anchored on the point forecast
+
+    Each row is the cell's error quantiles, else its horizon's pooled ones,
+    as ratios to the forecast. The levels below the median are capped at
+    1.0 and those above it floored at 1.0, so every band contains the point
+    forecast while a biased model's bands still lean toward the actuals.
+
+    Returns:
+        (len(dow) x levels) non-decreasing multipliers of the point forecast;
+        NaN rows where neither table had enough errors
+    """
+    bucket = horizon_bucket(days_ahead)
+    ratios = 1.0 + table[dow, bucket]
+    missing = np.isnan(ratios[:, 0])
+    ratios[missing] = 1.0 + pooled[bucket[missing]]
+    ratios[:, :MEDIAN] = np.minimum(ratios[:, :MEDIAN], 1.0)
+    ratios[:, MEDIAN + 1:] = np.maximum(ratios[:, MEDIAN + 1:], 1.0)
+    return ratios
@@ -0,0 +1,104 @@
+"""
+Forkast Intraday Forecasting
+Splits daily cover forecasts into 24 hourly buckets by day-of-week profile
+"""
+from datetime import date
+from typing import Iterable, List, Sequence, Tuple, Union
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from forecasting.reconciliation import round_preserving_sum
+
+HOURS = 24
+
+# Used until a restaurant has timestamped orders: 11:00-23:00 service with a
+# lunch peak around 13:00 and a larger dinner peak around 20:00-21:00
+_DEFAULT_PROFILE = np.array([
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    3, 8, 11, 8, 4, 3, 4, 7, 12, 15, 13, 8, 4,
+], dtype=np.float64)
+_DEFAULT_PROFILE /= _DEFAULT_PROFILE.sum()
+
+
+class IntradayProfile:
+    """
+    Hour-of-day x day-of-week share of daily covers.
+
+    shares is a (7 x 24) array whose rows sum to 1, learned as the ratio of
+    covers per (weekday, hour) to covers per weekday. Weekdays without data
+    fall back to the all-days profile, and a profile with no data at all
+    uses a typical lunch/dinner curve.
+    """
+
+    def __init__(self):
+        self.shares = np.tile(_DEFAULT_PROFILE, (7, 1))
+        self.days_observed = np.zeros(7, dtype=np.int64)
+        self.is_trained = False
+
+    def train(self, hourly_rows: Iterable[Tuple[Union[str, date], int, float]]):
+        """
+        Learn the profile from hourly cover totals
+
+        Args:
+            hourly_rows: (day, hour 0-23, covers) tuples, e.g. a GROUP BY day,
+                hour over order timestamps; missing hours count as zero
+        """
+        rows = list(hourly_rows)
+        if not rows:
+            return
+        days, hours, covers = zip(*rows)
+        ordinals = np.array([
+            (date.fromisoformat(d) if isinstance(d, str) else d).toordinal() for d in days
+        ])
+        day_ordinals, day_idx = np.unique(ordinals, return_inverse=True)
+
+        # (days x 24) covers matrix, then weekday x hour totals in one matmul
+        hourly = np.zeros((len(day_ordinals), HOURS))
+        np.add.at(hourly, (day_idx, np.asarray(hours, dtype=np.int64)), np.asarray(covers, dtype=np.float64))
+        dow = (day_ordinals - 1) % 7
+        dow_onehot = np.zeros((len(day_ordinals), 7))
+        dow_onehot[np.arange(len(day_ordinals)), dow] = 1.0
+        dow_hour = dow_onehot.T @ hourly
+
+        totals = dow_hour.sum(axis=1, keepdims=True)
+        overall = dow_hour.sum(axis=0)
+        if overall.sum() > 0:
+            overall = overall / overall.sum()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.shares = np.where(totals > 0, dow_hour / totals, overall)
+        self.days_observed = np.bincount(dow, minlength=7)
+        self.is_trained = True
+
+    def hourly_covers(self, dates: Sequence[date], daily_covers: Sequence[float]) -> np.ndarray:
+        """
+        Split daily totals into hourly buckets
+
+        Rounds with largest remainders so each day's buckets add up to its total.
+
+        Returns:
+            (len(dates) x 24) int array
+        """
+        dow = np.array([d.weekday() for d in dates], dtype=np.int64)
+        totals = np.rint(np.asarray(daily_covers, dtype=np.float64))
+        return round_preserving_sum(self.shares[dow] * totals[:, None], totals)
+
+    def forecast(self, dates: Sequence[date], daily_covers: Sequence[float]) -> List[dict]:
+        """24-bucket forecasts with the peak hour for each day"""
+        hourly = self.hourly_covers(dates, daily_covers)
+        peaks = hourly.argmax(axis=1)
+        return [
+            {
+                "date": d.isoformat(),
+                "day_of_week": d.strftime("%A"),
+                "predicted_covers": int(row.sum()),
+                "hourly_covers": row.tolist(),
+                "peak_hour": int(peak),
+                "peak_hour_covers": int(row[peak]),
+            }
+            for d, row, peak in zip(dates, hourly, peaks)
+        ]
@@ -0,0 +1,54 @@
+"""
+Forkast Item Forecast Grid
+Array-backed items x days demand forecast
+"""
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+
+class ItemForecastGrid(Mapping):
+    """
+    Predicted quantities for every menu item over a run of dates.
+
+    quantities is an (items x days) int array aligned with item_names and
+    dates. The grid also reads as the {item_name: [{"date", "day_of_week",
+    "predicted_quantity"}, ...]} mapping that forecast_items used to return;
+    those per-day dicts are only built for the items that are looked up.
+    """
+
+    def __init__(self, item_names: List[str], dates: List[date], quantities: np.ndarray):
+        self.item_names = item_names
+        self.dates = dates
+        self.quantities = quantities
+        self._index = {name: row for row, name in enumerate(item_names)}
+        self._labels = [(d.isoformat(), d.strftime("%A")) for d in dates]
+
+    def item(self, item_name: str) -> np.ndarray:
+        """Daily quantities for one item"""
+        return self.quantities[self._index[item_name]]
+
+    def totals(self) -> Dict[str, int]:
+        """Total predicted quantity per item over the horizon"""
+        return dict(zip(self.item_names, self.quantities.sum(axis=1).tolist()))
+
+    def __getitem__(self, item_name: str) -> List[Dict[str, Any]]:
+        qtys = self.item(item_name).tolist()
+        return [
+            {"date": iso, "day_of_week": day_name, "predicted_quantity": qty}
+            for (iso, day_name), qty in zip(self._labels, qtys)
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.item_names)
+
+    def __len__(self) -> int:
+        return len(self.item_names)
+
+    def __contains__(self, item_name: object) -> bool:
+        return item_name in self._index
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {name: self[name] for name in self.item_names}
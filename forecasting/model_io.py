@@ -0,0 +1,87 @@
+"""
+Forkast Model File Format
+Versioned single-file container of NumPy arrays plus JSON metadata
+"""
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"FKMODEL\x00"
+FORMAT_VERSION = 1
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_model_file(path: Union[str, Path], meta: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+    """
+    Write metadata and arrays to one file, atomically
+
+    Layout: MAGIC | uint32 header length | JSON header | raw arrays, each
+    starting on a 64-byte boundary. The header records format_version,
+    meta, and dtype/shape/offset of every array, so readers can map the
+    arrays straight from the file without parsing the data.
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    table = {}
+    header = b""
+    # Offsets depend on the header size, which depends on the offsets; settle in two passes
+    for _ in range(2):
+        offset = _aligned(len(MAGIC) + 4 + len(header))
+        for name, a in arrays.items():
+            table[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+            offset = _aligned(offset + a.nbytes)
+        header = json.dumps(
+            {"format_version": FORMAT_VERSION, "meta": meta, "arrays": table}, separators=(",", ":")
+        ).encode("utf-8")
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name, a in arrays.items():
+            f.write(b"\x00" * (table[name]["offset"] - f.tell()))
+            f.write(a.tobytes())
+    os.replace(tmp, path)
+
+
+def read_model_file(path: Union[str, Path], mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Read a file written by write_model_file
+
+    Args:
+        path: Model file
+        mmap: Map arrays copy-on-write instead of reading them; pages are
+            loaded on first touch and writes stay private to the process
+
+    Returns:
+        (meta, arrays)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Forkast model file")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        if header["format_version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} uses model format {header['format_version']}, expected {FORMAT_VERSION}"
+            )
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            count = int(np.prod(shape)) if shape else 1
+            if mmap and count:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="c", offset=spec["offset"], shape=shape)
+            else:
+                f.seek(spec["offset"])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return header["meta"], arrays
@@ -0,0 +1,285 @@
+"""
+Forkast Forecast Model Registry
+In-memory cache of trained forecast engines, one per restaurant
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from forecasting.demand_engine import DemandForecastEngine
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE_SUFFIX = ".fkm"
+
+
+class ForecastModelRegistry:
+    """
+    LRU + TTL cache of trained DemandForecastEngine instances keyed by restaurant.
+
+    An engine is reused until it expires, is evicted to make room for another
+    restaurant, or orders are added to days it was trained on (see mark_stale).
+    Days that close while an engine is cached are folded into a copy of it
+    with DemandForecastEngine.update instead of retraining, and the copy
+    replaces it, so a cached engine is never modified while others read it.
+
+    With a model_dir, trained engines are also saved there, and a miss loads
+    the saved file (memory-mapped, milliseconds) instead of retraining when
+    it is younger than model_max_age_seconds, so a restarted process starts
+    warm from the last nightly batch.
+    """
+
+    def __init__(
+        self,
+        max_models: int = 256,
+        ttl_seconds: float = 3600,
+        model_dir: Optional[str] = None,
+        model_max_age_seconds: float = 36 * 3600,
+    ):
+        self.max_models = max_models
+        self.ttl_seconds = ttl_seconds
+        self.model_dir = Path(model_dir) if model_dir else None
+        self.model_max_age_seconds = model_max_age_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._data_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._train_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def get_or_train(
+        self,
+        restaurant_uid: str,
+        load_history: Callable[[], Optional[List[Dict[str, Any]]]],
+        load_days_since: Optional[Callable[[date], List[Dict[str, Any]]]] = None,
+        make_engine: Callable[[], DemandForecastEngine] = DemandForecastEngine,
+    ) -> Optional[DemandForecastEngine]:
+        """
+        Return the cached engine for a restaurant, loading or training one if needed
+
+        Args:
+            restaurant_uid: Restaurant the model belongs to
+            load_history: Called only on a cache miss without a usable saved
+                model, to fetch daily summaries; None when the restaurant has
+                too little history to train on, and then nothing is cached
+                and None is returned
+            load_days_since: Optional; returns closed-day summaries from a date
+                onwards, used to roll a cached engine forward once per day
+            make_engine: Builds the untrained engine on a cache miss
+        """
+        engine = self.get(restaurant_uid)
+        if engine is not None:
+            if load_days_since is not None:
+                engine = self._roll_forward(restaurant_uid, load_days_since) or engine
+            return engine
+
+        # One trainer per restaurant; concurrent requests wait for its result
+        with self._trainer_lock(restaurant_uid):
+            engine = self.get(restaurant_uid, count=False)
+            if engine is not None:
+                return engine
+
+            with self._lock:
+                version = self._data_versions.get(restaurant_uid, 0)
+
+            engine = self.load_saved(restaurant_uid)
+            if engine is None:
+                history = load_history()
+                if history is None:
+                    return None
+                engine = make_engine()
+                engine.train(history)
+                self.put(restaurant_uid, engine, version)
+                self.save(restaurant_uid, engine)
+                return engine
+            # A saved model covers days up to its last trained one
+            self.put(restaurant_uid, engine, version, synced_through=engine.last_ordinal)
+
+        if load_days_since is not None:
+            engine = self._roll_forward(restaurant_uid, load_days_since) or engine
+        return engine
+
+    def get(self, restaurant_uid: str, count: bool = True) -> Optional[DemandForecastEngine]:
+        """Return a fresh cached engine or None"""
+        with self._lock:
+            entry = self._entries.get(restaurant_uid)
+            if entry is not None and not self._is_fresh(restaurant_uid, entry):
+                del self._entries[restaurant_uid]
+                entry = None
+
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+
+            self._entries.move_to_end(restaurant_uid)
+            if count:
+                self.hits += 1
+            return entry["engine"]
+
+    def put(
+        self,
+        restaurant_uid: str,
+        engine: DemandForecastEngine,
+        version: Optional[int] = None,
+        synced_through: Optional[int] = None,
+    ):
+        """Store a trained engine, evicting the least recently used ones over capacity"""
+        with self._lock:
+            if version is None:
+                version = self._data_versions.get(restaurant_uid, 0)
+            self._entries[restaurant_uid] = {
+                "engine": engine,
+                "trained_at": time.monotonic(),
+                "version": version,
+                "synced_through": date.today().toordinal() - 1 if synced_through is None else synced_through,
+            }
+            self._entries.move_to_end(restaurant_uid)
+            while len(self._entries) > self.max_models:
+                self._entries.popitem(last=False)
+
+    def mark_stale(self, restaurant_uid: str):
+        """Signal that orders were added to already-trained days; the next lookup retrains"""
+        with self._lock:
+            self._data_versions[restaurant_uid] = self._data_versions.get(restaurant_uid, 0) + 1
+        self.discard_saved(restaurant_uid)
+
+    def discard_saved(self, restaurant_uid: str):
+        """Delete a restaurant's saved engine, if there is one"""
+        if self.model_dir is not None:
+            try:
+                self.model_path(restaurant_uid).unlink()
+            except FileNotFoundError:
+                pass
+
+    def model_path(self, restaurant_uid: str) -> Path:
+        return self.model_dir / f"{restaurant_uid}{MODEL_FILE_SUFFIX}"
+
+    def save(self, restaurant_uid: str, engine: DemandForecastEngine):
+        """Write an engine to model_dir (no-op without one); failures are logged, not raised"""
+        if self.model_dir is None:
+            return
+        try:
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            engine.save(self.model_path(restaurant_uid))
+        except OSError as e:
+            logger.warning("Could not save forecast model for %s: %s", restaurant_uid, e)
+
+    def load_saved(
+        self, restaurant_uid: str, engine_cls: type = DemandForecastEngine
+    ) -> Optional[DemandForecastEngine]:
+        """Saved engine for a restaurant, or None if missing, too old or unreadable"""
+        if self.model_dir is None:
+            return None
+        path = self.model_path(restaurant_uid)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if self.model_max_age_seconds and age > self.model_max_age_seconds:
+                return None
+            engine = engine_cls.load(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring saved forecast model %s: %s", path, e)
+            return None
+        with self._lock:
+            self.loads += 1
+        return engine
+
+    def warm_start(self, limit: Optional[int] = None) -> int:
+        """
+        Load saved engines from model_dir into the cache, newest first
+
+        Returns:
+            Number of engines loaded
+        """
+        if self.model_dir is None or not self.model_dir.is_dir():
+            return 0
+        paths = sorted(
+            self.model_dir.glob(f"*{MODEL_FILE_SUFFIX}"), key=lambda p: p.stat().st_mtime, reverse=True
+        )
+        loaded = 0
+        for path in paths[:min(limit or self.max_models, self.max_models)]:
+            restaurant_uid = path.name[:-len(MODEL_FILE_SUFFIX)]
+            engine = self.load_saved(restaurant_uid)
+            if engine is not None:
+                self.put(restaurant_uid, engine, synced_through=engine.last_ordinal)
+                loaded += 1
+        return loaded
+
+    def invalidate(self, restaurant_uid: Optional[str] = None):
+        """Drop one restaurant's engine, or every engine when no uid is given"""
+        with self._lock:
+            if restaurant_uid is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(restaurant_uid, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "cached_models": len(self._entries),
+                "history_bytes": sum(e["engine"].history.nbytes for e in self._entries.values()),
+                "max_models": self.max_models,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded_from_disk": self.loads,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    def _trainer_lock(self, restaurant_uid: str) -> threading.Lock:
+        with self._lock:
+            return self._train_locks.setdefault(restaurant_uid, threading.Lock())
+
+    def _roll_forward(
+        self, restaurant_uid: str, load_days_since: Callable[[date], List[Dict[str, Any]]]
+    ) -> Optional[DemandForecastEngine]:
+        """
+        Fold days closed since the engine was trained or last rolled forward
+
+        The days go into a copy of the cached engine, which then replaces it
+        in the entry; readers holding the old engine keep a consistent one.
+
+        Returns:
+            The cached engine after rolling forward, None if none is cached
+        """
+        closed_through = date.today().toordinal() - 1
+        with self._lock:
+            entry = self._entries.get(restaurant_uid)
+        if entry is None or entry["synced_through"] >= closed_through:
+            return None if entry is None else entry["engine"]
+
+        with self._trainer_lock(restaurant_uid):
+            if entry["synced_through"] >= closed_through:
+                return entry["engine"]
+            engine = entry["engine"]
+            days = load_days_since(date.fromordinal(engine.last_ordinal + 1))
+            if days:
+                # The event calendar is shared, read-only state; everything else is copied
+                engine = copy.deepcopy(engine, {id(engine.calendar): engine.calendar})
+                for day_summary in days:
+                    engine.update(day_summary)
+            with self._lock:
+                entry["engine"] = engine
+                entry["synced_through"] = closed_through
+            return engine
+
+    def _is_fresh(self, restaurant_uid: str, entry: Dict[str, Any]) -> bool:
+        if entry["version"] != self._data_versions.get(restaurant_uid, 0):
+            return False
+        if self.ttl_seconds and time.monotonic() - entry["trained_at"] > self.ttl_seconds:
+            return False
+        return True
@@ -0,0 +1,92 @@
+"""
+Forkast Forecast Reconciliation
+Makes a total forecast and its parts add up (bottom-up, top-down, MinT)
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+METHODS = ("bottom_up", "top_down", "mint")
+
+
+def reconcile(
+    top: np.ndarray,
+    bottom: np.ndarray,
+    method: str = "mint",
+    top_var: Optional[np.ndarray] = None,
+    bottom_var: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reconcile a two-level hierarchy for every day at once
+
+    The hierarchy is one total whose m children should sum to it, with
+    summing matrix S = [1'; I]. MinT here is the weighted least squares
+    estimator with diagonal W = diag(top_var, bottom_var):
+        y~ = S (S' W^-1 S)^-1 S' W^-1 y^
+    which for this S reduces (Sherman-Morrison) to spreading the
+    incoherence d = top - sum(bottom) in proportion to each node's variance:
+        bottom~ = bottom + bottom_var / (top_var + sum(bottom_var)) * d
+    so no m x m system is ever solved.
+
+    Args:
+        top: (days,) total forecasts
+        bottom: (m x days) child forecasts
+        method: "bottom_up", "top_down" (children scaled by their forecast
+            proportions) or "mint"
+        top_var, bottom_var: Forecast error variances, shaped like top and
+            bottom; MinT defaults to variance proportional to the forecast
+
+    Returns:
+        (top, bottom) with bottom.sum(axis=0) == top
+    """
+    top = np.asarray(top, dtype=np.float64)
+    bottom = np.asarray(bottom, dtype=np.float64)
+    bottom_sum = bottom.sum(axis=0)
+
+    if method == "bottom_up":
+        return bottom_sum, bottom
+
+    if method == "top_down":
+        shares = _shares(bottom, bottom_sum)
+        return top, shares * top
+
+    if method != "mint":
+        raise ValueError(f"Unknown reconciliation method: {method} (expected one of {METHODS})")
+
+    if bottom_var is None:
+        bottom_var = np.maximum(bottom, 1e-9)
+    if top_var is None:
+        top_var = np.maximum(top, 1e-9)
+    total_var = top_var + bottom_var.sum(axis=0)
+    gap = top - bottom_sum
+    reconciled = bottom + bottom_var / total_var * gap
+
+    # Negative children aren't meaningful; clip and rescale to the reconciled total
+    new_top = top - top_var / total_var * gap
+    if (reconciled < 0).any():
+        reconciled = np.maximum(reconciled, 0)
+        reconciled = _shares(reconciled, reconciled.sum(axis=0)) * new_top
+    return new_top, reconciled
+
+
+def _shares(bottom: np.ndarray, bottom_sum: np.ndarray) -> np.ndarray:
+    """Each child's share of its column total; equal shares where the total is 0"""
+    equal = np.full_like(bottom, 1.0 / max(len(bottom), 1))
+    return np.divide(bottom, bottom_sum, out=equal, where=bottom_sum > 0)
+
+
+def round_preserving_sum(values: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """
+    Round each row of values to integers adding up to that row's total
+
+    Floors everything, then gives the remaining units to the largest
+    remainders (largest-remainder rounding).
+
+    Args:
+        values: (rows x cols) non-negative floats
+        totals: (rows,) integer targets, normally rint(values.sum(axis=1))
+    """
+    floors = np.floor(values)
+    short = (np.asarray(totals) - floors.sum(axis=1)).astype(np.int64)
+    rank = np.argsort(np.argsort(floors - values, axis=1, kind="stable"), axis=1)
+    return (floors + (rank < short[:, None])).astype(np.int64)
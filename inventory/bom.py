@@ -0,0 +1,210 @@
+"""
+Forkast Bill of Materials
+Expands item forecasts into daily prep and ingredient requirements
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from forecasting.history import DailyHistory
+from forecasting.item_forecast import ItemForecastGrid
+from models.core import MenuItem
+
+# Quantity of a listed ingredient per portion when no recipe gives one
+DEFAULT_PORTION = 1.0
+
+
+class PrepSheet:
+    """
+    One site's daily kitchen requirements.
+
+    prep is (items x days) portions to prepare, aligned with item_names;
+    ingredients is (ingredients x days) quantities, aligned with
+    ingredient_names. Items forecast without a menu entry are listed in
+    unmatched_items and contribute no ingredients.
+    """
+
+    def __init__(
+        self,
+        dates: List[date],
+        item_names: List[str],
+        prep: np.ndarray,
+        ingredient_names: List[str],
+        ingredients: np.ndarray,
+        unmatched_items: List[str],
+    ):
+        self.dates = dates
+        self.item_names = item_names
+        self.prep = prep
+        self.ingredient_names = ingredient_names
+        self.ingredients = ingredients
+        self.unmatched_items = unmatched_items
+
+    def ingredient_totals(self) -> Dict[str, float]:
+        """Total quantity per ingredient over the horizon"""
+        return dict(zip(self.ingredient_names, np.round(self.ingredients.sum(axis=1), 3).tolist()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        def rows(key: str, names: List[str], values: np.ndarray):
+            return [
+                {key: name, "daily": daily, "total": round(sum(daily), 3)}
+                for name, daily in zip(names, np.round(values, 3).tolist())
+                if any(daily)
+            ]
+
+        return {
+            "dates": [d.isoformat() for d in self.dates],
+            "prep": rows("item", self.item_names, self.prep),
+            "ingredients": rows("ingredient", self.ingredient_names, self.ingredients),
+            "unmatched_items": self.unmatched_items,
+        }
+
+
+class BillOfMaterials:
+    """
+    Sparse (site, menu item) -> ingredient quantity matrix.
+
+    Compiled once from the sites' menus into column-sorted triplets, so
+    expanding forecasts is one gather of the forecast rows, one multiply by
+    the per-portion quantities and one segmented sum per ingredient -- for
+    all sites and days together, with no dense items x ingredients matrix.
+    """
+
+    def __init__(
+        self,
+        item_keys: List[Tuple[str, str]],
+        ingredient_names: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        quantities: np.ndarray,
+    ):
+        order = np.lexsort((rows, cols))
+        self.item_keys = item_keys
+        self.ingredient_names = ingredient_names
+        self.rows = rows[order]
+        self.cols = cols[order]
+        self.quantities = quantities[order]
+        self._item_index = {key: row for row, key in enumerate(item_keys)}
+        self._site_rows: Dict[str, List[int]] = {}
+        for row, (site, _) in enumerate(item_keys):
+            self._site_rows.setdefault(site, []).append(row)
+        # Start of each ingredient's run of entries, for np.add.reduceat
+        self._col_ids, self._col_starts = np.unique(self.cols, return_index=True)
+
+    @classmethod
+    def compile(
+        cls,
+        menus: Mapping[str, Iterable[MenuItem]],
+        recipes: Optional[Mapping[str, Mapping[str, float]]] = None,
+    ) -> "BillOfMaterials":
+        """
+        Build the matrix from each site's menu
+
+        Args:
+            menus: Site (restaurant uid) -> menu items; anything with name and
+                ingredients attributes works, including MenuItemDB rows
+            recipes: Optional item name -> {ingredient: quantity per portion};
+                listed ingredients without one count DEFAULT_PORTION
+
+        Returns:
+            BillOfMaterials covering every active item on every menu
+        """
+        recipes = recipes or {}
+        item_keys: List[Tuple[str, str]] = []
+        ingredient_index: Dict[str, int] = {}
+        rows, cols, quantities = [], [], []
+        for site, menu in menus.items():
+            for item in menu:
+                if not getattr(item, "is_active", True):
+                    continue
+                row = len(item_keys)
+                item_keys.append((site, item.name))
+                recipe = recipes.get(item.name, {})
+                for ingredient in item.ingredients or []:
+                    rows.append(row)
+                    cols.append(ingredient_index.setdefault(ingredient, len(ingredient_index)))
+                    quantities.append(float(recipe.get(ingredient, DEFAULT_PORTION)))
+
+        return cls(
+            item_keys,
+            list(ingredient_index),
+            np.array(rows, dtype=np.int64),
+            np.array(cols, dtype=np.int64),
+            np.array(quantities, dtype=np.float64),
+        )
+
+    def expand(self, quantities: np.ndarray) -> np.ndarray:
+        """
+        Ingredient requirements for item quantities
+
+        Args:
+            quantities: (len(item_keys) x columns) portions per item, any
+                number of columns (days, or days of several sites side by side)
+
+        Returns:
+            (len(ingredient_names) x columns) ingredient quantities
+        """
+        out = np.zeros((len(self.ingredient_names), quantities.shape[1]))
+        if len(self.rows):
+            contributions = quantities[self.rows] * self.quantities[:, None]
+            out[self._col_ids] = np.add.reduceat(contributions, self._col_starts, axis=0)
+        return out
+
+    def prep_sheets(self, grids: Mapping[str, ItemForecastGrid]) -> Dict[str, PrepSheet]:
+        """
+        Expand every site's item forecast in one pass
+
+        Args:
+            grids: Site -> its forecast_items() grid
+
+        Returns:
+            Site -> PrepSheet
+        """
+        widths = [len(grid.dates) for grid in grids.values()]
+        offsets = np.concatenate(([0], np.cumsum(widths)))
+        stacked = np.zeros((len(self.item_keys), offsets[-1]))
+        unmatched: Dict[str, List[str]] = {}
+        for (site, grid), start, stop in zip(grids.items(), offsets[:-1], offsets[1:]):
+            unmatched[site] = self._place(site, grid.item_names, grid.quantities, stacked[:, start:stop])
+
+        required = self.expand(stacked)
+
+        sheets = {}
+        for (site, grid), start, stop in zip(grids.items(), offsets[:-1], offsets[1:]):
+            site_rows = self._site_rows.get(site, [])
+            sheets[site] = PrepSheet(
+                dates=grid.dates,
+                item_names=[self.item_keys[row][1] for row in site_rows],
+                prep=stacked[site_rows, start:stop],
+                ingredient_names=self.ingredient_names,
+                ingredients=required[:, start:stop],
+                unmatched_items=unmatched[site],
+            )
+        return sheets
+
+    def daily_baseline(self, site: str, history: DailyHistory) -> np.ndarray:
+        """
+        Mean daily ingredient quantity over a site's sales history
+
+        Returns:
+            (len(ingredient_names),) array, for scaling forecast requirements
+            against observed usage
+        """
+        if len(history) == 0:
+            return np.zeros(len(self.ingredient_names))
+        sold = np.zeros((len(self.item_keys), len(history)))
+        self._place(site, history.item_names, np.nan_to_num(history.item_qty).T, sold)
+        return self.expand(sold).mean(axis=1)
+
+    def _place(self, site: str, item_names: List[str], quantities: np.ndarray, out: np.ndarray) -> List[str]:
+        """Copy a site's (items x columns) quantities into out's BOM rows; returns the unknown items"""
+        rows = np.array([self._item_index.get((site, name), -1) for name in item_names], dtype=np.int64)
+        known = rows >= 0
+        out[rows[known]] = quantities[known]
+        return [name for name, ok in zip(item_names, known) if not ok]
@@ -0,0 +1,141 @@
+"""
+Forkast Lot Index
+In-memory expiry and first-in first-out heaps over a restaurant's inventory lots
+"""
+import heapq
+import itertools
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.core import InventoryLot
+
+# Heap key for lots without an expiry date
+_NEVER = date.max.toordinal()
+
+
+def _expiry_key(lot: InventoryLot) -> int:
+    return lot.expiry_date.toordinal() if lot.expiry_date else _NEVER
+
+
+class LotIndex:
+    """
+    A restaurant's lots, indexed by expiry and by receipt order per item.
+
+    One min-heap keyed by expiry date holds every lot, and each item has a
+    heap keyed by received date for first-in first-out use. Adding a lot,
+    and using up or expiring one, costs O(log n); listing what expires in
+    the next N days only visits heap entries inside the window. A lot
+    removed through one heap is dropped from the other lazily, and both are
+    rebuilt once dead entries outnumber live lots.
+    """
+
+    def __init__(self, lots: Iterable[InventoryLot] = ()):
+        self._seq = itertools.count()
+        self._live: Dict[str, InventoryLot] = {}
+        self._by_expiry: List[Tuple[int, int, str]] = []
+        self._by_received: Dict[str, List[Tuple[int, int, int, str]]] = {}
+        self._on_hand: Dict[str, float] = {}
+        self._dead = 0
+        for lot in lots:
+            self.add(lot)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def add(self, lot: InventoryLot):
+        if lot.quantity <= 0:
+            return
+        seq = next(self._seq)
+        self._live[lot.uid] = lot
+        heapq.heappush(self._by_expiry, (_expiry_key(lot), seq, lot.uid))
+        heapq.heappush(
+            self._by_received.setdefault(lot.item_uid, []),
+            (lot.received_date.toordinal(), _expiry_key(lot), seq, lot.uid),
+        )
+        self._on_hand[lot.item_uid] = self._on_hand.get(lot.item_uid, 0.0) + lot.quantity
+
+    def on_hand(self, item_uid: str) -> float:
+        return self._on_hand.get(item_uid, 0.0)
+
+    def lots(self, item_uid: str) -> List[InventoryLot]:
+        """An item's lots in the order they will be used"""
+        return [self._live[uid] for *_, uid in sorted(self._by_received.get(item_uid, [])) if uid in self._live]
+
+    def consume(self, item_uid: str, quantity: float) -> Tuple[List[Tuple[InventoryLot, float]], float]:
+        """
+        Use an item's stock oldest lot first
+
+        Returns:
+            ([(lot, quantity taken from it)], quantity no lot could cover);
+            lots left at zero are removed from the index
+        """
+        heap = self._by_received.get(item_uid, [])
+        taken = []
+        while quantity > 1e-9 and heap:
+            lot = self._live.get(heap[0][-1])
+            if lot is None:
+                heapq.heappop(heap)
+                self._dead -= 1
+                continue
+            used = min(lot.quantity, quantity)
+            lot.quantity -= used
+            quantity -= used
+            self._on_hand[item_uid] -= used
+            taken.append((lot, used))
+            if lot.quantity <= 1e-9:
+                heapq.heappop(heap)
+                self._drop(lot)
+        self._maybe_compact()
+        return taken, max(quantity, 0.0)
+
+    def expire(self, today: date) -> List[InventoryLot]:
+        """Remove and return every lot whose expiry date is today or earlier"""
+        expired = []
+        while self._by_expiry and self._by_expiry[0][0] <= today.toordinal():
+            uid = heapq.heappop(self._by_expiry)[-1]
+            lot = self._live.get(uid)
+            if lot is None:
+                self._dead -= 1
+                continue
+            self._on_hand[lot.item_uid] -= lot.quantity
+            self._drop(lot)
+            expired.append(lot)
+        self._maybe_compact()
+        return expired
+
+    def expiring_within(self, days: int, today: date) -> List[InventoryLot]:
+        """Lots expiring in the next days days (including overdue ones), soonest first"""
+        heap = self._by_expiry
+        limit = (today + timedelta(days=days)).toordinal()
+        found = []
+        # A heap node's children are never smaller, so subtrees past the limit are skipped
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            if heap[i][0] > limit:
+                continue
+            lot = self._live.get(heap[i][-1])
+            if lot is not None:
+                found.append((heap[i][0], heap[i][1], lot))
+            stack.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(heap))
+        return [lot for *_, lot in sorted(found, key=lambda f: f[:2])]
+
+    def _drop(self, lot: InventoryLot):
+        """Forget a lot; its entry in the other heap is now dead"""
+        del self._live[lot.uid]
+        self._dead += 1
+
+    def _maybe_compact(self):
+        if self._dead <= max(len(self._live), 32):
+            return
+        self._by_expiry = [e for e in self._by_expiry if e[-1] in self._live]
+        heapq.heapify(self._by_expiry)
+        for item_uid, heap in self._by_received.items():
+            heap[:] = [e for e in heap if e[-1] in self._live]
+            heapq.heapify(heap)
+        self._dead = 0
@@ -2,21 +2,54 @@
 Forkast Inventory Optimizer
 AI-driven inventory management and procurement automation
 """
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+from datetime import date, datetime, timedelta
 import math
 import sys
 from pathlib import Path
 
+import numpy as np
+
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from forecasting.demand_engine import QUANTILE_LEVELS, DemandForecastEngine
+from inventory.bom import BillOfMaterials
+from inventory.perishables import shelf_life_caps
+from inventory.policy import SERVICE_LEVEL, solve_policies
+from procurement.assignment import ORDER_COST, assign_suppliers
+from suppliers.index import SupplierIndex
 from models.core import (
-    InventoryItem, Supplier, ProcurementOrder, Alert,
-    AlertSeverity, IngredientCategory
+    InventoryItem, InventoryLot, Supplier, ProcurementOrder, Alert,
+    AlertSeverity, IngredientCategory, MenuItem
 )
 
 
+def _name_words(name: str) -> List[str]:
+    return name.lower().replace("_", " ").split()
+
+
+def _words_match(a: str, b: str) -> bool:
+    """Same word up to a plural ending (tomato/tomatoes, spice/spices)"""
+    short, long = sorted((a, b), key=len)
+    return len(short) >= 3 and long.startswith(short) and len(long) - len(short) <= 2
+
+
+def _match_ingredients(inventory: List[InventoryItem], ingredient_names: List[str]) -> np.ndarray:
+    """
+    (inventory x ingredients) 0/1 matrix: an ingredient feeds an inventory
+    item when every word of its name matches a word of the item's name
+    ("sea_bass" -> "Sea Bass Fillet", "tomato" -> "Tomatoes")
+    """
+    match = np.zeros((len(inventory), len(ingredient_names)))
+    for row, item in enumerate(inventory):
+        item_words = _name_words(item.name)
+        for col, ingredient in enumerate(ingredient_names):
+            if all(any(_words_match(w, iw) for iw in item_words) for w in _name_words(ingredient)):
+                match[row, col] = 1.0
+    return match
+
+
 class InventoryOptimizer:
     """Optimizes inventory levels and generates procurement recommendations"""
 
@@ -64,84 +97,368 @@ class InventoryOptimizer:
             "health_score": score
         }
 
-    def generate_reorder_recommendations(self, inventory: List[InventoryItem], days_ahead: int = 7) -> List[Dict[str, Any]]:
+    def generate_reorder_recommendations(
+        self,
+        inventory: List[InventoryItem],
+        days_ahead: int = 7,
+        usage_forecast: Optional[Dict[str, Sequence[float]]] = None,
+        start_date: Optional[date] = None,
+        suppliers: Optional[Union[List[Supplier], SupplierIndex]] = None,
+        service_level: float = SERVICE_LEVEL,
+        error_quantiles: Optional[Tuple[Sequence[float], Sequence[float]]] = None,
+        perishable: bool = False,
+        lots: Optional[Dict[str, List[InventoryLot]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Reorder quantities covering the next days_ahead days
+
+        Every item is projected at its flat daily_usage_avg unless
+        usage_forecast has a daily usage vector for its uid (see
+        forecast_usage), which then sets both the projected usage and the
+        safety stock. All items' stock is run down their cumulative usage
+        together to find when each runs out.
+
+        Safety stock is safety_stock_multiplier days of usage, unless
+        suppliers are given: then each item gets an (s, S) policy from its
+        supplier's lead time and fill rate at the target service level (see
+        compute_policies) and is ordered up to S.
+
+        With perishable, orders are capped by shelf life: stock on hand
+        (the item's lots, and any stock they don't account for expiring
+        shelf_life_days after last_restock) and the new lot are used
+        first-in first-out against the projected usage, and an order is
+        never larger than what gets used before it expires.
+
+        Args:
+            inventory: Items to plan for
+            days_ahead: Days the order has to cover
+            usage_forecast: Optional inventory uid -> daily usage from start_date
+            start_date: First day of usage (defaults to tomorrow, like the forecasts)
+            suppliers: Optional suppliers (or SupplierIndex), to plan per-item policies
+            service_level: Target service level of the policies
+            error_quantiles: Optional (levels, relative errors) of one-day
+                forecasts (see forecast_error_quantiles) for the policies
+            perishable: Cap quantities by shelf life
+            lots: Optional inventory uid -> lots on hand, oldest first
+
+        Returns:
+            Recommendations with projected usage, order quantity, cost,
+            priority, days remaining and stockout date, most urgent first;
+            with suppliers also reorder point, order-up-to level and lead
+            time; with perishable also the shelf-life cap and on-hand stock
+            expected to expire
+        """
+        if not inventory:
+            return []
+        start_date = start_date or date.today() + timedelta(days=1)
+        stock = np.array([i.current_stock for i in inventory], dtype=np.float64)
+        usage = np.repeat(np.array([i.daily_usage_avg for i in inventory], dtype=np.float64)[:, None], days_ahead, axis=1)
+        for row, item in enumerate(inventory):
+            vector = usage_forecast.get(item.uid) if usage_forecast else None
+            if vector is not None:
+                vector = np.asarray(vector, dtype=np.float64)[:days_ahead]
+                usage[row, :len(vector)] = vector
+
+        cumulative = np.cumsum(usage, axis=1)
+        projected_usage = cumulative[:, -1]
+        daily_rate = projected_usage / days_ahead
+        if suppliers is not None:
+            lead_time, fill_rate = self._supplier_terms(inventory, suppliers)
+            policies = solve_policies(
+                daily_rate, lead_time, fill_rate, projected_usage, service_level,
+                error_quantiles=error_quantiles,
+            )
+            policies["lead_time_days"] = lead_time
+            order_qty = (policies["order_up_to"] - stock) * policies["order_multiplier"]
+        else:
+            lead_time = np.ones(len(inventory))
+            policies = None
+            safety_stock = daily_rate * self.safety_stock_multiplier
+            order_qty = projected_usage + safety_stock - stock
+        days_remaining = self._days_remaining(stock, usage, cumulative, daily_rate)
+        if perishable:
+            caps, expiring = self._shelf_life_caps(inventory, stock, usage, lead_time, start_date, lots)
+
         recommendations = []
-        for item in inventory:
-            projected_usage = item.daily_usage_avg * days_ahead
-            safety_stock = item.daily_usage_avg * self.safety_stock_multiplier
-            order_qty = projected_usage + safety_stock - item.current_stock
-
-            if order_qty > 0:
-                if item.stock_status == "out_of_stock":
-                    priority = "critical"
-                elif item.stock_status == "low":
-                    priority = "high"
-                elif item.days_remaining < days_ahead:
-                    priority = "medium"
-                else:
-                    priority = "low"
-
-                recommendations.append({
-                    "item_name": item.name,
-                    "item_uid": item.uid,
-                    "category": item.category.value,
-                    "current_stock": item.current_stock,
-                    "unit": item.unit,
-                    "projected_usage": round(projected_usage, 1),
-                    "order_quantity": round(max(order_qty, item.min_stock), 1),
-                    "estimated_cost": round(max(order_qty, item.min_stock) * item.unit_cost, 2),
-                    "priority": priority,
-                    "days_remaining": round(item.days_remaining, 1),
-                    "supplier_uid": item.supplier_uid
-                })
+        for row in np.nonzero(order_qty > 0)[0]:
+            item = inventory[row]
+            remaining = float(days_remaining[row])
+            below_reorder_point = policies is not None and stock[row] <= policies["reorder_point"][row]
+            if item.stock_status == "out_of_stock":
+                priority = "critical"
+            elif item.stock_status == "low" or below_reorder_point:
+                priority = "high"
+            elif remaining < days_ahead:
+                priority = "medium"
+            else:
+                priority = "low"
+
+            quantity = max(float(order_qty[row]), item.min_stock)
+            if perishable:
+                quantity = min(quantity, float(caps[row]))
+                if quantity <= 0:
+                    continue
+            rec = {
+                "item_name": item.name,
+                "item_uid": item.uid,
+                "category": item.category.value,
+                "current_stock": item.current_stock,
+                "unit": item.unit,
+                "projected_usage": round(float(projected_usage[row]), 1),
+                "order_quantity": round(quantity, 1),
+                "estimated_cost": round(quantity * item.unit_cost, 2),
+                "priority": priority,
+                "days_remaining": round(remaining, 1),
+                "stockout_date": (
+                    (start_date + timedelta(days=int(remaining))).isoformat()
+                    if math.isfinite(remaining) else None
+                ),
+                "supplier_uid": item.supplier_uid
+            }
+            if policies is not None:
+                rec["reorder_point"] = round(float(policies["reorder_point"][row]), 1)
+                rec["order_up_to"] = round(float(policies["order_up_to"][row]), 1)
+                rec["lead_time_days"] = float(policies["lead_time_days"][row])
+            if perishable:
+                rec["shelf_life_cap"] = round(float(caps[row]), 1) if math.isfinite(caps[row]) else None
+                rec["expiring_stock"] = round(float(expiring[row]), 1)
+            recommendations.append(rec)
 
         priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
         recommendations.sort(key=lambda x: priority_order.get(x['priority'], 4))
         return recommendations
 
-    def generate_procurement_draft(self, recommendations: List[Dict[str, Any]], suppliers: List[Supplier]) -> List[ProcurementOrder]:
-        supplier_items = {}
-        for rec in recommendations:
-            if rec['priority'] in ['critical', 'high', 'medium']:
-                cat = rec['category']
-                best_supplier = None
-                best_score = -1
-                for supplier in suppliers:
-                    cat_match = any(c.value == cat for c in supplier.categories)
-                    if cat_match and supplier.is_active:
-                        score = supplier.reliability_score * 0.5 + supplier.avg_fill_rate * 0.3 + (1 / max(supplier.lead_time_days, 0.5)) * 0.2
-                        if score > best_score:
-                            best_score = score
-                            best_supplier = supplier
-                if best_supplier:
-                    if best_supplier.uid not in supplier_items:
-                        supplier_items[best_supplier.uid] = {"supplier": best_supplier, "items": []}
-                    supplier_items[best_supplier.uid]["items"].append(rec)
+    def compute_policies(
+        self,
+        inventory: List[InventoryItem],
+        suppliers: Union[List[Supplier], SupplierIndex],
+        review_days: int = 7,
+        service_level: float = SERVICE_LEVEL,
+        error_quantiles: Optional[Tuple[Sequence[float], Sequence[float]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        (s, S) policy for every item from its daily usage and supplier terms
+
+        Args:
+            inventory: Items to plan for
+            suppliers: Suppliers or a SupplierIndex; an item uses its own
+                supplier, else the best-scored active supplier of its category
+            review_days: Days one order has to last
+            service_level: Target probability of not running out before delivery
+            error_quantiles: Optional (levels, relative errors) of one-day forecasts
+
+        Returns:
+            Per item: lead time, fill rate, safety stock, reorder point and
+            order-up-to level, and whether current stock is at or below s
+        """
+        if not inventory:
+            return []
+        mean_daily = np.array([i.daily_usage_avg for i in inventory], dtype=np.float64)
+        stock = np.array([i.current_stock for i in inventory], dtype=np.float64)
+        lead_time, fill_rate = self._supplier_terms(inventory, suppliers)
+        policies = solve_policies(
+            mean_daily, lead_time, fill_rate, mean_daily * review_days, service_level,
+            error_quantiles=error_quantiles,
+        )
+        reorder = stock <= policies["reorder_point"]
+        columns = zip(
+            lead_time.tolist(), fill_rate.tolist(),
+            np.round(policies["safety_stock"], 1).tolist(),
+            np.round(policies["reorder_point"], 1).tolist(),
+            np.round(policies["order_up_to"], 1).tolist(),
+            reorder.tolist(),
+        )
+        return [
+            {
+                "item_name": item.name,
+                "item_uid": item.uid,
+                "lead_time_days": lead,
+                "fill_rate": fill,
+                "safety_stock": safety,
+                "reorder_point": s_level,
+                "order_up_to": big_s,
+                "reorder_now": due,
+            }
+            for item, (lead, fill, safety, s_level, big_s, due) in zip(inventory, columns)
+        ]
+
+    @staticmethod
+    def forecast_error_quantiles(engine: DemandForecastEngine) -> Optional[Tuple[Sequence[float], np.ndarray]]:
+        """The engine's relative error quantiles one day ahead, if it has enough backtest residuals"""
+        errors = engine.pooled_quantiles[0]
+        if np.isnan(errors).any():
+            return None
+        return QUANTILE_LEVELS, errors
+
+    @staticmethod
+    def _supplier_terms(
+        inventory: List[InventoryItem], suppliers: Union[List[Supplier], SupplierIndex]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Lead time and fill rate per item: its own supplier, else its category's best-scored active one"""
+        index = SupplierIndex.of(suppliers)
+        lead_time = np.ones(len(inventory))
+        fill_rate = np.ones(len(inventory))
+        for row, item in enumerate(inventory):
+            supplier = index.active(item.supplier_uid) or index.best(item.category.value)
+            if supplier is not None:
+                lead_time[row] = supplier.lead_time_days
+                fill_rate[row] = supplier.avg_fill_rate
+        return lead_time, fill_rate
+
+    @staticmethod
+    def _shelf_life_caps(
+        inventory: List[InventoryItem],
+        stock: np.ndarray,
+        usage: np.ndarray,
+        lead_time: np.ndarray,
+        start_date: date,
+        lots: Optional[Dict[str, List[InventoryLot]]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Shelf-life order caps and expiring on-hand stock, with day 0 = start_date"""
+        today = start_date - timedelta(days=1)
+        lots = lots or {}
+        shelf_life = np.array([i.shelf_life_days for i in inventory], dtype=np.int64)
+        stock_lots = []
+        for row, item in enumerate(inventory):
+            item_lots = [
+                (lot.quantity, (lot.expiry_date - start_date).days if lot.expiry_date else math.inf)
+                for lot in lots.get(item.uid, [])
+            ]
+            # Stock not booked in as lots is treated as one lot from the last restock. LotQueue
+            # only expires from its head, so lots go in expiry order (ties: untracked first)
+            untracked = stock[row] - sum(qty for qty, _ in item_lots)
+            if untracked > 1e-9:
+                received = (item.last_restock.date() if item.last_restock else today) - start_date
+                item_lots.insert(0, (untracked, received.days + shelf_life[row]))
+            item_lots.sort(key=lambda lot: lot[1])
+            stock_lots.append(item_lots)
+        # Ordered today, a lot arrives lead_time days later: tomorrow (day 0) for up to a day
+        arrival = np.maximum(np.ceil(lead_time) - 1, 0).astype(np.int64)
+        return shelf_life_caps(stock_lots, usage, arrival, shelf_life)
+
+    @staticmethod
+    def _days_remaining(
+        stock: np.ndarray, usage: np.ndarray, cumulative: np.ndarray, daily_rate: np.ndarray
+    ) -> np.ndarray:
+        """
+        Fractional days until each item's stock runs out
+
+        Within the horizon: the first day cumulative usage passes the stock,
+        plus the fraction of that day's usage the remaining stock covers.
+        Past it, the horizon's average rate is extrapolated.
+        """
+        days = usage.shape[1]
+        stock = np.maximum(stock, 0.0)
+        runs_out = cumulative > stock[:, None]
+        within = runs_out.any(axis=1)
+        first = runs_out.argmax(axis=1)
+        rows = np.arange(len(stock))
+        used_before = np.where(first > 0, cumulative[rows, first - 1], 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inside = first + (stock - used_before) / usage[rows, first]
+            beyond = np.where(daily_rate > 0, days + (stock - cumulative[:, -1]) / daily_rate, np.inf)
+        return np.where(within, inside, beyond)
+
+    def forecast_usage(
+        self,
+        inventory: List[InventoryItem],
+        menu: Optional[List[MenuItem]],
+        engine: DemandForecastEngine,
+        days_ahead: int = 7,
+        bom: Optional[BillOfMaterials] = None,
+        site: str = "",
+    ) -> Dict[str, np.ndarray]:
+        """
+        Daily usage per inventory item from a trained engine's item forecast
+
+        The menu's bill of materials turns forecast portions into ingredient
+        requirements. Menu ingredients carry no quantities, so each inventory
+        item follows the daily shape of the ingredients matched to it by name,
+        scaled so an average day of the sales history uses its
+        daily_usage_avg. Items matching no ingredient are left out and keep
+        the flat average.
+
+        Args:
+            inventory: Items to plan for
+            menu: Menu to compile, when no bom is given
+            engine: Trained engine
+            days_ahead: Days to forecast
+            bom: Optional precompiled bill of materials, used instead of menu
+            site: The engine's site in bom
+
+        Returns:
+            Inventory uid -> usage for each of the days_ahead days from tomorrow
+        """
+        if bom is None:
+            bom = BillOfMaterials.compile({site: menu})
+        sheet = bom.prep_sheets({site: engine.forecast_items(days_ahead)})[site]
+        baseline = bom.daily_baseline(site, engine.history)
+
+        match = _match_ingredients(inventory, sheet.ingredient_names)
+        forecast = match @ sheet.ingredients
+        base = match @ baseline
+        avg = np.array([i.daily_usage_avg for i in inventory], dtype=np.float64)
+        scale = np.divide(avg, base, out=np.zeros_like(avg), where=base > 0)
+        usage = forecast * scale[:, None]
+        return {inventory[row].uid: usage[row] for row in np.nonzero(base > 0)[0]}
+
+    def generate_procurement_draft(
+        self,
+        recommendations: List[Dict[str, Any]],
+        suppliers: Union[List[Supplier], SupplierIndex],
+        order_cost: float = ORDER_COST,
+    ) -> List[ProcurementOrder]:
+        """
+        Draft purchase orders for the critical, high and medium priority lines
+
+        Lines are split across suppliers by assign_suppliers: cheapest in
+        price and expected losses, respecting minimum order values, and
+        consolidated where one order beats several. Lines keep the unit
+        cost and value of their recommendation.
+
+        Returns:
+            One draft per supplier used, largest first
+        """
+        lines = [rec for rec in recommendations if rec['priority'] in ['critical', 'high', 'medium']]
+        index = SupplierIndex.of(suppliers)
+        if not lines or not len(index):
+            return []
+        assignment = assign_suppliers(
+            np.array([rec["estimated_cost"] for rec in lines], dtype=np.float64),
+            [rec["category"] for rec in lines],
+            np.array([rec["days_remaining"] for rec in lines], dtype=np.float64),
+            index,
+            order_cost=order_cost,
+        )
+
+        supplier_items: Dict[int, List[Dict[str, Any]]] = {}
+        for rec, col in zip(lines, assignment):
+            if col < 0:
+                continue
+            unit_cost = rec["estimated_cost"] / rec["order_quantity"] if rec["order_quantity"] > 0 else 0
+            supplier_items.setdefault(int(col), []).append({
+                "item_name": rec["item_name"],
+                "quantity": rec["order_quantity"],
+                "unit": rec["unit"],
+                "unit_cost": round(unit_cost, 4),
+                "total": rec["estimated_cost"]
+            })
 
         orders = []
-        for supplier_uid, data in supplier_items.items():
-            supplier = data["supplier"]
-            items = data["items"]
-            order_items = []
-            total_value = 0
-            for item in items:
-                order_items.append({
-                    "item_name": item["item_name"],
-                    "quantity": item["order_quantity"],
-                    "unit": item["unit"],
-                    "unit_cost": item["estimated_cost"] / item["order_quantity"] if item["order_quantity"] > 0 else 0,
-                    "total": item["estimated_cost"]
-                })
-                total_value += item["estimated_cost"]
-            order = ProcurementOrder(
-                supplier_uid=supplier_uid,
+        for col, order_items in supplier_items.items():
+            supplier = index.suppliers[col]
+            total_value = sum(item["total"] for item in order_items)
+            orders.append(ProcurementOrder(
+                supplier_uid=supplier.uid,
                 items=order_items,
                 total_value=round(total_value, 2),
                 expected_delivery=datetime.now() + timedelta(days=supplier.lead_time_days),
                 status="draft",
-                auto_generated=True
-            )
-            orders.append(order)
+                auto_generated=True,
+                min_order_shortfall=round(max(supplier.min_order_value - total_value, 0.0), 2),
+            ))
+        orders.sort(key=lambda order: -order.total_value)
         return orders
 
     def calculate_waste_metrics(self, inventory: List[InventoryItem]) -> Dict[str, Any]:
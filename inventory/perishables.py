@@ -0,0 +1,89 @@
+"""
+Forkast Perishables
+FIFO lot queues for sizing orders of short shelf-life stock
+"""
+from collections import deque
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class LotQueue:
+    """
+    One item's stock as lots used oldest first.
+
+    Lots are (quantity, expiry day) with days as plain numbers; receiving
+    lots in expiry order keeps the soonest-expiring lot at the front, so
+    usage and expiry only ever touch the head of the queue.
+    """
+
+    def __init__(self, lots: Sequence[Tuple[float, float]] = ()):
+        self._lots = deque([qty, expires] for qty, expires in lots if qty > 0)
+
+    @property
+    def on_hand(self) -> float:
+        return sum(qty for qty, _ in self._lots)
+
+    def receive(self, quantity: float, expires: float):
+        if quantity > 0:
+            self._lots.append([quantity, expires])
+
+    def expire(self, day: float) -> float:
+        """Drop lots expiring on or before day; returns the quantity wasted"""
+        wasted = 0.0
+        while self._lots and self._lots[0][1] <= day:
+            wasted += self._lots.popleft()[0]
+        return wasted
+
+    def consume(self, quantity: float) -> float:
+        """Use stock oldest first; returns the quantity that couldn't be covered"""
+        while quantity > 0 and self._lots:
+            head = self._lots[0]
+            used = min(head[0], quantity)
+            head[0] -= used
+            quantity -= used
+            if head[0] <= 0:
+                self._lots.popleft()
+        return quantity
+
+
+def shelf_life_caps(
+    stock_lots: Sequence[Sequence[Tuple[float, float]]],
+    usage: np.ndarray,
+    arrival: np.ndarray,
+    shelf_life_days: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest order per item that is used up before it expires
+
+    Each item's lots on hand go through a FIFO lot queue fed the daily
+    usage. A lot arriving on the arrival day is drawn on only for what the
+    older lots can't cover, so the usage they leave uncovered between its
+    arrival and its expiry is the most that can be ordered without waste.
+    Items whose new lot outlives the usage window are uncapped (inf).
+
+    Args:
+        stock_lots: On-hand (quantity, expiry day index) lots per item, oldest first
+        usage: (items x days) daily usage, day 0 first
+        arrival: Day index the order arrives, per item
+        shelf_life_days: Shelf life per item
+
+    Returns:
+        (cap per item, on-hand stock expected to expire unused in the window)
+    """
+    days = usage.shape[1]
+    caps = np.full(len(stock_lots), np.inf)
+    expiring = np.zeros(len(stock_lots))
+    for row, lots in enumerate(stock_lots):
+        arrives = int(arrival[row])
+        expires = arrives + int(shelf_life_days[row])
+        queue = LotQueue(lots)
+        uncovered = 0.0
+        for day in range(days):
+            expiring[row] += queue.expire(day)
+            short = queue.consume(usage[row, day])
+            if arrives <= day < expires:
+                uncovered += short
+        if expires < days:
+            caps[row] = uncovered
+    return caps, expiring
@@ -0,0 +1,105 @@
+"""
+Forkast Inventory Policies
+Per-item (s, S) reorder levels from demand uncertainty, lead time and supplier fill rate
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Probability of not running out before a replenishment arrives
+SERVICE_LEVEL = 0.95
+# Daily demand std dev as a fraction of the mean when no forecast errors are known
+DEFAULT_DEMAND_CV = 0.25
+
+# Acklam's rational approximation to the inverse normal CDF (relative error < 1.2e-9)
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+_P_LOW = 0.02425
+
+
+def normal_quantile(p) -> np.ndarray:
+    """Standard normal quantile (inverse CDF) of each probability in p, 0 < p < 1"""
+    p = np.asarray(p, dtype=np.float64)
+    q = np.empty_like(p)
+
+    low = p < _P_LOW
+    high = p > 1 - _P_LOW
+    mid = ~(low | high)
+
+    r = p[mid] - 0.5
+    s = r * r
+    q[mid] = (
+        (((((_A[0] * s + _A[1]) * s + _A[2]) * s + _A[3]) * s + _A[4]) * s + _A[5]) * r
+        / (((((_B[0] * s + _B[1]) * s + _B[2]) * s + _B[3]) * s + _B[4]) * s + 1)
+    )
+    for mask, sign, tail in ((low, 1.0, p[low]), (high, -1.0, 1 - p[high])):
+        t = np.sqrt(-2 * np.log(tail))
+        q[mask] = sign * (
+            (((((_C[0] * t + _C[1]) * t + _C[2]) * t + _C[3]) * t + _C[4]) * t + _C[5])
+            / ((((_D[0] * t + _D[1]) * t + _D[2]) * t + _D[3]) * t + 1)
+        )
+    return q
+
+
+def solve_policies(
+    mean_daily: np.ndarray,
+    lead_time_days: np.ndarray,
+    fill_rate: np.ndarray,
+    review_demand: np.ndarray,
+    service_level=SERVICE_LEVEL,
+    demand_sd: Optional[np.ndarray] = None,
+    error_quantiles: Optional[Tuple[Sequence[float], Sequence[float]]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Reorder point s and order-up-to level S for every item at once
+
+    Safety stock covers demand uncertainty over the lead time at the target
+    service level, from the empirical distribution of relative forecast
+    errors when given (interpolated at the service level, within the table's
+    range), else a normal
+    quantile of the daily std dev; both scale with sqrt(lead time), treating
+    days as independent. s is lead-time demand plus safety stock and S adds
+    the review cycle's demand. Orders are grossed up by the supplier's fill
+    rate, since only that share of an order is delivered.
+
+    Args:
+        mean_daily: Expected daily usage per item
+        lead_time_days: Supplier lead time per item
+        fill_rate: Share of ordered quantity the supplier delivers, per item
+        review_demand: Usage one order has to last for (a review cycle), per item
+        service_level: Target service level, scalar or per item
+        demand_sd: Daily usage std dev per item (default DEFAULT_DEMAND_CV x mean)
+        error_quantiles: Optional (levels, relative errors) of one-day forecasts
+
+    Returns:
+        Arrays per item: safety_stock, reorder_point, order_up_to and
+        order_multiplier (1 / fill rate)
+    """
+    mean_daily = np.asarray(mean_daily, dtype=np.float64)
+    lead_time_days = np.maximum(np.asarray(lead_time_days, dtype=np.float64), 0.0)
+    service_level = np.broadcast_to(np.asarray(service_level, dtype=np.float64), mean_daily.shape)
+    spread = np.sqrt(lead_time_days)
+
+    if error_quantiles is not None:
+        levels, errors = error_quantiles
+        safety_stock = mean_daily * np.interp(service_level, levels, errors) * spread
+    else:
+        if demand_sd is None:
+            demand_sd = mean_daily * DEFAULT_DEMAND_CV
+        safety_stock = normal_quantile(service_level) * demand_sd * spread
+    safety_stock = np.maximum(safety_stock, 0.0)
+
+    reorder_point = mean_daily * lead_time_days + safety_stock
+    fill_rate = np.clip(np.asarray(fill_rate, dtype=np.float64), 0.05, 1.0)
+    return {
+        "safety_stock": safety_stock,
+        "reorder_point": reorder_point,
+        "order_up_to": reorder_point + np.asarray(review_demand, dtype=np.float64),
+        "order_multiplier": 1.0 / fill_rate,
+    }
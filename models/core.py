@@ -191,6 +191,25 @@ class InventoryItem:
         }
 
 
+@dataclass
+class InventoryLot:
+    """One received batch of an inventory item"""
+    uid: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    item_uid: str = ""
+    quantity: float = 0.0  # Remaining
+    received_date: date = field(default_factory=date.today)
+    expiry_date: Optional[date] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "uid": self.uid,
+            "item_uid": self.item_uid,
+            "quantity": round(self.quantity, 3),
+            "received_date": self.received_date.isoformat(),
+            "expiry_date": self.expiry_date.isoformat() if self.expiry_date else None,
+        }
+
+
 @dataclass
 class Supplier:
     """Supplier profile"""
@@ -259,6 +278,7 @@ class ProcurementOrder:
     total_value: float = 0.0
     status: str = "draft"  # draft, submitted, confirmed, delivered, cancelled
     auto_generated: bool = False
+    min_order_shortfall: float = 0.0  # value still needed to reach the supplier's minimum order
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -268,7 +288,8 @@ class ProcurementOrder:
             "items_count": len(self.items),
             "total_value": self.total_value,
             "status": self.status,
-            "auto_generated": self.auto_generated
+            "auto_generated": self.auto_generated,
+            "min_order_shortfall": self.min_order_shortfall
         }
 
 
@@ -331,11 +352,15 @@ class DemandForecast:
     predicted_revenue: float = 0.0
     confidence_lower: float = 0.0
     confidence_upper: float = 0.0
+    p10: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
     day_of_week: str = ""
     is_holiday: bool = False
     is_ramadan: bool = False
     weather_factor: float = 1.0
     channel_breakdown: Dict[str, float] = field(default_factory=dict)
+    components: Dict[str, Any] = field(default_factory=dict)  # Model, event and trend/DOW/month/event effects in covers
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -344,6 +369,9 @@ class DemandForecast:
             "predicted_revenue": self.predicted_revenue,
             "confidence_lower": self.confidence_lower,
             "confidence_upper": self.confidence_upper,
+            "p10": self.p10,
+            "p50": self.p50,
+            "p90": self.p90,
             "day_of_week": self.day_of_week,
             "is_holiday": self.is_holiday,
             "channels": self.channel_breakdown
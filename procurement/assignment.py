@@ -0,0 +1,254 @@
+"""
+Forkast Supplier Assignment
+Min-cost split of reorder lines across suppliers, with minimum orders and consolidation
+"""
+from typing import Dict, List, Sequence, Union
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.core import Supplier
+from suppliers.index import SupplierIndex
+
+# Ranking weight of a supplier tier in the assignment cost; not a price, line values are unchanged
+TIER_WEIGHT = {"premium": 1.10, "standard": 1.0, "economy": 0.92}
+# Fixed cost of placing one purchase order (delivery and handling), in currency units
+ORDER_COST = 50.0
+# Expected loss per unit of value for each point of unreliability (1 - reliability_score)
+UNRELIABILITY_COST = 0.5
+# Extra cost per unit of value when the supplier delivers after the item runs out
+LATE_COST = 0.25
+# Lines up to which the local search result is checked by exact branch and bound
+EXACT_MAX_LINES = 12
+# Search nodes the exact check may visit before keeping the best assignment found so far
+EXACT_MAX_NODES = 50_000
+
+
+def tier_weights(suppliers: Sequence[Supplier]) -> np.ndarray:
+    return np.array([TIER_WEIGHT.get(s.tier.value, 1.0) for s in suppliers], dtype=np.float64)
+
+
+def assign_suppliers(
+    values: np.ndarray,
+    categories: Sequence[str],
+    days_remaining: np.ndarray,
+    suppliers: Union[SupplierIndex, Sequence[Supplier]],
+    order_cost: float = ORDER_COST,
+    exact_max_lines: int = EXACT_MAX_LINES,
+) -> np.ndarray:
+    """
+    Supplier per line minimising the total cost of the purchase orders
+
+    A line costs its value weighted by the supplier's tier, plus expected
+    losses from unreliability and from delivery after the item's projected
+    stockout. Each supplier used adds order_cost, and an order whose value
+    is below the supplier's min_order_value is charged the minimum -- so
+    small orders are consolidated into fewer, larger ones where that is
+    cheaper.
+
+    Lines start at their cheapest supplier; local search then closes whole
+    orders (re-inserting their lines wherever is cheapest, including at
+    suppliers with no order yet), opens new ones and moves single lines
+    while the total drops. Every step is a vectorised pass over the lines x
+    candidates cost matrix over only the suppliers the SupplierIndex lists
+    for the lines' categories, so the rest of the network is never scored.
+    Up to exact_max_lines lines, a bounded branch and bound seeded with the
+    local search result then finds the exact optimum.
+
+    Args:
+        values: Reference value of each line (quantity x unit cost)
+        categories: Ingredient category of each line
+        days_remaining: Days until each line's item runs out
+        suppliers: SupplierIndex, or a supplier list to index
+        order_cost: Fixed cost per purchase order
+        exact_max_lines: Most lines the exact step runs for (0 disables it)
+
+    Returns:
+        Position in the index's suppliers per line, -1 where no active
+        supplier carries the category
+    """
+    index = SupplierIndex.of(suppliers)
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    assignment = np.full(n, -1, dtype=np.int64)
+    lines_by_category: Dict[str, List[int]] = {}
+    for row, category in enumerate(categories):
+        lines_by_category.setdefault(category, []).append(row)
+    # Only the suppliers carrying one of the lines' categories become columns
+    positions = np.unique(np.concatenate(
+        [index.columns(category) for category in lines_by_category] + [np.zeros(0, dtype=np.int64)]
+    ))
+    m = len(positions)
+    if n == 0 or m == 0:
+        return assignment
+    candidates = [index.suppliers[position] for position in positions]
+
+    weight = tier_weights(candidates)
+    reliability = np.array([s.reliability_score for s in candidates], dtype=np.float64)
+    lead_time = np.array([s.lead_time_days for s in candidates], dtype=np.float64)
+    minimum = np.array([s.min_order_value for s in candidates], dtype=np.float64)
+    unit_cost = weight * (1 + UNRELIABILITY_COST * (1 - np.clip(reliability, 0.0, 1.0)))
+
+    # spend[i, j]: line i's value towards supplier j's minimum order; cost is what the search minimises
+    spend = np.zeros((n, m))
+    cost = np.full((n, m), np.inf)
+    for category, rows in lines_by_category.items():
+        cols = np.searchsorted(positions, index.columns(category))
+        if not len(cols):
+            continue
+        block = np.ix_(rows, cols)
+        spend[block] = values[rows, None]
+        late = np.asarray(days_remaining, dtype=np.float64)[rows, None] < lead_time[cols]
+        cost[block] = values[rows, None] * (unit_cost[cols] + LATE_COST * late)
+
+    servable = np.isfinite(cost).any(axis=1)
+    rows = np.nonzero(servable)[0]
+    if not len(rows):
+        return assignment
+    spend, cost = spend[rows], cost[rows]
+    current = np.argmin(cost, axis=1)
+    line = np.arange(len(rows))
+
+    def order_costs(total_spend, counts, floor=minimum):
+        """Fixed cost plus the top-up to the minimum order, per supplier with lines"""
+        return np.where(counts > 0, order_cost + np.maximum(floor - total_spend, 0.0), 0.0)
+
+    def total(assigned: np.ndarray) -> float:
+        counts = np.bincount(assigned, minlength=m)
+        loads = np.bincount(assigned, weights=spend[line, assigned], minlength=m)
+        return float(cost[line, assigned].sum() + order_costs(loads, counts).sum())
+
+    def descend(assigned: np.ndarray) -> np.ndarray:
+        """Move single lines, including to suppliers with no order yet, until none helps"""
+        assigned = assigned.copy()
+        counts = np.bincount(assigned, minlength=m)
+        loads = np.bincount(assigned, weights=spend[line, assigned], minlength=m)
+        moved = True
+        while moved:
+            moved = False
+            for i in line:
+                a = assigned[i]
+                leave = (
+                    order_costs(loads[a] - spend[i, a], counts[a] - 1, minimum[a])
+                    - order_costs(loads[a], counts[a], minimum[a])
+                )
+                join = order_costs(loads + spend[i], counts + 1) - order_costs(loads, counts)
+                delta = cost[i] - cost[i, a] + join + leave
+                delta[a] = 0.0
+                b = int(np.argmin(delta))
+                if delta[b] < -1e-9:
+                    counts[a] -= 1
+                    loads[a] -= spend[i, a]
+                    counts[b] += 1
+                    loads[b] += spend[i, b]
+                    assigned[i] = b
+                    moved = True
+        return assigned
+
+    current = descend(current)
+    best = total(current)
+    improved = True
+    while improved:
+        improved = False
+        candidate, candidate_total = None, best
+
+        # Close an order: re-insert its lines, largest first, where each adds least,
+        # then let single moves settle the rest around the change
+        for col in np.unique(current):
+            trial = current.copy()
+            moving = np.nonzero(trial == col)[0]
+            trial[moving] = -1
+            kept = trial >= 0
+            counts = np.bincount(trial[kept], minlength=m)
+            loads = np.bincount(trial[kept], weights=spend[line[kept], trial[kept]], minlength=m)
+            for i in moving[np.argsort(-values[rows[moving]])]:
+                added = cost[i] + order_costs(loads + spend[i], counts + 1) - order_costs(loads, counts)
+                added[col] = np.inf
+                b = int(np.argmin(added))
+                if not np.isfinite(added[b]):
+                    break
+                trial[i] = b
+                counts[b] += 1
+                loads[b] += spend[i, b]
+            else:
+                trial = descend(trial)
+                trial_total = total(trial)
+                if trial_total < candidate_total - 1e-9:
+                    candidate, candidate_total = trial, trial_total
+
+        # Open an order: move to a new supplier the lines it is cheaper for, or all it carries
+        carries = np.isfinite(cost)
+        for col in np.setdiff1d(np.nonzero(carries.any(axis=0))[0], current):
+            for moving in (cost[:, col] < cost[line, current], carries[:, col]):
+                if not moving.any():
+                    continue
+                trial = np.where(moving, col, current)
+                trial_total = total(trial)
+                if trial_total < candidate_total - 1e-9:
+                    candidate, candidate_total = trial, trial_total
+
+        if candidate is not None:
+            current = descend(candidate)
+            best, improved = total(current), True
+
+    if len(rows) <= exact_max_lines:
+        current = _branch_and_bound(cost, spend, minimum, order_cost, current, best)
+    assignment[rows] = positions[current]
+    return assignment
+
+
+def _branch_and_bound(
+    cost: np.ndarray,
+    spend: np.ndarray,
+    minimum: np.ndarray,
+    order_cost: float,
+    incumbent: np.ndarray,
+    incumbent_total: float,
+) -> np.ndarray:
+    """
+    Exact assignment for a few lines, by depth-first search from incumbent
+
+    Partial assignments are pruned when their line costs, fixed order costs
+    and the cheapest cost of every remaining line already reach the best
+    total; top-ups to minimum orders only ever add, so the bound is valid.
+    Stops after EXACT_MAX_NODES nodes with the best assignment found.
+    """
+    n = len(cost)
+    order = np.argsort(-np.min(cost, axis=1))
+    options = [[int(j) for j in np.argsort(cost[i]) if np.isfinite(cost[i, j])] for i in order]
+    rest = np.concatenate((np.cumsum(np.min(cost, axis=1)[order][::-1])[::-1], [0.0]))
+    best, best_total = incumbent.copy(), incumbent_total
+    chosen = np.full(n, -1, dtype=np.int64)
+    counts: Dict[int, int] = {}
+    loads: Dict[int, float] = {}
+    nodes = 0
+
+    def search(depth: int, partial: float):
+        nonlocal best_total, nodes
+        nodes += 1
+        if nodes > EXACT_MAX_NODES or partial + rest[depth] >= best_total - 1e-9:
+            return
+        if depth == n:
+            full = partial + sum(max(minimum[j] - load, 0.0) for j, load in loads.items())
+            if full < best_total - 1e-9:
+                best_total = full
+                best[order] = chosen
+            return
+        i = order[depth]
+        for j in options[depth]:
+            opening = counts.get(j, 0) == 0
+            counts[j] = counts.get(j, 0) + 1
+            loads[j] = loads.get(j, 0.0) + spend[i, j]
+            chosen[depth] = j
+            search(depth + 1, partial + cost[i, j] + (order_cost if opening else 0.0))
+            counts[j] -= 1
+            loads[j] -= spend[i, j]
+            if opening:
+                del counts[j], loads[j]
+
+    search(0, 0.0)
+    return best
@@ -0,0 +1,120 @@
+"""
+Forkast Supplier Index
+Category -> active suppliers, pre-scored and kept sorted best first
+"""
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.core import Supplier
+
+
+def supplier_score(supplier: Supplier) -> float:
+    return supplier.reliability_score * 0.5 + supplier.avg_fill_rate * 0.3 + (1 / max(supplier.lead_time_days, 0.5)) * 0.2
+
+
+class SupplierIndex:
+    """
+    Inverted index from ingredient category to the active suppliers carrying it.
+
+    Each supplier is scored once when added. Every category keeps a list
+    sorted best score first, so the best supplier for an item is a
+    dictionary lookup and the head of a list. Registering or updating a
+    supplier only re-sorts the categories it appears in (a binary search
+    and one list insert each) instead of rebuilding the index.
+
+    Suppliers keep a fixed position in suppliers, which is what columns()
+    returns; an inactive or removed supplier keeps its position but is
+    dropped from every category.
+    """
+
+    def __init__(self, suppliers: Iterable[Supplier] = ()):
+        self.suppliers: List[Supplier] = []
+        self._position: Dict[str, int] = {}
+        # category -> [(-score, position)], ascending = best first
+        self._ranked: Dict[str, List[Tuple[float, int]]] = {}
+        self._keys: Dict[int, Tuple[float, List[str]]] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        for supplier in suppliers:
+            self.add(supplier)
+
+    @classmethod
+    def of(cls, suppliers: Union["SupplierIndex", Iterable[Supplier]]) -> "SupplierIndex":
+        """suppliers itself if it is already an index, else an index built from it"""
+        return suppliers if isinstance(suppliers, cls) else cls(suppliers)
+
+    def __len__(self) -> int:
+        """Number of active suppliers"""
+        return len(self._keys)
+
+    def add(self, supplier: Supplier):
+        """Register a supplier, or re-rank it if its uid is already known"""
+        position = self._position.get(supplier.uid)
+        if position is None:
+            position = self._position[supplier.uid] = len(self.suppliers)
+            self.suppliers.append(supplier)
+        else:
+            self._unrank(position)
+            self.suppliers[position] = supplier
+        if not supplier.is_active:
+            return
+        key = -supplier_score(supplier)
+        categories = sorted({c.value for c in supplier.categories})
+        for category in categories:
+            bisect.insort(self._ranked.setdefault(category, []), (key, position))
+            self._columns.pop(category, None)
+        self._keys[position] = (key, categories)
+
+    update = add
+
+    def remove(self, uid: str):
+        position = self._position.get(uid)
+        if position is not None:
+            self._unrank(position)
+
+    def get(self, uid: Optional[str]) -> Optional[Supplier]:
+        """Any supplier ever indexed under uid, including inactive and removed ones"""
+        position = self._position.get(uid)
+        return self.suppliers[position] if position is not None else None
+
+    def active(self, uid: Optional[str]) -> Optional[Supplier]:
+        """The supplier under uid if it is active and not removed"""
+        position = self._position.get(uid)
+        return self.suppliers[position] if position in self._keys else None
+
+    def best(self, category: str) -> Optional[Supplier]:
+        """Best-scored active supplier of a category"""
+        ranked = self._ranked.get(category)
+        return self.suppliers[ranked[0][1]] if ranked else None
+
+    def ranked(self, category: str) -> List[Supplier]:
+        """A category's active suppliers, best first"""
+        return [self.suppliers[position] for _, position in self._ranked.get(category, [])]
+
+    def columns(self, category: str) -> np.ndarray:
+        """Positions in suppliers of a category's active suppliers, best first"""
+        cols = self._columns.get(category)
+        if cols is None:
+            cols = self._columns[category] = np.array(
+                [position for _, position in self._ranked.get(category, [])], dtype=np.int64
+            )
+        return cols
+
+    def categories(self) -> List[str]:
+        return [category for category, ranked in self._ranked.items() if ranked]
+
+    def _unrank(self, position: int):
+        entry = self._keys.pop(position, None)
+        if entry is None:
+            return
+        key, categories = entry
+        for category in categories:
+            ranked = self._ranked[category]
+            del ranked[bisect.bisect_left(ranked, (key, position))]
+            self._columns.pop(category, None)
@@ -0,0 +1,90 @@
+"""
+Forkast Supplier Assignment Tests
+assign_suppliers against brute force on small random catalogs
+"""
+import itertools
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.core import IngredientCategory, Supplier, SupplierTier
+from procurement import assignment
+from suppliers.index import SupplierIndex
+
+
+def _total(choice, values, days_remaining, suppliers, order_cost) -> float:
+    """The assignment objective, written out line by line"""
+    total, loads = 0.0, {}
+    for value, days, col in zip(values, days_remaining, choice):
+        supplier = suppliers[col]
+        weight = assignment.TIER_WEIGHT.get(supplier.tier.value, 1.0)
+        risk = assignment.UNRELIABILITY_COST * (1 - supplier.reliability_score)
+        late = assignment.LATE_COST if days < supplier.lead_time_days else 0.0
+        total += value * (weight * (1 + risk) + late)
+        loads[col] = loads.get(col, 0.0) + value
+    for col, load in loads.items():
+        total += order_cost + max(suppliers[col].min_order_value - load, 0.0)
+    return total
+
+
+def _cases(count: int, n_suppliers: int = 5, n_lines: int = 6, seed: int = 0):
+    """Random catalogs every line of which some supplier can serve"""
+    rng = random.Random(seed)
+    categories = list(IngredientCategory)[:4]
+    while count:
+        suppliers = [
+            Supplier(
+                tier=rng.choice(list(SupplierTier)),
+                categories=rng.sample(categories, rng.randint(1, 2)),
+                lead_time_days=rng.choice([0.5, 1, 2, 3]),
+                min_order_value=rng.choice([0, 100, 300, 600, 1000]),
+                reliability_score=rng.uniform(0.8, 1.0),
+            )
+            for _ in range(n_suppliers)
+        ]
+        values = np.array([rng.uniform(10, 400) for _ in range(n_lines)])
+        line_categories = [rng.choice(categories).value for _ in range(n_lines)]
+        days_remaining = np.array([rng.uniform(0, 5) for _ in range(n_lines)])
+        index = SupplierIndex(suppliers)
+        options = [list(index.columns(category)) for category in line_categories]
+        if all(options):
+            count -= 1
+            yield suppliers, index, values, line_categories, days_remaining, options
+
+
+def _gaps(exact_max_lines: int, count: int = 60) -> np.ndarray:
+    gaps = []
+    for suppliers, index, values, line_categories, days_remaining, options in _cases(count):
+        optimum = min(
+            _total(choice, values, days_remaining, suppliers, assignment.ORDER_COST)
+            for choice in itertools.product(*options)
+        )
+        choice = assignment.assign_suppliers(
+            values, line_categories, days_remaining, index, exact_max_lines=exact_max_lines
+        )
+        found = _total(choice, values, days_remaining, suppliers, assignment.ORDER_COST)
+        gaps.append(found / optimum - 1)
+    return np.array(gaps)
+
+
+def test_exact_step_matches_brute_force():
+    assert _gaps(assignment.EXACT_MAX_LINES).max() == pytest.approx(0.0, abs=1e-9)
+
+
+def test_local_search_stays_near_optimal():
+    assert _gaps(0).max() < 0.01
+
+
+def test_unserved_lines_get_no_supplier():
+    index = SupplierIndex([Supplier(categories=[IngredientCategory.PRODUCE])])
+    choice = assignment.assign_suppliers(
+        np.array([100.0, 50.0]), [IngredientCategory.PRODUCE.value, IngredientCategory.DAIRY.value],
+        np.array([3.0, 3.0]), index,
+    )
+    assert choice.tolist() == [0, -1]
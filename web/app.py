@@ -253,6 +253,7 @@ if not st.session_state.authenticated:
 if 'initialized' not in st.session_state:
     from data.demo_generator import DemoDataGenerator
     from forecasting.demand_engine import DemandForecastEngine
+    from suppliers.index import SupplierIndex
 
     gen = DemoDataGenerator()
     data = gen.generate_all()
@@ -261,12 +262,13 @@ if 'initialized' not in st.session_state:
     st.session_state.menu = data['menu']
     st.session_state.inventory = data['inventory']
     st.session_state.suppliers = data['suppliers']
+    st.session_state.supplier_index = SupplierIndex(data['suppliers'])
     st.session_state.historical_orders = data['historical_orders']
     st.session_state.alerts = data['alerts']
     st.session_state.staff_schedule = data['staff_schedule']
 
     # Train forecast engine
-    engine = DemandForecastEngine()
+    engine = DemandForecastEngine(country=data['restaurant'].country)
     engine.train(data['historical_orders'])
     st.session_state.forecast_engine = engine
     st.session_state.forecasts = engine.forecast(days_ahead=14)
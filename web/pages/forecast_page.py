@@ -107,6 +107,23 @@ def show_demand_forecast(engine):
     st.dataframe(fc_table, use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+    # Forecast decomposition, from the components recorded with each forecast
+    st.markdown('<div class="section-card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">What Drives Each Day</div>', unsafe_allow_html=True)
+    fig3 = go.Figure()
+    for key, label, color in [("trend", "Trend", "#b2bec3"), ("day_of_week", "Day of Week", "#FF6B35"),
+                              ("month", "Month", "#F7931E"), ("event", "Holiday / Event", "#6c5ce7")]:
+        fig3.add_trace(go.Bar(x=dates, y=[f.components.get("effects", {}).get(key, 0) for f in forecasts],
+                              name=label, marker_color=color, marker_line=dict(width=0)))
+    fig3.update_layout(barmode="relative", height=350, xaxis_title="Date", yaxis_title="Covers",
+                       plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+                       xaxis=dict(gridcolor="#f0f0f0"), yaxis=dict(gridcolor="#f0f0f0"),
+                       legend=dict(orientation="h", y=1.08))
+    st.plotly_chart(fig3, use_container_width=True)
+    if forecasts:
+        st.caption(f"Model: {forecasts[0].components.get('model', 'seasonal_trend').replace('_', ' ')}")
+    st.markdown('</div>', unsafe_allow_html=True)
+
 
 def show_item_forecast(engine):
     st.markdown('<div class="section-title">Item-Level Demand Forecast</div>', unsafe_allow_html=True)
@@ -145,8 +162,7 @@ def show_item_forecast(engine):
     st.markdown('<div class="section-card">', unsafe_allow_html=True)
     st.markdown('<div class="section-title">All Items Forecast Summary</div>', unsafe_allow_html=True)
     summary = []
-    for item_name, data in sorted(item_forecasts.items()):
-        total_qty = sum(d['predicted_quantity'] for d in data)
+    for item_name, total_qty in sorted(item_forecasts.totals().items()):
         avg_qty = total_qty / days if days > 0 else 0
         summary.append({"Item": item_name, f"Total ({days}d)": total_qty, "Avg/Day": round(avg_qty, 1)})
     summary.sort(key=lambda x: x[f"Total ({days}d)"], reverse=True)
@@ -15,14 +15,28 @@ def show():
 
     optimizer = InventoryOptimizer()
     inventory = st.session_state.inventory
-    suppliers = st.session_state.suppliers
+    suppliers = st.session_state.supplier_index
 
     tab1, tab2 = st.tabs(["📝 Reorder Recommendations", "📄 Procurement Drafts"])
 
     with tab1:
         st.markdown('<div class="section-title">AI Reorder Recommendations</div>', unsafe_allow_html=True)
         days = st.slider("Plan for days ahead:", 3, 14, 7, key="proc_days")
-        recs = optimizer.generate_reorder_recommendations(inventory, days_ahead=days)
+        use_forecast = st.toggle("Plan from demand forecast", value=True, key="proc_use_forecast")
+        perishable = st.toggle("Cap perishables by shelf life", value=True, key="proc_perishable")
+        service_level = st.select_slider(
+            "Target service level:", options=[0.90, 0.95, 0.975, 0.99], value=0.95,
+            format_func=lambda v: f"{v:.1%}", key="proc_service_level",
+        )
+        usage, error_quantiles = None, None
+        if use_forecast:
+            engine = st.session_state.forecast_engine
+            usage = optimizer.forecast_usage(inventory, st.session_state.menu, engine, days_ahead=days)
+            error_quantiles = optimizer.forecast_error_quantiles(engine)
+        recs = optimizer.generate_reorder_recommendations(
+            inventory, days_ahead=days, usage_forecast=usage, suppliers=suppliers,
+            service_level=service_level, error_quantiles=error_quantiles, perishable=perishable,
+        )
 
         if not recs:
             st.markdown(
@@ -60,12 +74,17 @@ def show():
             priority = rec['priority']
             css_class = f"alert-{priority}" if priority in ('critical', 'high', 'medium', 'low') else "alert-medium"
             badge_class = f"badge-{priority}" if priority in ('critical', 'high', 'medium', 'low') else "badge-medium"
+            expiring_note = ""
+            if rec.get("expiring_stock"):
+                expiring_note = f' | Expiring unused: {rec["expiring_stock"]} {rec["unit"]}'
             st.markdown(
                 f'<div class="{css_class}" style="display:flex;justify-content:space-between;align-items:center;">'
                 f'<div>'
                 f'<strong>{rec["item_name"]}</strong> <span class="badge {badge_class}">{priority.upper()}</span>'
                 f'<br><span style="font-size:0.85rem;color:#636e72;">{rec["category"]} | '
-                f'Current: {rec["current_stock"]} {rec["unit"]} | Days left: {rec["days_remaining"]:.0f}</span>'
+                f'Current: {rec["current_stock"]} {rec["unit"]} | Days left: {rec["days_remaining"]:.0f} | Reorder at: {rec["reorder_point"]} {rec["unit"]}'
+                f'{" | Runs out: " + rec["stockout_date"] if rec["stockout_date"] else ""}'
+                f'{expiring_note}</span>'
                 f'</div>'
                 f'<div style="text-align:right;">'
                 f'<div style="font-weight:700;font-size:1.1rem;">Order: {rec["order_quantity"]} {rec["unit"]}</div>'
@@ -99,7 +118,7 @@ def show():
             return
 
         for i, order in enumerate(drafts):
-            supplier = next((s for s in suppliers if s.uid == order.supplier_uid), None)
+            supplier = suppliers.get(order.supplier_uid)
             supplier_name = supplier.name if supplier else order.supplier_uid
 
             with st.expander(f"PO Draft #{i+1} - {supplier_name} | {fmt(order.total_value, show_symbol=False)}", expanded=(i==0)):
@@ -132,6 +151,8 @@ def show():
                         "Total": fmt(item['total'])
                     })
                 st.dataframe(items_table, use_container_width=True)
+                if order.min_order_shortfall > 0:
+                    st.caption(f"{fmt(order.min_order_shortfall)} below {supplier_name}'s minimum order value")
 
                 col1, col2, col3 = st.columns(3)
                 with col1:
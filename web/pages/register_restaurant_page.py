@@ -87,6 +87,7 @@ def show():
 
         from data.demo_generator import DemoDataGenerator
         from forecasting.demand_engine import DemandForecastEngine
+        from suppliers.index import SupplierIndex
 
         gen = DemoDataGenerator()
         data = gen.generate_all()
@@ -95,11 +96,12 @@ def show():
         st.session_state.menu = data['menu']
         st.session_state.inventory = data['inventory']
         st.session_state.suppliers = data['suppliers']
+        st.session_state.supplier_index = SupplierIndex(data['suppliers'])
         st.session_state.historical_orders = data['historical_orders']
         st.session_state.alerts = data['alerts']
         st.session_state.staff_schedule = data['staff_schedule']
 
-        engine = DemandForecastEngine()
+        engine = DemandForecastEngine(country=restaurant.country)
         engine.train(data['historical_orders'])
         st.session_state.forecast_engine = engine
         st.session_state.forecasts = engine.forecast(days_ahead=14)
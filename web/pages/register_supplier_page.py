@@ -102,6 +102,7 @@ def show():
         )
 
         st.session_state.suppliers.append(supplier)
+        st.session_state.supplier_index.add(supplier)
         network_count = len(st.session_state.suppliers)
 
         st.success(f"Supplier **{supplier.name}** registered successfully!")